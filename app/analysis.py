@@ -0,0 +1,56 @@
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+from .models.card import NUM_VALUES
+from .solver import KeyMeld, SIGNATURE_BITS, COUNT_MASK, JOKER_SHIFT, NATURAL_MASK, meldable_signature, solve_signature
+
+_KEY_BITS = NATURAL_MASK // COUNT_MASK  # The lowest bit of every key's count
+
+class HandAnalysis(NamedTuple):
+    signature: int
+    meldable: int  # Signature of the cards that fit in some meld of the hand
+    melds: Tuple[KeyMeld, ...]  # Best partition of the hand, see solve_signature
+    melded: int  # Cards in those melds
+    jokers: int = 0  # Jokers in the hand, they are in no group
+
+    @property
+    def can_meld(self) -> bool:
+        return self.melded > 0
+
+    @property
+    def value_groups(self) -> Dict[int, Tuple[int, ...]]:
+        # value -> keys of the hand with that value, one per copy
+        return _groups(self.signature)[0]
+
+    @property
+    def suit_groups(self) -> Dict[int, Tuple[int, ...]]:
+        # suit index -> keys of the hand in that suit, by value
+        return _groups(self.signature)[1]
+
+@lru_cache(maxsize=1 << 12)
+def analyze(signature: int) -> HandAnalysis:
+    """
+    Best melds of a hand signature, and its groups when asked for. Analyses
+    are cached by signature, so an unchanged hand, or any hand with the
+    same cards, is only analyzed once. The result is shared, don't modify it
+    """
+    melded, _, melds = solve_signature(signature)
+    return HandAnalysis(signature, meldable_signature(signature), melds, melded, signature >> JOKER_SHIFT)
+
+@lru_cache(maxsize=1 << 12)
+def _groups(signature: int) -> Tuple[Dict[int, Tuple[int, ...]], Dict[int, Tuple[int, ...]]]:
+    # Only the renderer shows the groups, AI turns don't pay for them
+    value_groups: Dict[int, Tuple[int, ...]] = {}
+    suit_groups: Dict[int, Tuple[int, ...]] = {}
+    naturals = signature & NATURAL_MASK
+    # Only the keys held, lowest first
+    present = (naturals | naturals >> 1 | naturals >> 2 | naturals >> 3) & _KEY_BITS
+    while present:
+        low = present & -present
+        shift = low.bit_length() - 1
+        key = shift // SIGNATURE_BITS
+        keys = (key,) * ((naturals >> shift) & COUNT_MASK)
+        suit, bit = divmod(key, NUM_VALUES)
+        value_groups[bit + 1] = value_groups.get(bit + 1, ()) + keys
+        suit_groups[suit] = suit_groups.get(suit, ()) + keys
+        present ^= low
+    return value_groups, suit_groups
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Sequence
+import numpy as np
+from .models.card import JOKER_ID_BASE, NUM_KEYS, NUM_VALUES
+
+def hand_tensor(hands: Sequence[Sequence[int]]) -> np.ndarray:
+    """
+    Count tensor of shape (B, 4 suits, 13 values) for B hands of card ids.
+    Jokers have no place in it and are refused
+    """
+    lengths = np.fromiter((len(hand) for hand in hands), dtype=np.intp, count=len(hands))
+    rows = np.repeat(np.arange(len(hands)), lengths)
+    keys = np.fromiter((card_id for hand in hands for card_id in hand), dtype=np.intp, count=int(lengths.sum()))
+    if len(keys) and keys.max() >= JOKER_ID_BASE:
+        raise ValueError("Hand tensors can't hold jokers")
+    counts = np.zeros((len(hands), NUM_KEYS), dtype=np.uint8)
+    np.add.at(counts, (rows, keys % NUM_KEYS), 1)
+    return counts.reshape(len(hands), 4, NUM_VALUES)
+
+@dataclass
+class HandEvaluation:
+    set_values: np.ndarray  # (B, 13) values held in at least three suits
+    run_starts: np.ndarray  # (B, 4, 11) first values of three consecutive values of one suit
+    longest_run: np.ndarray  # (B, 4) length of the longest run of each suit
+    longest_run_start: np.ndarray  # (B, 4) value the longest run starts at, 0 when the suit is empty
+    meldable: np.ndarray  # (B, 4, 13) keys that are part of at least one meld
+    unmeldable: np.ndarray  # (B,) cards no meld can use, they stay in the hand
+
+    @property
+    def can_meld(self) -> np.ndarray:
+        return self.meldable.any(axis=(1, 2))
+
+def evaluate_hands(counts: np.ndarray) -> HandEvaluation:
+    """
+    Meld candidates of every hand of a (B, 4, 13) count tensor in one pass.
+    The same cards are meldable here as in solver.meldable_signature
+    """
+    present = counts > 0
+
+    set_values = present.sum(axis=1) >= 3
+    run_starts = present[:, :, :-2] & present[:, :, 1:-1] & present[:, :, 2:]
+
+    meldable = set_values[:, None, :] & present
+    meldable[:, :, :-2] |= run_starts
+    meldable[:, :, 1:-1] |= run_starts
+    meldable[:, :, 2:] |= run_starts
+
+    # Length of the run ending at each value, one step per value for the whole batch
+    run = np.zeros(present.shape[:2], dtype=np.int8)
+    longest = np.zeros_like(run)
+    longest_end = np.zeros_like(run)
+    for bit in range(NUM_VALUES):
+        run = (run + 1) * present[:, :, bit]
+        longer = run > longest
+        longest = np.where(longer, run, longest)
+        longest_end = np.where(longer, bit, longest_end)
+    longest_start = np.where(longest > 0, longest_end - longest + 2, 0)
+
+    unmeldable = np.where(meldable, 0, counts).sum(axis=(1, 2))
+    return HandEvaluation(set_values, run_starts, longest, longest_start, meldable, unmeldable)
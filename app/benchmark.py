@@ -0,0 +1,210 @@
+import atexit
+import gc
+import json
+import platform
+import shutil
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from . import rearrange
+from .analysis import _groups, analyze
+from .models.card import card_from_id
+from .models.meld import Meld
+from .moves import meld_options
+from .rummy import RobbersRummy
+from .simulation import play_headless_game
+from .solver import _solve, _solve_wild
+
+# name -> (unit, setup). The setup builds the fixtures from fixed seeds and
+# returns the callable that is timed. Every metric is lower is better
+BENCHMARKS: Dict[str, Tuple[str, Callable[[], Callable[[], object]]]] = {}
+
+def benchmark(name: str, unit: str = "s/op"):
+    def register(setup):
+        BENCHMARKS[name] = (unit, setup)
+        return setup
+    return register
+
+# Memoized engine functions, cleared before each benchmark so no benchmark
+# profits from the caches an earlier one filled
+CACHES = (analyze, _groups, _solve, _solve_wild, meld_options, rearrange._suit_options, rearrange._sets_fit)
+
+def clear_caches():
+    for cache in CACHES:
+        cache.cache_clear()
+
+def _dealt_game(seed: int = 1) -> RobbersRummy:
+    game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=seed)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game
+
+@benchmark("is_valid_run")
+def _bench_is_valid_run():
+    game = _dealt_game()
+    run = [card_from_id(key) for key in range(3, 10)]
+    return lambda: game._is_valid_run(run)
+
+@benchmark("is_valid_set")
+def _bench_is_valid_set():
+    game = _dealt_game()
+    cards = [card_from_id(suit * 13 + 6) for suit in range(4)]
+    return lambda: game._is_valid_set(cards)
+
+@benchmark("meld_can_be_robbed")
+def _bench_can_be_robbed():
+    meld = Meld([card_from_id(key) for key in range(3, 8)], 'run')
+    card = card_from_id(8)
+    return lambda: meld.can_be_robbed(card)
+
+@benchmark("try_form_melds")
+def _bench_try_form_melds():
+    game = _dealt_game()
+    player = game.players[0]
+    return lambda: game.try_form_melds(player)
+
+@benchmark("hand_analysis", unit="s/hand")
+def _bench_hand_analysis():
+    # Every call analyzes the hands of many deals from scratch, not a cached answer
+    signatures = [player.hand.signature for seed in range(50) for player in _dealt_game(seed).players]
+
+    def analyze_all():
+        clear_caches()
+        for signature in signatures:
+            analyze(signature)
+    analyze_all.calls = len(signatures)
+    return analyze_all
+
+@benchmark("find_longest_consecutive_subarray")
+def _bench_longest_subarray():
+    game = _dealt_game()
+    cards = [card_from_id(key) for key in (13, 14, 15, 17, 18, 19, 20, 24)]
+    return lambda: game._find_longest_consecutive_subarray(cards)
+
+@benchmark("check_game_integrity")
+def _bench_check_game_integrity():
+    game = _dealt_game()
+    return game.check_game_integrity
+
+GAME_SEEDS = range(50)
+
+@benchmark("headless_game", unit="s/game")
+def _bench_headless_game():
+    def play_games():
+        for seed in GAME_SEEDS:
+            play_headless_game(seed)
+    # Reported per game, see run_benchmark
+    play_games.calls = len(GAME_SEEDS)
+    return play_games
+
+@benchmark("headless_game_memory", unit="bytes/game")
+def _bench_headless_game_memory():
+    # Cards are interned for the life of the process, they exist before the game
+    _dealt_game(7)
+    return lambda: play_headless_game(seed=7)
+
+@benchmark("card_recognition", unit="s/image")
+def _bench_card_recognition():
+    # Synthetic scans of every card, written once and recognized on the thread pool.
+    # Imported here, so the other benchmarks neither load nor need the vision stack
+    from .vision import CardRecognizer, write_synthetic_set
+    directory = tempfile.mkdtemp(prefix="cards-")
+    atexit.register(shutil.rmtree, directory, True)
+    paths = [path for path, _ in write_synthetic_set(directory, per_card=4)]
+    recognizer = CardRecognizer.synthetic()
+
+    def recognize_all():
+        for _ in recognizer.recognize(paths):
+            pass
+    recognize_all.calls = len(paths)
+    return recognize_all
+
+def run_benchmark(name: str, min_time: float = 0.2, repeat: int = 5) -> float:
+    unit, setup = BENCHMARKS[name]
+    function = setup()
+    clear_caches()
+    if unit.startswith("bytes"):
+        # Peak traced allocation of one call. Garbage of earlier runs is
+        # collected first, so the collector runs at the same points every time
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            return float(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    calls = getattr(function, "calls", 1)
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / calls
+
+def run_suite(names: Optional[List[str]] = None, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Runs the benchmarks and returns the results in the JSON layout compare reads
+    """
+    results = {}
+    for name in names or list(BENCHMARKS):
+        results[name] = {"value": run_benchmark(name, min_time, repeat), "unit": BENCHMARKS[name][0]}
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def compare(old: dict, new: dict, threshold: float = 0.10) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    (name, old value, new value, new / old, regressed) for the benchmarks in
+    both runs. A benchmark regressed when it got worse by more than threshold
+    """
+    rows = []
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+        before = old["results"][name]["value"]
+        after = result["value"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmarks of the rules engine and of full games")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the benchmarks and write the results as JSON")
+    run.add_argument("output")
+    run.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS))
+    run.add_argument("--min-time", type=float, default=0.2)
+    run.add_argument("--repeat", type=int, default=5)
+    diff = commands.add_parser("compare", help="Compare two result files, exits with 1 on a regression")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        suite = run_suite(args.only, args.min_time, args.repeat)
+        with open(args.output, "w") as file:
+            json.dump(suite, file, indent=2)
+        for name, result in suite["results"].items():
+            print(f"{name:<36} {result['value']:.3e} {result['unit']}")
+    else:
+        with open(args.old) as file:
+            old = json.load(file)
+        with open(args.new) as file:
+            new = json.load(file)
+        regressions = 0
+        for name, before, after, ratio, regressed in compare(old, new, args.threshold):
+            regressions += regressed
+            flag = "SLOWER" if regressed else ""
+            print(f"{name:<36} {before:.3e} -> {after:.3e} {ratio:6.2f}x {flag}")
+        sys.exit(1 if regressions else 0)
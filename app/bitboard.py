@@ -0,0 +1,43 @@
+from typing import List, Tuple
+from .models.card import NUM_VALUES
+
+# Bit v-1 of a suit mask stands for value v
+FULL_MASK = (1 << NUM_VALUES) - 1
+
+def value_bit(value: int) -> int:
+    return 1 << (value - 1)
+
+def is_consecutive(mask: int) -> bool:
+    # True when the set bits form a single block, e.g. 0b01110
+    if mask == 0:
+        return False
+    mask >>= (mask & -mask).bit_length() - 1
+    return mask & (mask + 1) == 0
+
+def run_segments(mask: int, min_length: int = 3) -> List[Tuple[int, int]]:
+    """
+    Blocks of consecutive set bits as (first value, length) pairs
+    """
+    segments = []
+    while mask:
+        start = (mask & -mask).bit_length() - 1
+        shifted = mask >> start
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        if length >= min_length:
+            segments.append((start + 1, length))
+        mask &= ~(((1 << length) - 1) << start)
+    return segments
+
+def longest_run(mask: int) -> Tuple[int, int]:
+    """
+    Lowest, longest block of consecutive set bits as (first value, length)
+    """
+    best_start, best_length = 0, 0
+    while mask:
+        start = (mask & -mask).bit_length() - 1
+        shifted = mask >> start
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        if length > best_length:
+            best_start, best_length = start + 1, length
+        mask &= ~(((1 << length) - 1) << start)
+    return best_start, best_length
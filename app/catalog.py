@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .models.card import NUM_KEYS, NUM_VALUES
+
+class CatalogMeld(NamedTuple):
+    id: int
+    type: str  # 'run' or 'set'
+    keys: Tuple[int, ...]  # (suit, value) keys in ascending order
+    mask: int  # One bit per key
+
+def _build() -> List[CatalogMeld]:
+    melds = []
+    for suit in range(4):
+        base = suit * NUM_VALUES
+        for first in range(NUM_VALUES - 2):
+            for last in range(first + 2, NUM_VALUES):
+                melds.append(('run', tuple(range(base + first, base + last + 1))))
+    for bit in range(NUM_VALUES):
+        keys = tuple(suit * NUM_VALUES + bit for suit in range(4))
+        for skip in range(4):
+            melds.append(('set', keys[:skip] + keys[skip + 1:]))
+        melds.append(('set', keys))
+    return [CatalogMeld(i, meld_type, keys, sum(1 << key for key in keys))
+            for i, (meld_type, keys) in enumerate(melds)]
+
+# Every run and set the 52 (suit, value) keys can form, the deck copies
+# don't add any, as a meld never holds two cards of the same key
+MELDS: Tuple[CatalogMeld, ...] = tuple(_build())
+BY_MASK: Dict[int, CatalogMeld] = {meld.mask: meld for meld in MELDS}
+
+# Melds that hold a key, and the melds whose lowest key it is
+BY_KEY: Tuple[Tuple[CatalogMeld, ...], ...] = tuple(
+    tuple(meld for meld in MELDS if meld.mask >> key & 1) for key in range(NUM_KEYS))
+STARTING_AT: Tuple[Tuple[CatalogMeld, ...], ...] = tuple(
+    tuple(meld for meld in MELDS if meld.keys[0] == key) for key in range(NUM_KEYS))
+
+def _build_completions() -> Dict[int, Tuple[Tuple[int, CatalogMeld], ...]]:
+    completions: Dict[int, List[Tuple[int, CatalogMeld]]] = {}
+    for meld in MELDS:
+        for key in meld.keys:
+            completions.setdefault(meld.mask & ~(1 << key), []).append((key, meld))
+    return {mask: tuple(entries) for mask, entries in completions.items()}
+
+# Cards missing one key of a meld: their key mask to (missing key, meld).
+# A meld missing one card is either a smaller meld, which the key extends,
+# or two cards of a 3 card meld, a run with a gap or a broken set
+COMPLETIONS = _build_completions()
+
+def key_mask(keys: Iterable[int]) -> Optional[int]:
+    """
+    Bit mask of the keys, None when a key repeats
+    """
+    mask = 0
+    for key in keys:
+        bit = 1 << key
+        if mask & bit:
+            return None
+        mask |= bit
+    return mask
+
+def find_meld(keys: Iterable[int]) -> Optional[CatalogMeld]:
+    mask = key_mask(keys)
+    return None if mask is None else BY_MASK.get(mask)
+
+def completions(keys: Iterable[int]) -> Tuple[Tuple[int, CatalogMeld], ...]:
+    """
+    (key, meld) for every key that turns the cards into a meld
+    """
+    mask = key_mask(keys)
+    return () if mask is None else COMPLETIONS.get(mask, ())
+
+def extension_keys(keys: Iterable[int]) -> List[int]:
+    """
+    Keys of the cards that can be added to a meld
+    """
+    return [key for key, _ in completions(keys)]
+
+def melds_in(keys_present: int) -> List[CatalogMeld]:
+    """
+    Every meld whose keys are all in a key mask
+    """
+    found = []
+    mask = keys_present
+    while mask:
+        key = (mask & -mask).bit_length() - 1
+        mask &= mask - 1
+        for meld in STARTING_AT[key]:
+            if meld.mask & keys_present == meld.mask:
+                found.append(meld)
+    return found
@@ -0,0 +1,196 @@
+import mmap
+import struct
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# Event kinds
+START = 0  # seat holds the number of players, cards the seed as 8 little endian bytes
+DEAL = 1
+DRAW = 2
+MELD = 3
+EXTEND = 4
+ROB = 5  # Cards of the meld taken back into the hand
+REARRANGE = 6  # First card is the one taken out of the table meld
+GAME_OVER = 7  # seat is the winner
+REPARTITION = 8  # The seat rebuilds the table, the MELD records that follow hold the new melds
+
+NO_SEAT = 0xFF
+NO_MELD = 0xFFFF
+MAX_CARDS = 19
+
+# Fixed width 32 byte records, the reader maps the file straight onto this dtype
+RECORD = np.dtype([
+    ('game', '<u4'),
+    ('turn', '<u4'),
+    ('kind', 'u1'),
+    ('seat', 'u1'),
+    ('meld', '<u2'),  # Table meld the event changes
+    ('count', 'u1'),  # Number of card ids used in cards
+    ('cards', 'u1', (MAX_CARDS,)),
+])
+_RECORD_STRUCT = struct.Struct(f'<IIBBHB{MAX_CARDS}s')
+RECORD_SIZE = _RECORD_STRUCT.size
+
+class EventLogWriter:
+    """
+    Buffered writer of binary event records. Records are packed into a
+    preallocated buffer that is written out when full, so logging costs one
+    struct pack per event
+    """
+    def __init__(self, path: str, buffer_records: int = 1 << 15):
+        self.file = open(path, 'wb')
+        self.buffer = bytearray(buffer_records * RECORD_SIZE)
+        self.offset = 0
+        self.games = 0
+        self.game = -1
+
+    def begin_game(self, seed: Optional[int], num_players: int) -> int:
+        """
+        Starts the records of a new game and returns its number in the log.
+        The seed must fit in 8 unsigned bytes
+        """
+        if seed is not None and not 0 <= seed < 1 << 64:
+            raise ValueError(f"Seed {seed} is outside 0..2**64-1")
+        self.game = self.games
+        self.games += 1
+        seed_bytes = b'' if seed is None else seed.to_bytes(8, 'little')
+        self._pack(0, START, num_players, NO_MELD, len(seed_bytes), seed_bytes)
+        return self.game
+
+    def record(self, turn: int, kind: int, seat: int, cards: Sequence[int] = (), meld: int = NO_MELD):
+        if self.game < 0:
+            raise ValueError("No game has been begun, call begin_game first")
+        if len(cards) > MAX_CARDS:
+            raise ValueError(f"An event holds at most {MAX_CARDS} cards")
+        self._pack(turn, kind, seat, meld, len(cards), bytes(cards))
+
+    def _pack(self, turn: int, kind: int, seat: int, meld: int, count: int, cards: bytes):
+        if self.offset == len(self.buffer):
+            self.flush()
+        _RECORD_STRUCT.pack_into(self.buffer, self.offset, self.game, turn, kind, seat, meld, count, cards)
+        self.offset += RECORD_SIZE
+
+    def flush(self):
+        self.file.write(memoryview(self.buffer)[:self.offset])
+        self.offset = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@dataclass
+class ReplayedGame:
+    game: int
+    turn: int
+    seed: Optional[int] = None
+    hands: List[List[int]] = field(default_factory=list)
+    table: List[List[int]] = field(default_factory=list)
+    winner: Optional[int] = None
+
+class EventLogReader:
+    """
+    Memory maps an event log. records is a structured NumPy view of the
+    whole file, nothing is parsed until a game is replayed
+    """
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self._size() else None
+        buffer = self.map if self.map is not None else b''
+        self.records = np.frombuffer(buffer, dtype=RECORD)
+        self.starts = np.flatnonzero(self.records['kind'] == START)
+
+    def _size(self) -> int:
+        self.file.seek(0, 2)
+        return self.file.tell()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def num_games(self) -> int:
+        return len(self.starts)
+
+    def game_records(self, game: int) -> np.ndarray:
+        start = self.starts[game]
+        stop = self.starts[game + 1] if game + 1 < len(self.starts) else len(self.records)
+        return self.records[start:stop]
+
+    def seek(self, game: int, turn: int) -> int:
+        """
+        Index of the first record of a game at or after the turn
+        """
+        records = self.game_records(game)
+        return int(self.starts[game] + np.searchsorted(records['turn'][1:], turn) + 1)
+
+    def replay(self, game: int, turn: Optional[int] = None) -> ReplayedGame:
+        """
+        Hands and table of a game after every event before the turn, or at
+        the end of the game
+        """
+        records = self.game_records(game)
+        if turn is not None:
+            records = records[:self.seek(game, turn) - self.starts[game]]
+
+        start = records[0]
+        state = ReplayedGame(game, 0, hands=[[] for _ in range(int(start['seat']))])
+        if start['count']:
+            state.seed = int.from_bytes(start['cards'][:8].tobytes(), 'little')
+
+        pool: List[int] = []  # Table cards of a repartition not placed again yet
+        for record in records[1:]:
+            kind = int(record['kind'])
+            seat = int(record['seat'])
+            cards = record['cards'][:record['count']].tolist()
+            meld = int(record['meld'])
+            state.turn = int(record['turn'])
+            if kind == DEAL or kind == DRAW:
+                state.hands[seat].extend(cards)
+            elif kind == MELD:
+                for card_id in cards:
+                    if card_id in pool:
+                        pool.remove(card_id)
+                    else:
+                        state.hands[seat].remove(card_id)
+                state.table.append(cards)
+            elif kind == EXTEND:
+                _remove_all(state.hands[seat], cards)
+                state.table[meld].extend(cards)
+            elif kind == ROB:
+                state.hands[seat].extend(state.table.pop(meld))
+            elif kind == REARRANGE:
+                table_card, hand_cards = cards[0], cards[1:]
+                state.table[meld].remove(table_card)
+                _remove_all(state.hands[seat], hand_cards)
+                state.table.append(cards)
+            elif kind == REPARTITION:
+                pool = [card_id for meld in state.table for card_id in meld]
+                state.table = []
+            elif kind == GAME_OVER:
+                state.winner = seat
+        return state
+
+    def close(self):
+        # Drop the view first, the map can't close while NumPy holds its buffer
+        self.records = np.empty(0, dtype=RECORD)
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "EventLogReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _remove_all(hand: List[int], cards: Sequence[int]):
+    for card_id in cards:
+        hand.remove(card_id)
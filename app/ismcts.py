@@ -0,0 +1,196 @@
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+from .models.card import card_key
+from .moves import Action, DRAW, END_TURN, END_TURN_ACTION, MELD, EXTEND, ROB, ends_turn
+from .state import GameState
+
+if TYPE_CHECKING:
+    from .tracker import CardTracker
+
+@dataclass
+class SearchResult:
+    action: Action
+    iterations: int
+    elapsed: float
+    visits: Dict[Action, int] = field(default_factory=dict)
+    values: Dict[Action, float] = field(default_factory=dict)  # Mean reward of each root action
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+class _Node:
+    __slots__ = ('action', 'parent', 'seat', 'children', 'visits', 'availability', 'reward')
+
+    def __init__(self, action: Optional[Action], parent: Optional["_Node"], seat: int):
+        self.action = action
+        self.parent = parent
+        self.seat = seat  # Player who made the action, rewards are from their side
+        self.children: Dict[Action, "_Node"] = {}
+        self.visits = 0
+        self.availability = 1
+        self.reward = 0.0
+
+def determinize(state: GameState, seat: int, rng: random.Random,
+                tracker: Optional["CardTracker"] = None) -> GameState:
+    """
+    Copy of the state in which the cards the seat can't see, the deck and
+    the other hands, are shuffled and dealt again with the same sizes. With
+    the seat's tracker the cards it knows to be in a hand stay there
+    """
+    hidden = list(state.deck[:state.deck_size])
+    for other, hand in enumerate(state.hands):
+        if other != seat:
+            hidden.extend(hand)
+    rng.shuffle(hidden)
+
+    known: List[List[int]] = [[] for _ in state.hands]
+    if tracker is not None:
+        wanted = {other: tracker.known[other][:] for other in range(len(state.hands)) if other != seat}
+        rest = []
+        for card_id in hidden:
+            key = card_key(card_id)
+            for other, counts in wanted.items():
+                if counts[key] and len(known[other]) < len(state.hands[other]):
+                    counts[key] -= 1
+                    known[other].append(card_id)
+                    break
+            else:
+                rest.append(card_id)
+        hidden = rest
+
+    hands = []
+    position = 0
+    for other, hand in enumerate(state.hands):
+        if other == seat:
+            hands.append(hand[:])
+        else:
+            size = len(hand) - len(known[other])
+            hands.append(known[other] + hidden[position:position + size])
+            position += size
+    deck = hidden[position:]
+
+    sampled = GameState(deck, hands, state.table[:], state.current)
+    sampled.acted = state.acted
+    sampled.passes = state.passes
+    return sampled
+
+class ISMCTS:
+    """
+    Single observer information set Monte Carlo tree search. Every
+    iteration samples the hidden cards, walks the tree over the actions
+    legal in that sample and finishes with a short greedy rollout. Search
+    stops at the iteration or time budget, whichever comes first
+    """
+    def __init__(self, iterations: Optional[int] = 1000, time_budget: Optional[float] = None,
+                 exploration: float = 0.7, rollout_turns: int = 8, seed: Optional[int] = None):
+        if iterations is None and time_budget is None:
+            raise ValueError("ISMCTS needs an iteration or a time budget")
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.rng = random.Random(seed)
+
+    def choose_action(self, game, player) -> Action:
+        """
+        Strategy hook used by RobbersRummy for AI players
+        """
+        state = GameState.from_game(game)
+        state.current = game.players.index(player)
+        return self.search(state, tracker=player.tracker).action
+
+    def search(self, state: GameState, deadline: Optional[float] = None,
+               tracker: Optional["CardTracker"] = None) -> SearchResult:
+        seat = state.current
+        root = _Node(None, None, seat)
+        start = time.perf_counter()
+        if deadline is None and self.time_budget is not None:
+            deadline = start + self.time_budget
+
+        iterations = 0
+        while self.iterations is None or iterations < self.iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, determinize(state, seat, self.rng, tracker))
+            iterations += 1
+
+        if not root.children:
+            # No time for a single iteration, fall back to the rollout policy
+            action = self._rollout_action(state, _search_actions(state))
+            return SearchResult(action, 0, time.perf_counter() - start)
+
+        best = max(root.children.values(), key=lambda node: node.visits)
+        return SearchResult(
+            best.action,
+            iterations,
+            time.perf_counter() - start,
+            {action: node.visits for action, node in root.children.items()},
+            {action: node.reward / node.visits for action, node in root.children.items() if node.visits},
+        )
+
+    def _iterate(self, root: _Node, state: GameState):
+        node = root
+        # Selection, only among children legal in this sample
+        while not state.is_over():
+            actions = _search_actions(state)
+            untried = [action for action in actions if action not in node.children]
+            if untried:
+                action = self.rng.choice(untried)
+                child = _Node(action, node, state.current)
+                node.children[action] = child
+                state.apply(action)
+                node = child
+                break
+
+            # UCB over availability counts, a child is only rated against the draws it was legal in
+            best_child, best_score = None, -1.0
+            for action in actions:
+                child = node.children[action]
+                child.availability += 1
+                score = child.reward / child.visits + self.exploration * math.sqrt(math.log(child.availability) / child.visits)
+                if score > best_score:
+                    best_child, best_score = child, score
+            state.apply(best_child.action)
+            node = best_child
+
+        rewards = self._rollout(state)
+        while node is not None:
+            node.visits += 1
+            node.reward += rewards[node.seat]
+            node = node.parent
+
+    def _rollout(self, state: GameState) -> List[float]:
+        turns = 0
+        while not state.is_over() and turns < self.rollout_turns:
+            action = self._rollout_action(state, state.legal_actions())
+            state.apply(action)
+            if ends_turn(action):
+                turns += 1
+        winner = state.winner()
+        return [1.0 if seat == winner else 0.0 for seat in range(len(state.hands))]
+
+    def _rollout_action(self, state: GameState, actions: List[Action]) -> Action:
+        # Greedy: meld the most cards, then extend, then draw
+        melds = [action for action in actions if action.kind == MELD]
+        if melds:
+            return max(melds, key=lambda action: len(action.cards))
+        for action in actions:
+            if action.kind == EXTEND:
+                return action
+        for action in actions:
+            if action.kind == DRAW:
+                return action
+        return END_TURN_ACTION
+
+def _search_actions(state: GameState) -> List[Action]:
+    # Robbing a whole meld back into the hand never shortens the game, and
+    # neither does ending a turn without any action while the deck still has
+    # cards, so the search only ends the turn when it did something or can't draw
+    actions = [action for action in state.legal_actions() if action.kind != ROB]
+    if not state.acted and any(action.kind == DRAW for action in actions):
+        actions = [action for action in actions if action.kind != END_TURN]
+    return actions
@@ -0,0 +1,92 @@
+from typing import Iterable, List, Optional, Tuple
+from .models.card import JOKER_KEY, NUM_VALUES
+
+# Jokers stand in for any card. Melds with jokers are checked by counting
+# gaps rather than by trying what every joker could be, which keeps every
+# check linear in the meld size however many jokers and decks are in play.
+# A meld needs at least one natural card. A joker in a run fills a gap
+# between the natural cards, the jokers left over continue the run upwards
+# and below the lowest card once the run reaches the king
+
+MAX_SET = 4
+
+def split_jokers(keys: Iterable[int]) -> Tuple[List[int], int]:
+    """
+    Natural keys and the number of jokers
+    """
+    naturals = []
+    jokers = 0
+    for key in keys:
+        if key == JOKER_KEY:
+            jokers += 1
+        else:
+            naturals.append(key)
+    return naturals, jokers
+
+def run_span(naturals: List[int], jokers: int) -> Optional[Tuple[int, int, int]]:
+    """
+    (suit, first value bit, last value bit) a run of the natural keys and
+    the jokers covers, None when they don't make a run
+    """
+    if not naturals:
+        return None
+    suit = naturals[0] // NUM_VALUES
+    mask = 0
+    for key in naturals:
+        bit = 1 << (key % NUM_VALUES)
+        if key // NUM_VALUES != suit or mask & bit:
+            return None
+        mask |= bit
+    low = (mask & -mask).bit_length() - 1
+    high = mask.bit_length() - 1
+    spare = jokers - (high - low + 1 - len(naturals))
+    length = len(naturals) + jokers
+    if spare < 0 or length < 3 or length > NUM_VALUES:
+        return None
+    up = min(spare, NUM_VALUES - 1 - high)
+    return suit, low - (spare - up), high + up
+
+def is_set(naturals: List[int], jokers: int) -> bool:
+    if not naturals or not 3 <= len(naturals) + jokers <= MAX_SET:
+        return False
+    value = naturals[0] % NUM_VALUES
+    suits = 0
+    for key in naturals:
+        bit = 1 << (key // NUM_VALUES)
+        if key % NUM_VALUES != value or suits & bit:
+            return False
+        suits |= bit
+    return True
+
+def meld_type(keys: Iterable[int]) -> Optional[str]:
+    """
+    'run' or 'set' for keys with jokers that form a meld, None otherwise.
+    Runs win when the cards could be either
+    """
+    naturals, jokers = split_jokers(keys)
+    if run_span(naturals, jokers) is not None:
+        return 'run'
+    if is_set(naturals, jokers):
+        return 'set'
+    return None
+
+def has_room(meld_type: str, size: int) -> bool:
+    # A joker can be added to any meld that isn't full
+    return size < (NUM_VALUES if meld_type == 'run' else MAX_SET)
+
+def extension_keys(meld_type: str, naturals: List[int], jokers: int) -> List[int]:
+    """
+    Natural keys that can be added to a meld with jokers. The value a
+    joker already stands for can't be added, jokers are never swapped out
+    """
+    if meld_type == 'run':
+        span = run_span(naturals, jokers)
+        if span is None:
+            return []
+        suit, low, high = span
+        base = suit * NUM_VALUES
+        return ([base + low - 1] if low > 0 else []) + ([base + high + 1] if high < NUM_VALUES - 1 else [])
+    if not is_set(naturals, jokers) or len(naturals) + jokers >= MAX_SET:
+        return []
+    bit = naturals[0] % NUM_VALUES
+    return [suit * NUM_VALUES + bit for suit in range(4) if suit * NUM_VALUES + bit not in naturals]
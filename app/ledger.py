@@ -0,0 +1,40 @@
+from enum import Enum
+from typing import List
+
+class IntegrityPolicy(Enum):
+    ALWAYS = "always"  # Full audit before every turn
+    EVERY_N_TURNS = "every_n_turns"
+    GAME_END = "game_end"
+    NEVER = "never"
+
+# Ledger locations, seat i is at PLAYERS + i
+DECK = 0
+TABLE = 1
+PLAYERS = 2
+
+class CardLedger:
+    """
+    Number of cards in the deck, on the table and in every hand. Every card
+    movement is recorded here, so conservation can be checked per turn by
+    comparing a few counters instead of recounting every card
+    """
+    def __init__(self, num_players: int):
+        self.counts: List[int] = [0] * (PLAYERS + num_players)
+        self.total = 0
+
+    def open(self, deck: int, table: int, hands: List[int]):
+        self.counts = [deck, table] + hands
+        self.total = sum(self.counts)
+
+    def move(self, source: int, target: int, count: int = 1):
+        self.counts[source] -= count
+        self.counts[target] += count
+
+    def matches(self, deck: int, table: int, hands: List[int]) -> bool:
+        counts = self.counts
+        if counts[DECK] != deck or counts[TABLE] != table:
+            return False
+        for seat, size in enumerate(hands):
+            if counts[PLAYERS + seat] != size:
+                return False
+        return True
@@ -1,3 +1,4 @@
+from typing import Dict, List, Tuple
 from .suit import Suit
 
 suit_colors = {
@@ -7,20 +8,80 @@ suit_colors = {
     'K': 'blue'
 }
 
+SUITS: List[Suit] = list(Suit)
+SUIT_INDEX: Dict[Suit, int] = {suit: i for i, suit in enumerate(SUITS)}
+NUM_VALUES = 13
+NUM_KEYS = len(SUITS) * NUM_VALUES  # One key per (suit, value)
+
+# Jokers have their own key after the (suit, value) keys. Their suit only
+# decides the color they are shown in
+JOKER_VALUE = 14
+JOKER_KEY = NUM_KEYS
+JOKER_SUITS = (Suit.HEARTS, Suit.SPADES)
+MAX_DECKS = 4
+# Deck card ids are copy * NUM_KEYS + key, so 0..103 for two decks, and
+# jokers follow all decks. Ids stay below 256, the event log stores bytes
+JOKER_ID_BASE = MAX_DECKS * NUM_KEYS
+MAX_JOKERS = 256 - JOKER_ID_BASE
+
+def card_key(card_id: int) -> int:
+    return JOKER_KEY if card_id >= JOKER_ID_BASE else card_id % NUM_KEYS
+
+def card_suit(card_id: int) -> Suit:
+    if card_id >= JOKER_ID_BASE:
+        return JOKER_SUITS[card_id % 2]
+    return SUITS[card_id % NUM_KEYS // NUM_VALUES]
+
+def card_value(card_id: int) -> int:
+    return JOKER_VALUE if card_id >= JOKER_ID_BASE else card_id % NUM_VALUES + 1
+
+_interned: Dict[Tuple[Suit, int, int], "Card"] = {}
+_by_id: Dict[int, "Card"] = {}
+
 class Card:
-    def __init__(self, suit: Suit, value: int, id: int):
-        self.suit = suit
-        self.value = value
-        self.id = id
+    """
+    Immutable card. Cards are interned, so there is exactly one object per
+    (suit, value, id) and equality and hashing are plain identity. The id
+    must be one of the card, see card_from_id
+    """
+    __slots__ = ('suit', 'value', 'id', 'key')
+
+    def __new__(cls, suit: Suit, value: int, id: int):
+        card = _interned.get((suit, value, id))
+        if card is None:
+            if value == JOKER_VALUE:
+                valid = JOKER_ID_BASE <= id < JOKER_ID_BASE + MAX_JOKERS
+            else:
+                valid = 0 <= id < JOKER_ID_BASE and 1 <= value <= NUM_VALUES and \
+                    id % NUM_KEYS == SUIT_INDEX[suit] * NUM_VALUES + value - 1
+            if not valid:
+                raise ValueError(f"Card id {id} doesn't belong to {value} of {suit.name}")
+            card = object.__new__(cls)
+            object.__setattr__(card, 'suit', suit)
+            object.__setattr__(card, 'value', value)
+            object.__setattr__(card, 'id', id)
+            object.__setattr__(card, 'key', JOKER_KEY if value == JOKER_VALUE else SUIT_INDEX[suit] * NUM_VALUES + value - 1)
+            _interned[(suit, value, id)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return (Card, (self.suit, self.value, self.id))
     
     def __str__(self):
+        if self.value == JOKER_VALUE:
+            return "JK"
         return f"{self.value}" #_{self.id}_{self.suit.value}
     
-    def __eq__(self, other):
-        if not isinstance(other, Card):
-            return False
-        return self.suit == other.suit and self.value == other.value and self.id == self.id
-    
     def __repr__(self) -> str:
         color = suit_colors.get(self.suit.value, 'pink')
-        return f"[{color}]{self.value}[/{color}]" #_{self.id}
\ No newline at end of file
+        return f"[{color}]{self}[/{color}]" #_{self.id}
+
+def card_from_id(card_id: int) -> Card:
+    card = _by_id.get(card_id)
+    if card is None:
+        card = Card(card_suit(card_id), card_value(card_id), card_id)
+        _by_id[card_id] = card
+    return card
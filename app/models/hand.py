@@ -0,0 +1,161 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .card import Card, JOKER_KEY, NUM_VALUES, SUITS, card_key
+
+# Same layout as solver.hand_signature, 4 bits of count per key and the
+# joker count above them
+_SIGNATURE_BITS = 4
+# Suits in the order the hand is shown, by suit letter as the sorted list was
+_SUIT_ORDER = sorted(range(len(SUITS)), key=lambda suit: SUITS[suit].value)
+_SUIT_BITS = (1 << NUM_VALUES) - 1
+
+class Hand:
+    """
+    Cards of a player, a multiset bucketed by (suit, value) key. Adding,
+    removing and membership only touch the card's bucket, and iteration
+    walks the keys suit by suit, so the hand is always sorted by suit letter
+    and value, jokers last, without sorting. A bit mask of the keys held
+    skips the empty buckets, and the hand signature is kept up to date on
+    every change
+    """
+    def __init__(self, cards: Iterable[Card] = ()):
+        self._buckets: List[List[Card]] = [[] for _ in range(JOKER_KEY + 1)]
+        self._keys = 0  # Bit k is set while the hand holds a card with key k
+        self._size = 0
+        self.signature = 0
+        for card in cards:
+            self.append(card)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __contains__(self, card: Card) -> bool:
+        return card in self._buckets[card.key]
+
+    def __iter__(self) -> Iterator[Card]:
+        # A snapshot, the hand can change while it is iterated
+        return iter(self.cards())
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.cards()[i]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("hand index out of range")
+        for key in self._held_keys():
+            bucket = self._buckets[key]
+            if i < len(bucket):
+                return bucket[i]
+            i -= len(bucket)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Hand, list, tuple)):
+            return self.cards() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Hand({self.cards()!r})"
+
+    def cards(self) -> List[Card]:
+        cards = []
+        for key in self._held_keys():
+            cards.extend(self._buckets[key])
+        return cards
+
+    @property
+    def key_mask(self) -> int:
+        # Bit k is set while the hand holds a card with key k
+        return self._keys
+
+    def count(self, key: int) -> int:
+        # Copies of the (suit, value) key in the hand
+        return len(self._buckets[key])
+
+    def with_key(self, key: int) -> Tuple[Card, ...]:
+        return tuple(self._buckets[key])
+
+    def append(self, card: Card):
+        bucket = self._buckets[card.key]
+        bucket.append(card)
+        self._keys |= 1 << card.key
+        self._size += 1
+        self.signature += 1 << (card.key * _SIGNATURE_BITS)
+
+    add = append
+
+    def extend(self, cards: Iterable[Card]):
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card: Card):
+        bucket = self._buckets[card.key]
+        for i, other in enumerate(bucket):
+            if other is card:
+                del bucket[i]
+                break
+        else:
+            raise ValueError(f"{card!r} is not in the hand")
+        if not bucket:
+            self._keys &= ~(1 << card.key)
+        self._size -= 1
+        self.signature -= 1 << (card.key * _SIGNATURE_BITS)
+
+    def take(self, key: int) -> Card:
+        """
+        Removes and returns a card with the given key, the last one added
+        """
+        bucket = self._buckets[key]
+        if not bucket:
+            raise ValueError(f"No card with key {key} in the hand")
+        card = bucket[-1]
+        self.remove(card)
+        return card
+
+    def find(self, card_id: int) -> Optional[Card]:
+        # Dealt cards only, their id is copy * 52 + key
+        for card in self._buckets[card_key(card_id)]:
+            if card.id == card_id:
+                return card
+        return None
+
+    def pop(self, i: int = -1) -> Card:
+        card = self[i]
+        self.remove(card)
+        return card
+
+    def index(self, card: Card) -> int:
+        i = 0
+        for key in self._held_keys():
+            bucket = self._buckets[key]
+            if key == card.key:
+                for j, other in enumerate(bucket):
+                    if other is card:
+                        return i + j
+                break
+            i += len(bucket)
+        raise ValueError(f"{card!r} is not in the hand")
+
+    def clear(self):
+        for key in self._held_keys():
+            self._buckets[key].clear()
+        self._keys = 0
+        self._size = 0
+        self.signature = 0
+
+    def copy(self) -> List[Card]:
+        return self.cards()
+
+    def _held_keys(self) -> Iterator[int]:
+        keys = self._keys
+        for suit in _SUIT_ORDER:
+            shift = suit * NUM_VALUES
+            bits = keys >> shift & _SUIT_BITS
+            while bits:
+                low = bits & -bits
+                yield shift + low.bit_length() - 1
+                bits ^= low
+        if keys >> JOKER_KEY:
+            yield JOKER_KEY
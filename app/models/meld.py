@@ -1,6 +1,18 @@
 from dataclasses import dataclass
-from typing import List
-from .card import Card
+from typing import Iterable, List
+from .card import Card, JOKER_KEY
+from ..catalog import extension_keys as catalog_extension_keys
+from .. import jokers
+
+def extension_keys(meld_type: str, keys: Iterable[int]) -> List[int]:
+    """
+    (suit, value) keys of the cards that can be added to a meld
+    """
+    naturals, wild = jokers.split_jokers(keys)
+    if wild:
+        return jokers.extension_keys(meld_type, naturals, wild)
+    # The key mask alone tells runs from sets, the catalog knows both
+    return catalog_extension_keys(naturals)
 
 @dataclass
 class Meld:
@@ -8,17 +20,9 @@ class Meld:
     type: str  # 'run' or 'set'
     
     def can_be_robbed(self, card: Card) -> bool:
-        if self.type == 'run':
-            # Can add to either end of the run
-            sorted_cards = sorted(self.cards, key=lambda x: x.value)
-            if (card.suit == sorted_cards[0].suit and 
-                card.value == sorted_cards[0].value - 1):
-                return True
-            if (card.suit == sorted_cards[-1].suit and 
-                card.value == sorted_cards[-1].value + 1):
-                return True
-        elif self.type == 'set':
-            # Can add same value, different suit
-            return (card.value == self.cards[0].value and 
-                   card.suit not in [c.suit for c in self.cards])
-        return False
\ No newline at end of file
+        if card.key == JOKER_KEY:
+            return jokers.has_room(self.type, len(self.cards))
+        return card.key in self.extension_keys()
+
+    def extension_keys(self) -> List[int]:
+        return extension_keys(self.type, (card.key for card in self.cards))
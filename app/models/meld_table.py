@@ -0,0 +1,90 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .card import Card, JOKER_KEY
+from .meld import Meld
+from ..jokers import has_room
+
+class MeldTable:
+    """
+    Melds in play, with an index from (suit, value) key to the melds that a
+    card with that key can extend. The index is updated whenever a meld is
+    added, removed or extended, so melds must change through this table.
+    Jokers extend any meld with room, they aren't indexed
+    """
+    def __init__(self, melds: Iterable[Meld] = ()):
+        self.melds: List[Meld] = []
+        self.card_count = 0
+        self.index: Dict[int, List[Meld]] = {}
+        self.key_mask = 0  # Bit k is set while the index holds key k
+        self._indexed_keys: Dict[int, Tuple[int, ...]] = {}  # id(meld) -> keys
+        for meld in melds:
+            self.append(meld)
+
+    def __iter__(self) -> Iterator[Meld]:
+        return iter(self.melds)
+
+    def __len__(self) -> int:
+        return len(self.melds)
+
+    def __getitem__(self, i: int) -> Meld:
+        return self.melds[i]
+
+    def append(self, meld: Meld):
+        self.melds.append(meld)
+        self.card_count += len(meld.cards)
+        self._add_to_index(meld)
+
+    def position(self, meld: Meld) -> int:
+        # Melds are matched by identity, two melds can hold equal cards
+        for i, other in enumerate(self.melds):
+            if other is meld:
+                return i
+        raise ValueError("Meld is not on the table")
+
+    def remove(self, meld: Meld):
+        # Melds are matched by identity, two melds can hold equal cards
+        for i, other in enumerate(self.melds):
+            if other is meld:
+                del self.melds[i]
+                self.card_count -= len(meld.cards)
+                self._remove_from_index(meld)
+                return
+        raise ValueError("Meld is not on the table")
+
+    def extend_meld(self, meld: Meld, card: Card):
+        self._remove_from_index(meld)
+        meld.cards.append(card)
+        self.card_count += 1
+        self._add_to_index(meld)
+
+    def take_card(self, meld: Meld, card: Card):
+        # Takes a card out of a meld that stays on the table
+        self._remove_from_index(meld)
+        meld.cards.remove(card)
+        self.card_count -= 1
+        self._add_to_index(meld)
+
+    def robbable(self, key: int) -> List[Meld]:
+        """
+        Melds that a card with the given key can extend
+        """
+        if key == JOKER_KEY:
+            return [meld for meld in self.melds if has_room(meld.type, len(meld.cards))]
+        return self.index.get(key, [])
+
+    def _add_to_index(self, meld: Meld):
+        keys = tuple(meld.extension_keys())
+        self._indexed_keys[id(meld)] = keys
+        for key in keys:
+            self.index.setdefault(key, []).append(meld)
+            self.key_mask |= 1 << key
+
+    def _remove_from_index(self, meld: Meld):
+        for key in self._indexed_keys.pop(id(meld)):
+            melds = self.index[key]
+            for i, other in enumerate(melds):
+                if other is meld:
+                    del melds[i]
+                    break
+            if not melds:
+                del self.index[key]
+                self.key_mask &= ~(1 << key)
@@ -1,13 +1,32 @@
-from typing import List
+from typing import Iterable
 from .card import Card
+from .hand import Hand
+from ..analysis import HandAnalysis, analyze
 
 class Player:
-    def __init__(self, name: str, is_ai: bool = False):
+    def __init__(self, name: str, is_ai: bool = False, strategy=None):
         self.name = name
-        self.hand: List[Card] = []
+        self.hand = Hand()
         self.is_ai = is_ai
         self.score = 0
+        # Optional search AI with a choose_action(game, player) method
+        self.strategy = strategy
+        # Optional tracker.CardTracker of the cards the player has seen
+        self.tracker = None
     
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]):
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
+
+    @property
+    def analysis(self) -> HandAnalysis:
+        # Cached by the signature of the hand, see analyze
+        return analyze(self.hand.signature)
+
     def __str__(self):
         return self.name
     
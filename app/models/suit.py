@@ -4,4 +4,7 @@ class Suit(Enum):
     HEARTS = "P"
     DIAMONDS = "K"
     CLUBS = "N"
-    SPADES = "F"
\ No newline at end of file
+    SPADES = "F"
+
+    # Members are singletons, identity hashing is much cheaper than Enum's
+    __hash__ = object.__hash__
@@ -0,0 +1,112 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from .catalog import BY_KEY, MELDS, melds_in
+from .jokers import has_room
+from .models.card import JOKER_KEY, NUM_KEYS, card_key
+from .models.meld import extension_keys
+from .solver import SIGNATURE_BITS, COUNT_MASK, JOKER_SHIFT
+
+# Action kinds
+DRAW = 'draw'
+END_TURN = 'end_turn'
+MELD = 'meld'
+EXTEND = 'extend'
+ROB = 'rob'
+REARRANGE = 'rearrange'
+
+class Action(NamedTuple):
+    """
+    One legal action of the current player. Cards are integer card ids and
+    melds are indices into the table, so actions are cheap to create, hash
+    and send to another process or over the network
+    """
+    kind: str
+    cards: Tuple[int, ...] = ()  # Cards taken from the hand
+    meld: int = -1  # Table meld that is extended, robbed or rearranged
+    table_card: int = -1  # Card REARRANGE takes out of the table meld
+    meld_type: str = ''  # 'run' or 'set' for the new meld of MELD and REARRANGE
+
+DRAW_ACTION = Action(DRAW)
+END_TURN_ACTION = Action(END_TURN)
+
+# A table meld as seen by the generator: ('run' or 'set', card ids)
+TableMeld = Tuple[str, Tuple[int, ...]]
+
+@lru_cache(maxsize=1 << 14)
+def meld_options(signature: int) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """
+    Every run and set that can be formed from a hand signature, by key.
+    With a joker in the hand that includes the melds it completes, a joker
+    in place of their one missing key. More jokers join by extending
+    """
+    present = 0
+    for key in range(NUM_KEYS):
+        if (signature >> (key * SIGNATURE_BITS)) & COUNT_MASK:
+            present |= 1 << key
+    options = [(meld.type, meld.keys) for meld in melds_in(present)]
+    if signature >> JOKER_SHIFT:
+        for meld in MELDS:
+            missing = meld.mask & ~present
+            if missing and not missing & (missing - 1):
+                missing_key = missing.bit_length() - 1
+                options.append((meld.type, tuple(JOKER_KEY if key == missing_key else key for key in meld.keys)))
+    return tuple(options)
+
+def _detachable_keys(meld_type: str, keys: List[int]) -> List[int]:
+    # Cards that can leave the meld without breaking it, melds with jokers keep theirs
+    if JOKER_KEY in keys:
+        return []
+    if meld_type == 'run' and len(keys) >= 4:
+        return [min(keys), max(keys)]
+    if meld_type == 'set' and len(keys) >= 4:
+        return keys
+    return []
+
+def _rearrange_options(key: int, by_key: Dict[int, int]) -> List[Tuple[str, Tuple[int, ...]]]:
+    # New 3 card melds made of one table card and two hand cards
+    options = []
+    for meld in BY_KEY[key]:
+        if len(meld.keys) == 3:
+            others = tuple(other for other in meld.keys if other != key)
+            if others[0] in by_key and others[1] in by_key:
+                options.append((meld.type, others))
+    return options
+
+def generate_actions(hand: Sequence[int], table: Sequence[TableMeld], deck_size: int) -> List[Action]:
+    """
+    Every legal action for a hand of card ids, the table melds and the deck
+    """
+    actions = []
+    if deck_size > 0:
+        actions.append(DRAW_ACTION)
+    actions.append(END_TURN_ACTION)
+
+    by_key: Dict[int, int] = {}
+    signature = 0
+    for card_id in hand:
+        key = card_key(card_id)
+        if key not in by_key:
+            by_key[key] = card_id
+        signature += 1 << (key * SIGNATURE_BITS)
+
+    # New melds from the hand, one card id per key is enough as copies are alike
+    for meld_type, keys in meld_options(signature):
+        actions.append(Action(MELD, tuple(by_key[key] for key in keys), meld_type=meld_type))
+
+    for index, (meld_type, card_ids) in enumerate(table):
+        keys = [card_key(card_id) for card_id in card_ids]
+        for key in extension_keys(meld_type, keys):
+            if key in by_key:
+                actions.append(Action(EXTEND, (by_key[key],), meld=index))
+        if JOKER_KEY in by_key and has_room(meld_type, len(keys)):
+            actions.append(Action(EXTEND, (by_key[JOKER_KEY],), meld=index))
+        actions.append(Action(ROB, meld=index))
+        for key in _detachable_keys(meld_type, keys):
+            table_card = card_ids[keys.index(key)]
+            for new_type, hand_keys in _rearrange_options(key, by_key):
+                actions.append(Action(REARRANGE, tuple(by_key[k] for k in hand_keys),
+                                      meld=index, table_card=table_card, meld_type=new_type))
+    return actions
+
+def ends_turn(action: Action) -> bool:
+    return action.kind == DRAW or action.kind == END_TURN
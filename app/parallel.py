@@ -0,0 +1,240 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .ismcts import ISMCTS, SearchResult
+from .moves import Action
+from .state import GameState
+from .tracker import CardTracker, NUM_TRACKED
+
+# Root parallel ISMCTS: every worker searches the same decision with its
+# own samples of the hidden cards and the root statistics are summed. The
+# state goes to the workers as a packed array of 16 bit integers, card ids
+# and sizes, and the results come back as plain tuples
+
+_MELD_TYPES = ('run', 'set')
+
+def pack_state(state: GameState, known: Optional[Sequence[Sequence[int]]] = None) -> bytes:
+    """
+    The state and the copies of each key known to be in each hand, from
+    CardTracker.known, as 16 bit integers
+    """
+    data = array('H', [len(state.hands), state.current, state.acted, state.passes, state.deck_size,
+                       len(state.deck)])
+    data.extend(state.deck)
+    for hand in state.hands:
+        data.append(len(hand))
+        data.extend(hand)
+    data.append(len(state.table))
+    for meld_type, card_ids in state.table:
+        data.append(_MELD_TYPES.index(meld_type))
+        data.append(len(card_ids))
+        data.extend(card_ids)
+    # Only the known copies, as (seat, key, count)
+    entries = [(seat, key, count) for seat, counts in enumerate(known or ()) for key, count in enumerate(counts) if count]
+    data.append(len(entries))
+    for entry in entries:
+        data.extend(entry)
+    return data.tobytes()
+
+def unpack_state(payload: bytes) -> Tuple[GameState, List[List[int]]]:
+    """
+    State and known copies of pack_state
+    """
+    data = array('H')
+    data.frombytes(payload)
+    values = iter(data)
+    players, current, acted, passes, deck_size, deck_length = (next(values) for _ in range(6))
+    deck = [next(values) for _ in range(deck_length)]
+    hands = [[next(values) for _ in range(next(values))] for _ in range(players)]
+    table = []
+    for _ in range(next(values)):
+        meld_type = _MELD_TYPES[next(values)]
+        table.append((meld_type, tuple(next(values) for _ in range(next(values)))))
+    known = [[0] * NUM_TRACKED for _ in range(players)]
+    for _ in range(next(values)):
+        seat, key, count = next(values), next(values), next(values)
+        known[seat][key] = count
+    state = GameState(deck, hands, table, current, deck_size)
+    state.acted = bool(acted)
+    state.passes = passes
+    return state, known
+
+# Root statistics of one worker: (iterations, ((action fields, visits, reward sum), ...))
+WorkerResult = Tuple[int, Tuple[Tuple[tuple, int, float], ...]]
+
+def _search_root(args: Tuple[bytes, float, Optional[int], float, int, int]) -> WorkerResult:
+    payload, deadline, iterations, exploration, rollout_turns, seed = args
+    # The deadline is on time.monotonic, the one clock every process shares.
+    # A task that only starts after it has nothing left to search
+    budget = deadline - time.monotonic()
+    if budget <= 0:
+        return 0, ()
+    state, known = unpack_state(payload)
+    tracker = None
+    if any(any(counts) for counts in known):
+        tracker = CardTracker(state.current, len(state.hands))
+        tracker.known = known
+    search = ISMCTS(iterations=iterations, time_budget=budget, exploration=exploration,
+                    rollout_turns=rollout_turns, seed=seed)
+    result = search.search(state, time.perf_counter() + budget, tracker)
+    return result.iterations, tuple(
+        (tuple(action), visits, result.values.get(action, 0.0) * visits) for action, visits in result.visits.items())
+
+def merge_results(results: Iterable[WorkerResult]) -> Tuple[int, Dict[Action, int], Dict[Action, float]]:
+    """
+    Sums the root statistics of the workers: (iterations, visits, mean rewards)
+    """
+    iterations = 0
+    visits: Dict[Action, int] = {}
+    rewards: Dict[Action, float] = {}
+    for worker_iterations, stats in results:
+        iterations += worker_iterations
+        for fields, count, reward in stats:
+            action = Action(*fields)
+            visits[action] = visits.get(action, 0) + count
+            rewards[action] = rewards.get(action, 0.0) + reward
+    return iterations, visits, {action: rewards[action] / visits[action] for action in visits if visits[action]}
+
+def _warm_worker():
+    # Imports and fills the move and solver caches once per worker process
+    from .rummy import RobbersRummy
+    game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=0)
+    game.all_cards = game.create_deck()
+    game.deal_initial_hand()
+    ISMCTS(iterations=20, rollout_turns=2, seed=0).search(GameState.from_game(game))
+
+def _ready(_) -> bool:
+    return True
+
+class SearchPool:
+    """
+    Persistent pool of search processes. The processes start and warm up
+    once and are reused by every decision, of every turn and table, so a
+    decision only pays for sending its state. Decisions take free workers
+    only, a worker stays taken until its task is back, so tasks never queue
+    behind the tasks of another decision
+    """
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.pool = multiprocessing.Pool(self.workers, initializer=_warm_worker)
+        self.busy = 0
+        self._free = threading.Condition()
+        self.warm()
+
+    def warm(self):
+        # Returns once the workers have started and taken a task
+        self.pool.map(_ready, range(self.workers), chunksize=1)
+
+    def _take(self, wanted: int, until: float) -> int:
+        # Up to wanted free workers, waits for one until the monotonic time until
+        with self._free:
+            while self.busy >= self.workers:
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    return 0
+                self._free.wait(remaining)
+            taken = min(wanted, self.workers - self.busy)
+            self.busy += taken
+            return taken
+
+    def _release(self, _=None):
+        # Result callback of the pool, also for tasks whose result was dropped
+        with self._free:
+            self.busy -= 1
+            self._free.notify_all()
+
+    def search(self, state: GameState, time_budget: float, iterations: Optional[int] = None,
+               tracker: Optional[CardTracker] = None, exploration: float = 0.7, rollout_turns: int = 8,
+               seed: int = 0, margin: float = 0.1, workers: Optional[int] = None) -> SearchResult:
+        """
+        One decision searched by up to workers free workers, all of them by
+        default. Workers stop margin of the budget early to send their
+        results, and results that aren't back when the budget is up are
+        dropped, so the call returns within the budget. With no result at
+        all the greedy rollout policy decides
+        """
+        start = time.monotonic()
+        deadline = start + time_budget
+        stop = deadline - time_budget * margin
+        taken = self._take(self.workers if workers is None else workers, stop)
+        payload = pack_state(state, None if tracker is None else tracker.known)
+        pending = [self.pool.apply_async(_search_root, ((payload, stop, iterations, exploration, rollout_turns,
+                                                         seed + worker),),
+                                         callback=self._release, error_callback=self._release)
+                   for worker in range(taken)]
+        results = []
+        for result in pending:
+            try:
+                results.append(result.get(max(0.0, deadline - time.monotonic())))
+            except multiprocessing.TimeoutError:
+                pass
+
+        total, visits, values = merge_results(results)
+        if not visits:
+            return ISMCTS(iterations=0).search(state)
+        best = max(visits, key=lambda action: (visits[action], values.get(action, 0.0)))
+        return SearchResult(best, total, time.monotonic() - start, visits, values)
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self) -> "SearchPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_shared: Optional[SearchPool] = None
+
+def shared_pool(workers: Optional[int] = None) -> SearchPool:
+    """
+    The pool of the process, created on first use with workers processes,
+    one per core by default, and closed at exit
+    """
+    global _shared
+    if _shared is None:
+        _shared = SearchPool(workers)
+        atexit.register(_shared.close)
+    elif workers is not None and workers != _shared.workers:
+        raise ValueError(f"The shared pool already has {_shared.workers} workers")
+    return _shared
+
+class ParallelISMCTS:
+    """
+    ISMCTS strategy that searches each decision on a SearchPool within a
+    hard time budget in seconds. More workers give more playouts in the
+    same wall time. workers is the share of the pool the strategy uses per
+    decision, all of it by default; tables that search at the same time
+    should get shares that add up to the pool size, or a decision only
+    gets the workers left over
+    """
+    def __init__(self, time_budget: float = 0.5, pool: Optional[SearchPool] = None, workers: Optional[int] = None,
+                 iterations: Optional[int] = None, exploration: float = 0.7, rollout_turns: int = 8,
+                 seed: int = 0):
+        self.time_budget = time_budget
+        self.pool = pool if pool is not None else shared_pool()
+        self.workers = min(workers, self.pool.workers) if workers is not None else self.pool.workers
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.seed = seed
+        self.decisions = 0
+
+    def choose_action(self, game, player) -> Action:
+        """
+        Strategy hook used by RobbersRummy for AI players
+        """
+        state = GameState.from_game(game)
+        state.current = game.players.index(player)
+        return self.search(state, player.tracker).action
+
+    def search(self, state: GameState, tracker: Optional[CardTracker] = None) -> SearchResult:
+        # Every decision gets fresh seeds, so workers don't repeat earlier samples
+        self.decisions += 1
+        seed = self.seed + self.decisions * self.workers
+        return self.pool.search(state, self.time_budget, self.iterations, tracker, self.exploration,
+                                self.rollout_turns, seed, workers=self.workers)
@@ -0,0 +1,138 @@
+import json
+import time
+from functools import wraps
+from typing import Callable, Dict, Optional, Sequence, TextIO
+from . import eventlog
+
+# Game methods timed by the profiler and the phase they count to. Phases
+# are inclusive, ai_turn contains the rob search, arrangement and drawing
+GAME_PHASES = {
+    '_audit_turn': 'integrity',
+    'check_game_integrity': 'integrity',
+    '_ai_play_turn': 'ai_turn',
+    '_ai_rob': 'rob_search',
+    'try_form_melds': 'meld_grouping',
+    'ai_arrange_best': 'arrangement',
+    'ai_arrange_set': 'set_arrangement',
+    'ai_arrange_run': 'run_arrangement',
+    '_ai_rearrange_melds': 'rearrangement',
+    '_ai_draw': 'drawing',
+}
+RENDERER_PHASES = {
+    'ai_turn': 'rendering',
+    'game_state': 'rendering',
+}
+
+# Counter of every recorded event kind
+EVENT_COUNTERS = {
+    eventlog.DEAL: 'deals',
+    eventlog.DRAW: 'draws',
+    eventlog.MELD: 'melds_formed',
+    eventlog.EXTEND: 'melds_extended',
+    eventlog.ROB: 'robs',
+    eventlog.REARRANGE: 'rearrangements',
+    eventlog.GAME_OVER: 'games',
+    eventlog.REPARTITION: 'repartitions',
+}
+
+class PhaseStats:
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+class TurnProfiler:
+    """
+    Wall time and call counts per phase of a turn, and counters of what
+    happened in the games. Nothing is instrumented until a game is attached,
+    attaching wraps the game's methods on the instance, so games without a
+    profiler run the plain methods at no cost
+    """
+    def __init__(self, export: Optional[TextIO] = None, export_every: int = 1000,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.turns = 0
+        self.export = export  # JSON lines stream, one snapshot every export_every turns
+        self.export_every = export_every
+        self.clock = clock
+
+    def attach(self, game):
+        for method, phase in GAME_PHASES.items():
+            setattr(game, method, self._timed(phase, getattr(game, method)))
+        for method, phase in RENDERER_PHASES.items():
+            setattr(game.renderer, method, self._timed(phase, getattr(game.renderer, method)))
+        game.play_player_turn = self._turn(game, game.play_player_turn)
+        game.events = _GameEvents(self, game, game.events)
+
+    def detach(self, game):
+        for method in list(GAME_PHASES) + ['play_player_turn']:
+            game.__dict__.pop(method, None)
+        for method in RENDERER_PHASES:
+            game.renderer.__dict__.pop(method, None)
+        if isinstance(game.events, _GameEvents):
+            game.events = game.events.forward
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        stats = self.phases.setdefault(phase, PhaseStats())
+        clock = self.clock
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats.seconds += clock() - start
+                stats.calls += 1
+        return timed
+
+    def _turn(self, game, play_player_turn: Callable) -> Callable:
+        timed = self._timed('turn', play_player_turn)
+
+        @wraps(play_player_turn)
+        def turn(*args, **kwargs):
+            passes = game.passes
+            timed(*args, **kwargs)
+            if game.passes > passes:
+                self.count('turns_without_move')
+            self.turns += 1
+            if self.export is not None and self.turns % self.export_every == 0:
+                self.export_snapshot()
+        return turn
+
+    def snapshot(self) -> dict:
+        return {
+            'turns': self.turns,
+            'phases': {phase: {'calls': stats.calls, 'seconds': stats.seconds}
+                       for phase, stats in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+    def export_snapshot(self):
+        line = self.snapshot()
+        line['time'] = time.time()
+        self.export.write(json.dumps(line) + "\n")
+        self.export.flush()
+
+class _GameEvents:
+    # Event sink of one attached game, counts the events and passes them on
+    def __init__(self, profiler: TurnProfiler, game, forward):
+        self.profiler = profiler
+        self.game = game
+        self.forward = forward
+
+    def begin_game(self, seed: Optional[int], num_players: int):
+        if self.forward is not None:
+            self.forward.begin_game(seed, num_players)
+
+    def record(self, turn: int, kind: int, seat: int, cards: Sequence[int] = (), meld: int = eventlog.NO_MELD):
+        self.profiler.count(EVENT_COUNTERS[kind])
+        if kind == eventlog.DRAW and not self.game.all_cards:
+            self.profiler.count('deck_exhausted')
+        if self.forward is not None:
+            self.forward.record(turn, kind, seat, cards, meld)
@@ -0,0 +1,225 @@
+import time
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from .models.card import JOKER_KEY, NUM_VALUES
+from .solver import KeyMeld, SIGNATURE_BITS, COUNT_MASK, meldable_signature, solve_signature
+
+class Rearrangement(NamedTuple):
+    melds: Tuple[KeyMeld, ...]  # The whole new table, by keys
+    placed: int  # Hand cards that end up on the table
+    complete: bool  # False when the budget ran out, the answer is the best one found by then
+
+class _OutOfTime(Exception):
+    pass
+
+# Open runs of a suit are kept as a sorted tuple of their lengths, capped
+# at 3 as any run of 3 or more can be closed. A state holds one tuple per suit
+SuitRuns = Tuple[int, ...]
+State = Tuple[SuitRuns, SuitRuns, SuitRuns, SuitRuns]
+
+@lru_cache(maxsize=1 << 14)
+def _suit_options(runs: SuitRuns, table: int, hand: int) -> Dict[int, Tuple[Tuple[SuitRuns, int], ...]]:
+    """
+    Ways to use the copies of one card at the next value, by the number of
+    copies that go into sets: (open runs after it, hand copies placed).
+    Table copies are always used, runs shorter than 3 must go on
+    """
+    short_1 = runs.count(1)
+    short_2 = runs.count(2)
+    long = runs.count(3)
+    options: Dict[int, List[Tuple[SuitRuns, int]]] = {}
+    # Most hand copies placed first, the search stops once nothing can beat it
+    for placed in range(hand, -1, -1):
+        used = table + placed - short_1 - short_2
+        if used < 0:
+            continue
+        for closed in range(long + 1):
+            # Runs of 3 or more that go on, the others end here
+            going_on = long - closed
+            free = used - going_on
+            if free < 0:
+                continue
+            for new_runs in range(free + 1):
+                after = (1,) * new_runs + (2,) * short_1 + (3,) * (short_2 + going_on)
+                options.setdefault(free - new_runs, []).append((after, placed))
+    return {in_sets: tuple(group) for in_sets, group in options.items()}
+
+@lru_cache(maxsize=None)
+def _sets_fit(counts: Tuple[int, ...]) -> bool:
+    # Copies per suit can be split into sets of 3 or more suits, with as many
+    # sets as the largest count the sets are at most one card apart in size
+    return 3 * max(counts) <= sum(counts) or not any(counts)
+
+class _Search:
+    """
+    Value by value dynamic program over the whole table and the hand. At
+    each value every copy of a card continues an open run of its suit,
+    starts a run, joins a set or, for hand cards only, stays in the hand.
+    The best whole table found so far is kept as the choices up to some
+    value, the memo holds the rest, so a search that runs out of time still
+    has an answer
+    """
+    def __init__(self, table: List[List[int]], hand: List[List[int]], deadline: Optional[float],
+                 max_nodes: Optional[int] = None):
+        self.table = table  # [value][suit] -> table copies
+        self.hand = hand  # [value][suit] -> hand copies
+        # Hand cards from each value on that fit in some meld, no answer can place more
+        meldable = meldable_signature(_signature(table) + _signature(hand))
+        self.bound = [0] * (NUM_VALUES + 1)
+        for value in range(NUM_VALUES - 1, -1, -1):
+            self.bound[value] = self.bound[value + 1] + sum(
+                hand[value][suit] for suit in range(4)
+                if meldable >> ((suit * NUM_VALUES + value) * SIGNATURE_BITS) & COUNT_MASK)
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.memo: Dict[Tuple[int, State], Tuple[int, Optional[tuple]]] = {}
+        self.nodes = 0
+        self.path: List[tuple] = []  # Choices of the values above the current one
+        self.path_placed = 0
+        self.found: Optional[List[tuple]] = None
+        self.found_placed = -1
+
+    def best(self, value: int, state: State) -> int:
+        """
+        Most hand cards placed from this value on, -1 when the table cards
+        can't all be melded
+        """
+        if value == NUM_VALUES:
+            return 0 if all(length == 3 for runs in state for length in runs) else -1
+        found = self.memo.get((value, state))
+        if found is not None:
+            return found[0]
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _OutOfTime()
+        if self.deadline is not None and self.nodes & 63 == 1 and time.perf_counter() > self.deadline:
+            raise _OutOfTime()
+
+        table = self.table[value]
+        hand = self.hand[value]
+        options = [_suit_options(state[suit], table[suit], hand[suit]) for suit in range(4)]
+        best, choice = -1, None
+        bound = self.bound[value]
+        later = self.bound[value + 1]
+        for set_counts in product(*options):
+            if not _sets_fit(set_counts):
+                continue
+            for combo in product(*(options[suit][count] for suit, count in enumerate(set_counts))):
+                here = combo[0][1] + combo[1][1] + combo[2][1] + combo[3][1]
+                if here + later <= best:
+                    continue
+                self.path.append((combo, set_counts))
+                self.path_placed += here
+                rest = self.best(value + 1, (combo[0][0], combo[1][0], combo[2][0], combo[3][0]))
+                self.path.pop()
+                self.path_placed -= here
+                if rest >= 0 and self.path_placed + here + rest > self.found_placed:
+                    self.found_placed = self.path_placed + here + rest
+                    self.found = self.path + [(combo, set_counts)]
+                if rest >= 0 and here + rest > best:
+                    best, choice = here + rest, (combo, set_counts)
+                    if best == bound:
+                        break
+            if best == bound:
+                break
+        self.memo[(value, state)] = (best, choice)
+        return best
+
+    def melds(self, choices: Sequence[tuple] = ()) -> Tuple[KeyMeld, ...]:
+        # Replays the given choices of the first values, then the best ones, and builds the melds they make
+        melds: List[KeyMeld] = []
+        open_runs: List[List[List[int]]] = [[], [], [], []]  # suit -> runs, a run is its list of keys
+        state: State = ((), (), (), ())
+        for value in range(NUM_VALUES):
+            if value < len(choices):
+                combo = choices[value]
+            else:
+                _, combo = self.memo.get((value, state), (0, None))
+            if combo is None:
+                break
+            set_cards = []
+            for suit, ((after, _), in_sets) in enumerate(zip(*combo)):
+                key = suit * NUM_VALUES + value
+                runs = sorted(open_runs[suit], key=len)
+                # The shortest runs must go on, the longest ones can end
+                going_on = len(after) - after.count(1)
+                for run in runs[going_on:]:
+                    melds.append(('run', tuple(run)))
+                continued = [run + [key] for run in runs[:going_on]]
+                open_runs[suit] = continued + [[key] for _ in range(after.count(1))]
+                set_cards.extend([suit] * in_sets)
+            melds.extend(_split_sets(set_cards, value))
+            state = tuple(tuple(sorted(min(len(run), 3) for run in runs)) for runs in open_runs)
+        for runs in open_runs:
+            for run in runs:
+                melds.append(('run', tuple(run)))
+        return tuple(melds)
+
+def _split_sets(suits: List[int], value: int) -> List[KeyMeld]:
+    if not suits:
+        return []
+    counts = [suits.count(suit) for suit in range(4)]
+    num_sets = max(counts)
+    sets: List[List[int]] = [[] for _ in range(num_sets)]
+    i = 0
+    # Round robin from the most common suit keeps every set free of repeats
+    for suit in sorted(range(4), key=lambda suit: -counts[suit]):
+        for _ in range(counts[suit]):
+            sets[i % num_sets].append(suit * NUM_VALUES + value)
+            i += 1
+    return [('set', tuple(sorted(keys))) for keys in sets]
+
+def _signature(grid: List[List[int]]) -> int:
+    signature = 0
+    for value, counts in enumerate(grid):
+        for suit, count in enumerate(counts):
+            signature += count << ((suit * NUM_VALUES + value) * SIGNATURE_BITS)
+    return signature
+
+def _grid(keys: Iterable[int]) -> List[List[int]]:
+    grid = [[0] * 4 for _ in range(NUM_VALUES)]
+    for key in keys:
+        suit, value = divmod(key, NUM_VALUES)
+        grid[value][suit] += 1
+    return grid
+
+def rearrange(table_melds: Sequence[KeyMeld], hand_keys: Iterable[int],
+              budget: Optional[float] = None, max_nodes: Optional[int] = None) -> Rearrangement:
+    """
+    New partition of the table melds and the hand that places as many hand
+    cards as possible. When the budget in seconds, or of max_nodes search
+    nodes, runs out the answer is the best partition found by then, or the
+    fallback when that places more. Only the node budget is reproducible.
+    The search knows no jokers, with jokers in play the answer is the
+    fallback
+    """
+    hand_keys = list(hand_keys)
+    if JOKER_KEY in hand_keys or any(JOKER_KEY in keys for _, keys in table_melds):
+        return fallback(table_melds, hand_keys)
+    search = _Search(_grid(key for _, keys in table_melds for key in keys), _grid(hand_keys),
+                     None if budget is None else time.perf_counter() + budget, max_nodes)
+    if search.bound[0] == 0:
+        # No hand card fits any meld, the table stays as it is
+        return Rearrangement(tuple(table_melds), 0, True)
+    try:
+        placed = search.best(0, ((), (), (), ()))
+    except _OutOfTime:
+        answer = fallback(table_melds, hand_keys)
+        if search.found_placed > answer.placed:
+            answer = Rearrangement(search.melds(search.found), search.found_placed, False)
+        return answer
+    if placed < 0:
+        return fallback(table_melds, hand_keys)
+    return Rearrangement(search.melds(), placed, True)
+
+def fallback(table_melds: Sequence[KeyMeld], hand_keys: Iterable[int]) -> Rearrangement:
+    """
+    The table as it is plus the best melds of the hand alone
+    """
+    signature = 0
+    for key in hand_keys:
+        signature += 1 << (key * SIGNATURE_BITS)
+    cards, _, melds = solve_signature(signature)
+    return Rearrangement(tuple(table_melds) + melds, cards, False)
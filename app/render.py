@@ -0,0 +1,184 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+from rich.console import Console
+from rich.table import Table
+from .models.card import Card, SUITS, JOKER_ID_BASE, card_from_id, card_value, suit_colors
+
+class Renderer(ABC):
+    """
+    Presentation of a game. RobbersRummy only talks to its renderer, so the
+    output can be swapped, throttled or switched off
+    """
+    # False while nothing would be shown, callers skip building their output
+    active = True
+
+    @abstractmethod
+    def ai_turn(self, game, player):
+        pass
+
+    @abstractmethod
+    def game_state(self, game, player):
+        pass
+
+    @abstractmethod
+    def message(self, text: str):
+        pass
+
+    @abstractmethod
+    def card(self, card: Card) -> str:
+        pass
+
+class NullRenderer(Renderer):
+    """
+    Renders nothing, used for headless games
+    """
+    active = False
+
+    def ai_turn(self, game, player):
+        pass
+
+    def game_state(self, game, player):
+        pass
+
+    def message(self, text: str):
+        pass
+
+    def card(self, card: Card) -> str:
+        return str(card)
+
+def _remember(cache: dict, key, value, limit: int):
+    # Dicts keep insertion order, the oldest entry goes first
+    if len(cache) >= limit:
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+class RichRenderer(Renderer):
+    """
+    Console renderer. Card markup is built once per card, hands and melds
+    are only rebuilt when their cards changed. AI turns only show the melds
+    that changed since the table was last shown, a human turn always shows
+    the whole numbered table to pick melds from. AI turns closer together
+    than min_interval seconds are not shown, so fast AI games don't flood
+    the console
+    """
+    def __init__(self, console: Optional[Console] = None, min_interval: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic, cache_size: int = 512):
+        self.console = console if console is not None else Console()
+        self.min_interval = min_interval
+        self.clock = clock
+        self.cache_size = cache_size
+        self.active = True
+        self._last_ai_turn: Optional[float] = None
+        self._cards: Dict[int, str] = {}  # card id -> markup
+        self._hands: Dict[int, Table] = {}  # hand signature -> hand table
+        self._melds: Dict[Tuple[str, Tuple[int, ...]], str] = {}  # (type, card ids) -> meld line
+        self._shown_melds: List[str] = []  # Meld lines of the table as last shown
+
+    def card(self, card: Card) -> str:
+        markup = self._cards.get(card.id)
+        if markup is None:
+            color = suit_colors.get(card.suit.value, 'pink')
+            markup = self._cards[card.id] = f"[{color}]{card}[/{color}]"
+        return markup
+
+    def suit(self, suit) -> str:
+        color = suit_colors.get(suit, 'pink')
+        return f"[{color}]{suit}[/{color}]"
+
+    def ai_turn(self, game, player):
+        now = self.clock()
+        if self._last_ai_turn is not None and now - self._last_ai_turn < self.min_interval:
+            self.active = False
+            return
+        self.active = True
+        self._last_ai_turn = now
+
+        self._rule(
+            f"|Cards in deck: {len(game.all_cards)}|"
+            f"Player sum of cards: {len(player.hand)}|"
+            f"Current player's name: {player.name}|"
+        )
+        self.console.print()
+        self.console.print(self._hand(game, player))
+        self.console.print("\nMelds:")
+        self._table([self._meld(meld) for meld in game.all_melds], changed_only=True)
+
+    def game_state(self, game, player):
+        # Humans always see the table
+        self.active = True
+        players_names = ", ".join(other.name for other in game.players)
+        players_cards_count = ", ".join(str(len(other.hand)) for other in game.players)
+        self._rule(
+            f"|Cards in deck: {len(game.all_cards)}|"
+            f"Players' names: {players_names}|"
+            f"Players' sum of cards: {players_cards_count}|"
+            f"Current player's name: {player.name}|"
+        )
+        self.console.print(self._hand(game, player))
+
+        self.console.print("\nMelds:")
+        self._table([self._meld(meld) for meld in game.all_melds], changed_only=False)
+        self.console.print("=" * 50)
+
+    def message(self, text: str):
+        if self.active:
+            self.console.print(text)
+
+    def _rule(self, header: str):
+        self.console.print("\n" + "=" * 150)
+        self.console.print(header)
+        self.console.print("=" * 150)
+
+    def _table(self, lines: List[str], changed_only: bool):
+        # Numbered like the melds to rob, with changed_only unchanged melds are only counted
+        shown = self._shown_melds
+        unchanged = 0
+        for i, line in enumerate(lines):
+            if changed_only and i < len(shown) and shown[i] == line:
+                unchanged += 1
+            else:
+                self.console.print(f"{i + 1:>3}{line}")
+        if unchanged:
+            self.console.print(f"  {unchanged} unchanged")
+        if changed_only and len(shown) > len(lines):
+            self.console.print(f"  {len(shown) - len(lines)} gone")
+        self._shown_melds = lines
+
+    def _meld(self, meld) -> str:
+        key = (meld.type, tuple(card.id for card in meld.cards))
+        line = self._melds.get(key)
+        if line is None:
+            meld_str = " ".join(self.card(card) for card in sorted(meld.cards, key=lambda x: x.value))
+            line = _remember(self._melds, key, f"  {meld.type}: {meld_str}", self.cache_size)
+        return line
+
+    def _hand(self, game, player) -> Table:
+        analysis = player.analysis
+        table = self._hands.get(analysis.signature)
+        if table is not None:
+            return table
+
+        v, s = analysis.value_groups, analysis.suit_groups
+        # Create a table for value groups and suit groups
+        table = Table(box=None, show_header=True)
+        table.add_column("Value Groups", width=30)
+        table.add_column("Suit Groups", width=30)
+        value_keys = sorted(v.keys())
+        suit_keys = sorted(s.keys())
+        for i in range(max(len(v), len(s))):
+            value_str = ""
+            suit_str = ""
+            if i < len(value_keys):
+                value = value_keys[i]
+                value_str = f"{value}: {' '.join(self.card(card_from_id(key)) for key in v[value])}"
+            if i < len(suit_keys):
+                suit = SUITS[suit_keys[i]].value
+                color = suit_colors.get(suit, 'pink')
+                values = ' '.join(f"[{color}]{card_value(key)}[/{color}]" for key in s[suit_keys[i]])
+                suit_str = f"{self.suit(suit)}: {values}"
+            table.add_row(value_str, suit_str)
+        if analysis.jokers:
+            table.add_row(' '.join(self.card(card_from_id(JOKER_ID_BASE + i)) for i in range(analysis.jokers)), "")
+        return _remember(self._hands, analysis.signature, table, self.cache_size)
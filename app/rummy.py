@@ -1,26 +1,55 @@
 import random
-from typing import List, Tuple, Dict
-from rich.console import Console
-from rich.table import Table
+from typing import List, Tuple, Dict, Optional
 from rich import print
 from .models.suit import Suit
-from .models.card import Card, suit_colors
+from .models.card import Card, card_from_id, card_suit, card_value, NUM_KEYS, JOKER_ID_BASE, JOKER_KEY, MAX_DECKS, MAX_JOKERS
 from .models.meld import Meld
+from .models.meld_table import MeldTable
 from .models.player import Player
-
-console = Console()
+from .bitboard import longest_run
+from .catalog import find_meld
+from . import jokers
+from .rearrange import rearrange
+from .ledger import CardLedger, IntegrityPolicy, DECK, TABLE, PLAYERS
+from .moves import Action, DRAW, END_TURN, MELD, EXTEND, ROB, REARRANGE, generate_actions
+from . import eventlog
+from .render import Renderer, NullRenderer, RichRenderer
 
 class RobbersRummy:
-    def __init__(self, num_players: int, num_ai_players: int):
-        if not 1 <= num_players <= 3:
-            raise ValueError("Number of players must be between 1 and 3")
-        if not num_ai_players == 1:
-            raise ValueError("Number of AI player must be 1")
+    def __init__(self, num_players: int, num_ai_players: int, headless: bool = False, seed: Optional[int] = None,
+                 integrity_policy: IntegrityPolicy = IntegrityPolicy.ALWAYS, integrity_interval: int = 10,
+                 renderer: Optional[Renderer] = None, num_decks: int = 2, num_jokers: int = 0):
+        if headless:
+            # Headless games never block on input(), so every seat must be AI
+            if num_players != 0:
+                raise ValueError("Headless games cannot have human players")
+            if not 2 <= num_ai_players <= 4:
+                raise ValueError("Number of AI players must be between 2 and 4")
+        else:
+            if not 1 <= num_players <= 3:
+                raise ValueError("Number of players must be between 1 and 3")
+            if not num_ai_players == 1:
+                raise ValueError("Number of AI player must be 1")
+        if not 1 <= num_decks <= MAX_DECKS:
+            raise ValueError(f"Number of decks must be between 1 and {MAX_DECKS}")
+        if not 0 <= num_jokers <= MAX_JOKERS:
+            raise ValueError(f"Number of jokers must be between 0 and {MAX_JOKERS}")
         
+        self.headless = headless
+        if renderer is None:
+            renderer = NullRenderer() if headless else RichRenderer()
+        self.renderer = renderer
+        self.seed = seed
+        self.num_decks = num_decks
+        self.num_jokers = num_jokers
+        self.rng = random.Random(seed)
         self.all_cards: List[Card] = []
         self.original_deck = []
         self.players: List[Player] = []
         self.game_over = False
+        self.turn_count = 0
+        self.passes = 0  # Consecutive AI turns without a possible move
+        self.turn_acted = False  # An action of the current turn didn't end it
         
         # Create human players
         for i in range(num_players):
@@ -31,18 +60,39 @@ class RobbersRummy:
             self.players.append(Player(f"AI {i+1}", is_ai=True))
         
         self.current_player_idx = -1
-        self.all_melds: List[Meld] = []  # Track all melds in play
-        
+        self.all_melds = MeldTable()  # Track all melds in play
+
+        # Every card movement is booked in the ledger, full audits follow the policy
+        self.ledger = CardLedger(len(self.players))
+        self.integrity_policy = integrity_policy
+        self.integrity_interval = integrity_interval
+        # Search nodes the AI may spend re-partitioning the table in one turn,
+        # and seconds on top for live games. Headless games only count nodes,
+        # so seeded games stay reproducible
+        self.ai_rearranges = True
+        self.rearrange_nodes = 200
+        self.rearrange_budget: Optional[float] = None if headless else 0.05
+
+        # Optional eventlog.EventLogWriter, every state change is recorded there.
+        # profiling.TurnProfiler hooks in here as well to count the events
+        self.events = None
+
+    @property
+    def all_melds(self) -> MeldTable:
+        return self._all_melds
+
+    @all_melds.setter
+    def all_melds(self, melds: List[Meld]):
+        self._all_melds = melds if isinstance(melds, MeldTable) else MeldTable(melds)
+
     def create_deck(self) -> List[Card]:
         deck = []
-        uid = 0
-        for suit in Suit:
-            for value in range(1, 14):
-                deck.append(Card(suit, value, uid))
-                uid += 1
-                deck.append(Card(suit, value, uid)) #two cards of each
-                uid += 1
-        random.shuffle(deck)
+        for key in range(NUM_KEYS):
+            for copy in range(self.num_decks): #one card of each deck
+                deck.append(card_from_id(key + copy * NUM_KEYS))
+        for i in range(self.num_jokers):
+            deck.append(card_from_id(JOKER_ID_BASE + i))
+        self.rng.shuffle(deck)
         return deck
 
     def deal_initial_hand(self):
@@ -50,56 +100,38 @@ class RobbersRummy:
         for _ in range(14):
             for player in self.players:
                 if self.all_cards:
-                    player.hand.append(self.all_cards.pop())        
+                    player.hand.append(self.all_cards.pop())
+                    self.ledger.move(DECK, self._seat(player))
+
+        if self.events is not None:
+            self.events.begin_game(self.seed, len(self.players))
+            for player in self.players:
+                self._record(eventlog.DEAL, player, player.hand)
 
     def _is_valid_run(self, cards: List[Card]) -> bool:
-        if len(cards) < 3:
-            return False
-        
-        # Sort cards by value
-        sorted_cards = sorted(cards, key=lambda x: x.value)
-        
-        # Check if all cards are same suit and consecutive values
-        suit = sorted_cards[0].suit
-        prev_value = sorted_cards[0].value
-        
-        for card in sorted_cards[1:]:
-            if card.suit != suit or card.value != prev_value + 1:
-                return False
-            prev_value = card.value
-            
-        return True
+        naturals, wild = jokers.split_jokers(card.key for card in cards)
+        if wild:
+            return jokers.run_span(naturals, wild) is not None
+        meld = find_meld(naturals)
+        return meld is not None and meld.type == 'run'
     
     def _is_valid_set(self, cards: List[Card]) -> bool:
-        if len(cards) < 3:
-            return False
-        
-        # Check if all cards have same value
-        value = cards[0].value
-        suits = set()
-        
-        for card in cards:
-            if card.value != value:
-                return False
-            suits.add(card.suit)
-            
-        # Check no duplicate suits
-        return len(suits) == len(cards)
+        naturals, wild = jokers.split_jokers(card.key for card in cards)
+        if wild:
+            return jokers.is_set(naturals, wild)
+        meld = find_meld(naturals)
+        return meld is not None and meld.type == 'set'
 
     def find_robbable_melds(self, card: Card) -> List[Meld]:
-        robbable = []
-        for meld in self.all_melds:
-            if meld.can_be_robbed(card):
-                robbable.append(meld)
-                break # Only rob one meld
-        return robbable
+        robbable = self.all_melds.robbable(card.key)
+        return robbable[:1] # Only rob one meld
 
     def _human_play_turn(self, player: Player):
         while True:
             
             self.is_game_over()
 
-            self._display_game_state(player)
+            self.renderer.game_state(self, player)
             print("\nActions:")
             print("1. Draw from deck")
             print("2. Form new meld")
@@ -119,7 +151,9 @@ class RobbersRummy:
                             return
                         card_drawn = self.all_cards.pop()
                         player.hand.append(card_drawn)
-                        print(f"Card drawn from deck: {self._color_card(card_drawn)}")
+                        self.ledger.move(DECK, self._seat(player))
+                        self._record(eventlog.DRAW, player, [card_drawn])
+                        print(f"Card drawn from deck: {self.renderer.card(card_drawn)}")
                         return
                     else:
                         print("Deck is empty!")
@@ -145,9 +179,9 @@ class RobbersRummy:
     def _handle_new_meld(self, player: Player):
         print("\nSelect cards for new meld (comma-separated indices, e.g.: <1,2,3> Or from-to, e.g.: <1-3> ):")
         print("Your hand:")
-        player.hand = sorted(player.hand, key=lambda x: (x.suit.value, x.value))
+        # The hand is kept sorted by suit and value
         for i, card in enumerate(player.hand):
-            print(f"{i+1}: {self._color_card(card)}")
+            print(f"{i+1}: {self.renderer.card(card)}")
         
         try:
             user_input = input("Choose cards: ")
@@ -168,6 +202,8 @@ class RobbersRummy:
                 self.all_melds.append(meld)
                 for card in selected_cards:
                     player.hand.remove(card)
+                self.ledger.move(self._seat(player), TABLE, len(selected_cards))
+                self._record(eventlog.MELD, player, selected_cards, len(self.all_melds) - 1)
                 print("Run meld created!")
                 
             elif self._is_valid_set(selected_cards):
@@ -175,6 +211,8 @@ class RobbersRummy:
                 self.all_melds.append(meld)
                 for card in selected_cards:
                     player.hand.remove(card)
+                self.ledger.move(self._seat(player), TABLE, len(selected_cards))
+                self._record(eventlog.MELD, player, selected_cards, len(self.all_melds) - 1)
                 print("Set meld created!")
                 
             else:
@@ -186,88 +224,116 @@ class RobbersRummy:
     def _handle_robbing(self, player: Player):
         print("\nSelect meld to rob:")
         for i, meld in enumerate(self.all_melds):
-            cards_str = " ".join(self._color_card(c) for c in sorted(meld.cards, key=lambda x: (x.value)))
+            cards_str = " ".join(self.renderer.card(c) for c in sorted(meld.cards, key=lambda x: (x.value)))
             print(f"{i+1}: {meld.type} ({cards_str})")
         
         try:
             meld_idx = int(input("Choose meld to rob (0 to cancel): ")) - 1
             if 0 <= meld_idx < len(self.all_melds):
                 target_meld = self.all_melds[meld_idx]
+                self._record(eventlog.ROB, player, target_meld.cards, meld_idx)
                 
                 # Remove meld from all_melds
                 self.all_melds.remove(target_meld)
                 
                 # target_meld.cards to player's hand
                 player.hand.extend(target_meld.cards)
+                self.ledger.move(TABLE, self._seat(player), len(target_meld.cards))
 
                 print("Meld successfully robbed and added to Player's hand!")
             
         except ValueError:
             print("Invalid input!")
 
-    def _ai_play_turn(self, player: Player):
-        header = (
-            f"|Cards in deck: {len(self.all_cards)}|"
-            f"Player sum of cards: {len(player.hand)}|"
-            f"Current player's name: {player.name}|"
-        )
-        print("\n" + "="*150)
-        print(header)
-        print("="*150)
-        print()
+    def _ai_play_turn(self, player: Player) -> bool:
+        """
+        Plays one AI turn. Returns False when the AI had no possible move
+        """
+        self.renderer.ai_turn(self, player)
 
-        self._show_cards_in_hand(player)
+        if player.strategy is not None:
+            return self._ai_strategy_turn(player)
 
-        tried_rob = False
-        for card in player.hand:
-            robbable = self.find_robbable_melds(card)
-            if robbable:
-                tried_rob = True
-                print(f"{player.name} is robbing a meld!")
-                target_meld = robbable[0]
-                
-                # Perform robbery
-                self.all_melds.remove(target_meld)                
-                new_cards = target_meld.cards + [card]
-                self.all_melds.append(Meld(new_cards, target_meld.type))
-                player.hand.remove(card)
+        tried_rob = self._ai_rob(player)
 
-        value_groups, suit_groups = self.try_form_melds(player)
-        set_arranged = self.ai_arrange_set(player, value_groups)                
-        run_arranged = self.ai_arrange_run(player, suit_groups)
+        arranged = self.ai_arrange_best(player)
         
-        if not set_arranged and not run_arranged and not tried_rob:
+        if not arranged and not tried_rob:
+            # Last try before drawing, place hand cards by rebuilding the table
+            if self.ai_rearranges and player.hand and self.all_melds and self._ai_rearrange_melds(player):
+                return True
             if len(self.all_cards) == 0:
-                print(f"{player.name} has no more moves, because deck is empty!")
-                return
+                self._log(f"{player.name} has no more moves, because deck is empty!")
+                return False
             # No robbing and no meld. Let's draw a card
-            drawn_card = self.all_cards.pop()
-            print(f"{player.name} drew a card: {self._color_card(drawn_card)}")            
-            player.hand.append(drawn_card)
+            self._ai_draw(player)
+
+        return True
+
+    def _ai_rob(self, player: Player) -> bool:
+        # Adds every card of the hand that extends a table meld to it
+        tried_rob = False
+        hand = player.hand
+        # Keys in order, only the ones that extend a meld right now. A
+        # robbery can open up higher keys, jokers are tried last, one by one
+        done = 0
+        while True:
+            hits = hand.key_mask & (self.all_melds.key_mask | 1 << JOKER_KEY) & ~done
+            if not hits:
+                return tried_rob
+            low = hits & -hits
+            done |= (low << 1) - 1
+            for card in hand.with_key(low.bit_length() - 1):
+                robbable = self.find_robbable_melds(card)
+                if robbable:
+                    tried_rob = True
+                    self._log(f"{player.name} is robbing a meld!")
+                    target_meld = robbable[0]
+
+                    # Perform robbery
+                    self.all_melds.extend_meld(target_meld, card)
+                    hand.remove(card)
+                    self.ledger.move(self._seat(player), TABLE)
+                    if self.events is not None:
+                        self._record(eventlog.EXTEND, player, [card], self.all_melds.position(target_meld))
+
+    def _ai_draw(self, player: Player):
+        drawn_card = self.all_cards.pop()
+        if self.renderer.active:
+            self._log(f"{player.name} drew a card: {self.renderer.card(drawn_card)}")
+        player.hand.append(drawn_card)
+        self.ledger.move(DECK, self._seat(player))
+        self._record(eventlog.DRAW, player, [drawn_card])
+
+    def _ai_strategy_turn(self, player: Player) -> bool:
+        # Plays the actions chosen by the player's strategy until one ends the turn
+        while not self.is_game_over():
+            action = player.strategy.choose_action(self, player)
+            self._log(f"{player.name} chose {action.kind}")
+            if self.apply_action(player, action):
+                return self.action_turn_moved(action)
+        return True
+
+    def action_turn_moved(self, last_action: Action) -> bool:
+        """
+        Whether a turn played as actions moved. Like in GameState, only a
+        turn that ends without any action on an empty deck is a pass
+        """
+        return self.turn_acted or last_action.kind == DRAW or len(self.all_cards) > 0
 
-        return
-
-    def _show_cards_in_hand(self, player):
-        v, s = self.try_form_melds(player, clear=False)        
-        # Create a table for value groups and suit groups
-        table = Table(box=None, show_header=True)
-        table.add_column("Value Groups", width=30)
-        table.add_column("Suit Groups", width=30)        
-        # Add rows to the table
-        max_length = max(len(v), len(s))
-        value_keys = sorted(v.keys())
-        suit_keys = sorted(s.keys(), key=lambda x: x.value)        
-        for i in range(max_length):
-            value_str = ""
-            suit_str = ""
-            if i < len(value_keys):
-                value = value_keys[i]
-                value_str = f"{value}: {' '.join(self._color_card(card) for card in v[value])}"
-            if i < len(suit_keys):
-                suit = suit_keys[i]
-                suit_str = f"{self._color_suit(suit.value)}: {' '.join(self._color_value_based_on_suit(str(card.value), suit.value) for card in sorted(s[suit], key=lambda x: x.value))}"
-            table.add_row(value_str, suit_str)        
-        console.print(table)
+    def ai_arrange_best(self, player: Player) -> bool:
+        # Melds the partition of the hand that leaves the fewest cards
+        analysis = player.analysis
+        if not analysis.can_meld:
+            return False
+        for meld_type, keys in analysis.melds:
+            meld = Meld([player.hand.take(key) for key in keys], meld_type)
+            self.all_melds.append(meld)
+            self._log(f"AI arranged a {meld.type}")
+            self.ledger.move(self._seat(player), TABLE, len(meld.cards))
+            self._record(eventlog.MELD, player, meld.cards, len(self.all_melds) - 1)
+
+        return True
 
     def ai_arrange_set(self, player: Player, value_groups: Dict[int, List[Card]]) -> bool:
         arranged = False
@@ -277,9 +343,11 @@ class RobbersRummy:
                 arranged = True
                 meld = Meld(cards, 'set')
                 self.all_melds.append(meld)
-                print(f"AI arranged a set")
+                self._log("AI arranged a set")
                 for card in cards:
                     player.hand.remove(card)
+                self.ledger.move(self._seat(player), TABLE, len(cards))
+                self._record(eventlog.MELD, player, cards, len(self.all_melds) - 1)
 
         return arranged
 
@@ -294,107 +362,64 @@ class RobbersRummy:
             arranged = True
             meld = Meld(longest_subarray, 'run')
             self.all_melds.append(meld)
-            print(f"AI arranged a run")
+            self._log("AI arranged a run")
             for card in longest_subarray:
                 player.hand.remove(card)
+            self.ledger.move(self._seat(player), TABLE, len(longest_subarray))
+            self._record(eventlog.MELD, player, longest_subarray, len(self.all_melds) - 1)
 
         return arranged
     
     def _find_longest_consecutive_subarray(self, cards: List[Card]) -> List[Card]:
         """
-        Sliding window approach to find the longest consecutive subarray 
+        Longest block of consecutive values in a suit mask, one card per value
         """
-        longest_subarray = []
-        current_subarray = []
-        
-        # Start with the first card
-        current_subarray = [cards[0]]
-        
-        for i in range(1, len(cards)):
-            current_card = cards[i]
-            previous_card = cards[i-1]
-            
-            # Check if the current card continues the sequence
-            if current_card.value == previous_card.value + 1:
-                current_subarray.append(current_card)
-            else:
-                # Sequence broken, check if current subarray is valid and longest
-                if len(current_subarray) >= 3 and len(current_subarray) > len(longest_subarray):
-                    longest_subarray = current_subarray.copy()
-                # Start a new subarray with current card
-                current_subarray = [current_card]
-        
-        # Check the last subarray
-        if len(current_subarray) >= 3 and len(current_subarray) > len(longest_subarray):
-            longest_subarray = current_subarray
-        
-        return longest_subarray
-
-    def _ai_rearrange_melds(self, player: Player, cards: List[Card]):
-        # AI logic to rearrange melds
-        value_groups, suit_groups = self.try_form_melds(player)
-        
-        found = False
-        # Try to form sets first
-        for _, group in value_groups.items():
-            if self._is_valid_set(group):
-                found = True
-                meld = Meld(group, 'set')
-                self.all_melds.append(meld)
-
-                # remove group from hand
-                for card in group:
-                    if card in player.hand:
-                        player.hand.remove(card)
-
-                for card in group:
-                    if card in cards:
-                        cards.remove(card)
-
-        # Try to form run
-        for _, group in suit_groups.items():
-            group.sort(key=lambda x: x.value)
-            for i in range(len(group)-2):
-                for j in range(i+2, len(group)):
-                    potential_run = group[i:j+1]
-                    if self._is_valid_run(potential_run):
-                        found = True
-                        meld = Meld(potential_run, 'run')
-                        self.all_melds.append(meld)
-
-                        # remove potential_run from hand
-                        for card in potential_run:
-                            if card in player.hand:
-                                player.hand.remove(card)
-
-                        for card in potential_run:
-                            if card in cards:
-                                cards.remove(card)
+        by_value = {}
+        mask = 0
+        for card in cards:
+            if card.value not in by_value:
+                by_value[card.value] = card
+                mask |= 1 << (card.value - 1)
         
-        # If there are remaining cards, form the last meld
-        if cards:
-            if self._is_valid_run(cards):
-                meld = Meld(cards, 'run')
-                self.all_melds.append(meld)
-
-                # remove group from hand, but check if card is still in hand
-                for card in cards:
-                    if card in player.hand:
-                        player.hand.remove(card)                
-                
-            elif self._is_valid_set(cards):
-                meld = Meld(cards, 'set')
-                self.all_melds.append(meld)
-
-                # remove group from hand, but check if card is still in hand
-                for card in cards:
-                    if card in player.hand:
-                        player.hand.remove(card)                
+        start, length = longest_run(mask)
+        if length < 3:
+            return []
+        return [by_value[value] for value in range(start, start + length)]
+
+    def _ai_rearrange_melds(self, player: Player) -> bool:
+        # Re-partitions the whole table with the hand to place as many hand cards as possible
+        table_melds = [(meld.type, tuple(card.key for card in meld.cards)) for meld in self.all_melds]
+        result = rearrange(table_melds, [card.key for card in player.hand], self.rearrange_budget,
+                           self.rearrange_nodes)
+        # An answer cut short by the budget is still a valid table
+        if result.placed == 0:
+            self._log("AI failed to rearrange melds!")
+            return False
 
-        if found:
-            print("AI successfully rearranged melds!")
-        else:
-            print("AI failed to rearrange melds!")
+        # Table copies of a key are used first, the rest comes from the hand
+        table_cards: Dict[int, List[Card]] = {}
+        for meld in self.all_melds:
+            for card in meld.cards:
+                table_cards.setdefault(card.key, []).append(card)
+
+        melds = []
+        for meld_type, keys in result.melds:
+            cards = []
+            for key in keys:
+                if table_cards.get(key):
+                    cards.append(table_cards[key].pop())
+                else:
+                    cards.append(player.hand.take(key))
+            melds.append(Meld(cards, meld_type))
+
+        self.all_melds = melds
+        self.ledger.move(self._seat(player), TABLE, result.placed)
+        if self.events is not None:
+            self._record(eventlog.REPARTITION, player)
+            for i, meld in enumerate(melds):
+                self._record(eventlog.MELD, player, meld.cards, i)
+        self._log("AI successfully rearranged melds!")
+        return True
 
     def try_form_melds(self, player: Player, clear: bool = True) -> Tuple[Dict[int, List[Card]], Dict[Suit, List[Card]]]:
         # Try sets first (they're usually more valuable)
@@ -422,53 +447,152 @@ class RobbersRummy:
         return value_groups, suit_groups
 
     def play_turn(self):
+        self._open_ledger()
         while self.is_game_over() == False:
+            self.play_player_turn(self.next_player())
+        self.finish_game()
+
+    def next_player(self) -> Player:
+        """
+        Audits the card counts and moves on to the player whose turn it is
+        """
+        self._audit_turn()
+
+        if self.current_player_idx == -1: # First turn when no player has played yet
+            self.current_player_idx = 0
+        else:
+            self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
+
+        self.turn_count += 1
+        self.turn_acted = False
+        return self.players[self.current_player_idx]
+
+    def play_player_turn(self, player: Player):
+        """
+        Plays the turn of the player and counts the passes
+        """
+        if player.is_ai:
+            self.end_turn(self._ai_play_turn(player))
+        else:
+            self._human_play_turn(player)
+            self.end_turn(True)
+
+    def end_turn(self, moved: bool):
+        """
+        Counts a turn without a possible move as a pass, the game ends when
+        nobody can move anymore and the deck is empty
+        """
+        if moved:
+            self.passes = 0
+        else:
+            self.passes += 1
+            if self.passes >= len(self.players):
+                self.game_over = True
+
+    def finish_game(self):
+        if self.integrity_policy is not IntegrityPolicy.NEVER:
             self.check_game_integrity()
+        if self.events is not None:
+            self._record(eventlog.GAME_OVER, self.winner())
 
-            if self.current_player_idx == -1: # First turn when no player has played yet
-                self.current_player_idx = 0
-            else:
-                self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
+    def legal_actions(self, player: Player) -> List[Action]:
+        hand = [card.id for card in player.hand]
+        table = [(meld.type, tuple(card.id for card in meld.cards)) for meld in self.all_melds]
+        return generate_actions(hand, table, len(self.all_cards))
 
-            player = self.players[self.current_player_idx]
-            
-            if player.is_ai:
-                self._ai_play_turn(player)
-            else:
-                self._human_play_turn(player)        
-    
-    def _display_game_state(self, current_player: Player):
-        players_names = ", ".join(player.name for player in self.players)
-        players_cards_count = ", ".join(str(len(player.hand)) for player in self.players)
-        header = (
-            f"|Cards in deck: {len(self.all_cards)}|"
-            f"Players' names: {players_names}|"
-            f"Players' sum of cards: {players_cards_count}|"
-            f"Current player's name: {current_player.name}|"
-        )
-        print("\n" + "="*150)
-        print(header)
-        print("="*150)
-        
-        self._show_cards_in_hand(current_player)
+    def apply_action(self, player: Player, action: Action) -> bool:
+        """
+        Executes a legal action of the player. Returns True when it ends the turn
+        """
+        kind = action.kind
+        seat = self._seat(player)
+        if kind == DRAW:
+            drawn_card = self.all_cards.pop()
+            player.hand.append(drawn_card)
+            self.ledger.move(DECK, seat)
+            self._record(eventlog.DRAW, player, [drawn_card])
+            return True
+        if kind == END_TURN:
+            return True
 
-        print("\nMelds:")
-        for meld in self.all_melds:
-            meld_str = " ".join(self._color_card(card) for card in sorted(meld.cards, key=lambda x: (x.value)))
-            print(f"  {meld.type}: {meld_str}")
-        print("="*50)
+        cards = [self._take_from_hand(player, card_id) for card_id in action.cards]
+        if kind == MELD:
+            self.all_melds.append(Meld(cards, action.meld_type))
+            self._record(eventlog.MELD, player, cards, len(self.all_melds) - 1)
+        elif kind == EXTEND:
+            self.all_melds.extend_meld(self.all_melds[action.meld], cards[0])
+            self._record(eventlog.EXTEND, player, cards, action.meld)
+        elif kind == ROB:
+            target_meld = self.all_melds[action.meld]
+            self._record(eventlog.ROB, player, target_meld.cards, action.meld)
+            self.all_melds.remove(target_meld)
+            player.hand.extend(target_meld.cards)
+            self.ledger.move(TABLE, seat, len(target_meld.cards))
+        elif kind == REARRANGE:
+            target_meld = self.all_melds[action.meld]
+            table_card = next(card for card in target_meld.cards if card.id == action.table_card)
+            self.all_melds.take_card(target_meld, table_card)
+            self.all_melds.append(Meld([table_card] + cards, action.meld_type))
+            self._record(eventlog.REARRANGE, player, [table_card] + cards, action.meld)
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+        if cards:
+            self.ledger.move(seat, TABLE, len(cards))
+        self.turn_acted = True
+        return False
+
+    def _take_from_hand(self, player: Player, card_id: int) -> Card:
+        card = player.hand.find(card_id)
+        if card is not None:
+            player.hand.remove(card)
+            return card
+        raise ValueError(f"Card {card_id} is not in {player.name}'s hand")
+
+    def _record(self, kind: int, player: Player, cards: List[Card] = (), meld: int = eventlog.NO_MELD):
+        if self.events is not None:
+            self.events.record(self.turn_count, kind, self.players.index(player), [card.id for card in cards], meld)
+
+    def _seat(self, player: Player) -> int:
+        return PLAYERS + self.players.index(player)
+
+    def _hand_sizes(self) -> List[int]:
+        return [len(player.hand) for player in self.players]
+
+    def _open_ledger(self):
+        self.ledger.open(len(self.all_cards), self.all_melds.card_count, self._hand_sizes())
+        if self.integrity_policy is not IntegrityPolicy.NEVER and self.ledger.total != len(self.original_deck):
+            raise ValueError("Game integrity check failed!")
 
-    def _color_value_based_on_suit(self, value, suit) -> str:
-        color = suit_colors.get(suit, 'pink')
-        return f"[{color}]{value}[/{color}]"
-    
-    def _color_suit(self, value) -> str:
-        color = suit_colors.get(value, 'pink')
-        return f"[{color}]{value}[/{color}]"
+    def _audit_turn(self):
+        # The ledger is compared every turn, the full recount depends on the policy
+        policy = self.integrity_policy
+        if policy is IntegrityPolicy.NEVER:
+            return
+        if not self.ledger.matches(len(self.all_cards), self.all_melds.card_count, self._hand_sizes()):
+            raise ValueError("Game integrity check failed!")
+        if policy is IntegrityPolicy.ALWAYS or (
+                policy is IntegrityPolicy.EVERY_N_TURNS and self.turn_count % self.integrity_interval == 0):
+            self.check_game_integrity()
 
-    def _color_card(self, card: Card) -> str:
-        color = suit_colors.get(card.suit.value, 'pink')
-        return f"[{color}]{card}[/{color}]"
+    def play_headless_game(self) -> Player:
+        """
+        Deals and plays a whole game without rendering. Returns the winner
+        """
+        self.all_cards = self.create_deck()
+        self.original_deck = self.all_cards.copy()
+        self.deal_initial_hand()
+        self.play_turn()
+        return self.winner()
+
+    def winner(self) -> Player:
+        # The player who went out wins, otherwise the lowest hand score
+        for player in self.players:
+            if len(player.hand) == 0:
+                return player
+        return min(self.players, key=lambda x: x.calculate_score())
+    
+    def _log(self, message: str):
+        self.renderer.message(message)
 
     def is_game_over(self) -> bool:
         if self.game_over:
@@ -488,20 +612,23 @@ class RobbersRummy:
         current_card_counts = self._count_cards(current_cards)
         
         if original_card_counts != current_card_counts:
+            if self.headless:
+                raise ValueError("Game integrity check failed!")
             print("Original cards counts:")
-            for card, count in original_card_counts.items():
-                print(f"{card}: {count}")
+            for key, count in original_card_counts.items():
+                print(f"{card_suit(key)} {card_value(key)}: {count}")
             print("Current cards counts:")
-            for card, count in current_card_counts.items():
-                print(f"{card}: {count}")
+            for key, count in current_card_counts.items():
+                print(f"{card_suit(key)} {card_value(key)}: {count}")
             raise ValueError("Game integrity check failed!")
         
         return True
 
-    def _count_cards(self, cards: List[Card]) -> Dict[Tuple[Suit, int], int]:
+    def _count_cards(self, cards: List[Card]) -> Dict[int, int]:
+        # Counts per (suit, value) key
         card_counts = {}
         for card in cards:
-            key = (card.suit, card.value)
+            key = card.key
             if key in card_counts:
                 card_counts[key] += 1
             else:
@@ -0,0 +1,281 @@
+import glob
+import multiprocessing
+import os
+from functools import wraps
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from . import eventlog
+from .models.card import JOKER_KEY
+from .simulation import play_headless_game
+from .tournament import derive_game_seed
+
+MAX_OPPONENTS = 3
+NUM_SLOTS = JOKER_KEY + 1  # The (suit, value) keys and the joker key
+
+# One sample per AI turn: the state the AI saw, what it did and how its game
+# ended. Fixed width records, shards are raw files of these
+SAMPLE = np.dtype([
+    ('game', '<u4'),  # Index of the game in the data set, the game's seed derives from it
+    ('turn', '<u4'),
+    ('seat', 'u1'),
+    ('deck', 'u1'),  # Cards left in the deck
+    ('opponents', 'u1', (MAX_OPPONENTS,)),  # Hand sizes of the next seats in turn order, 0 when empty
+    ('kinds', '<u2'),  # Bit 1 << kind for every eventlog kind the seat played in the turn
+    ('won', 'u1'),
+    ('score', '<u2'),  # Score left in the seat's hand at the end of the game
+    ('hand', 'u1', (NUM_SLOTS,)),  # Copies of each (suit, value) key in the hand, jokers last
+    ('table', 'u1', (NUM_SLOTS,)),  # Copies of each key in the table melds
+    ('played', 'u1', (NUM_SLOTS,)),  # Copies of each key that left the hand in the turn
+])
+FEATURES = 2 * NUM_SLOTS + 1 + MAX_OPPONENTS
+
+class ShardWriter:
+    """
+    Appends samples to numbered shard files of at most shard_records
+    samples each. Samples are staged in a fixed buffer, so memory stays
+    bounded however many samples are written
+    """
+    def __init__(self, directory: str, shard_records: int = 1 << 20, buffer_records: int = 1 << 14,
+                 prefix: str = "shard"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_records = shard_records
+        self.buffer = np.zeros(buffer_records, dtype=SAMPLE)
+        self.buffered = 0
+        self.shard = -1
+        self.shard_size = shard_records  # Full, so the first flush opens shard 0
+        self.file = None
+        self.samples = 0
+        self.games = 0
+
+    def write(self, samples: np.ndarray):
+        while len(samples):
+            n = min(len(samples), len(self.buffer) - self.buffered)
+            self.buffer[self.buffered:self.buffered + n] = samples[:n]
+            self.buffered += n
+            samples = samples[n:]
+            if self.buffered == len(self.buffer):
+                self.flush()
+
+    def flush(self):
+        data = self.buffer[:self.buffered]
+        while len(data):
+            if self.shard_size == self.shard_records:
+                self._next_shard()
+            n = min(len(data), self.shard_records - self.shard_size)
+            data[:n].tofile(self.file)
+            self.shard_size += n
+            self.samples += n
+            data = data[n:]
+        self.buffered = 0
+        if self.file is not None:
+            self.file.flush()
+
+    def _next_shard(self):
+        if self.file is not None:
+            self.file.close()
+        self.shard += 1
+        self.shard_size = 0
+        self.file = open(os.path.join(self.directory, f"{self.prefix}-{self.shard:05d}.bin"), 'wb')
+
+    def close(self):
+        self.flush()
+        if self.file is not None and not self.file.closed:
+            self.file.close()
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SelfPlayRecorder:
+    """
+    Records a sample at every AI turn of the attached games. Attaching
+    wraps the game's turn and hooks into its event sink, like
+    profiling.TurnProfiler. Samples of a game are held until it ends, when
+    the outcome is known, and then go to the writer. Games are numbered
+    from first_game on
+    """
+    def __init__(self, writer: ShardWriter, first_game: int = 0):
+        self.writer = writer
+        self.first_game = first_game
+
+    def attach(self, game):
+        events = _RecorderEvents(self, game, game.events)
+        game.events = events
+        game.play_player_turn = self._turn(game, events, game.play_player_turn)
+
+    def _turn(self, game, events: "_RecorderEvents", play_player_turn: Callable) -> Callable:
+        @wraps(play_player_turn)
+        def turn(player, *args, **kwargs):
+            if not player.is_ai:
+                return play_player_turn(player, *args, **kwargs)
+            sample = encode_state(game, player)
+            sample['game'] = self.first_game + self.writer.games
+            events.kinds = 0
+            play_player_turn(player, *args, **kwargs)
+            sample['kinds'] = events.kinds
+            after = _key_counts(card.key for card in player.hand)
+            sample['played'] = np.maximum(sample['hand'].astype(np.int16) - after, 0)
+            events.samples.append(sample)
+        return turn
+
+    def end_game(self, samples: List[np.void], game):
+        records = np.array(samples, dtype=SAMPLE)
+        winner = game.players.index(game.winner())
+        scores = np.array([player.calculate_score() for player in game.players])
+        records['won'] = records['seat'] == winner
+        records['score'] = scores[records['seat']]
+        self.writer.write(records)
+        self.writer.games += 1
+
+class _RecorderEvents:
+    # Event sink of one attached game, collects the event kinds of the turn and passes them on
+    def __init__(self, recorder: SelfPlayRecorder, game, forward):
+        self.recorder = recorder
+        self.game = game
+        self.forward = forward
+        self.samples: List[np.void] = []
+        self.kinds = 0
+
+    def begin_game(self, seed: Optional[int], num_players: int):
+        self.samples = []
+        if self.forward is not None:
+            self.forward.begin_game(seed, num_players)
+
+    def record(self, turn: int, kind: int, seat: int, cards: Sequence[int] = (), meld: int = eventlog.NO_MELD):
+        self.kinds |= 1 << kind
+        if kind == eventlog.GAME_OVER:
+            self.recorder.end_game(self.samples, self.game)
+            self.samples = []
+        if self.forward is not None:
+            self.forward.record(turn, kind, seat, cards, meld)
+
+def encode_state(game, player) -> np.void:
+    """
+    Fixed size encoding of what the player knows before its turn
+    """
+    sample = np.zeros((), dtype=SAMPLE)
+    seat = game.players.index(player)
+    sample['turn'] = game.turn_count
+    sample['seat'] = seat
+    sample['deck'] = len(game.all_cards)
+    players = len(game.players)
+    sample['opponents'][:players - 1] = [len(game.players[(seat + i) % players].hand) for i in range(1, players)]
+    sample['hand'] = _key_counts(card.key for card in player.hand)
+    sample['table'] = _key_counts(card.key for meld in game.all_melds for card in meld.cards)
+    return sample[()]
+
+def _key_counts(keys: Iterable[int]) -> np.ndarray:
+    return np.bincount(np.fromiter(keys, dtype=np.intp), minlength=NUM_SLOTS)
+
+def features(samples: np.ndarray) -> np.ndarray:
+    """
+    (N, FEATURES) float32 inputs of a batch: hand and table counts, the
+    deck size and the opponents' hand sizes
+    """
+    return np.concatenate([
+        samples['hand'], samples['table'], samples['deck'][:, None], samples['opponents'],
+    ], axis=1).astype(np.float32)
+
+class ShardReader:
+    """
+    Memory maps every shard of a directory. Nothing is read until samples
+    are taken, so the data set can be much larger than memory
+    """
+    def __init__(self, directory: str, prefix: str = "shard"):
+        paths = sorted(glob.glob(os.path.join(directory, f"{prefix}*.bin")))
+        self.shards = [np.memmap(path, dtype=SAMPLE, mode='r') for path in paths if os.path.getsize(path)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def minibatches(self, batch_size: int, seed: Optional[int] = None, shards_per_block: int = 4,
+                    drop_last: bool = False) -> Iterator[np.ndarray]:
+        """
+        Shuffled minibatches of one pass over the data. The shard order is
+        shuffled, then samples are shuffled within blocks of shards_per_block
+        shards, so only the indices of one block are in memory
+        """
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.shards))
+        carry = np.empty(0, dtype=SAMPLE)  # Samples left over at the end of the last block
+        for start in range(0, len(order), shards_per_block):
+            block = [self.shards[i] for i in order[start:start + shards_per_block]]
+            offsets = np.cumsum([0] + [len(shard) for shard in block])
+            indices = rng.permutation(offsets[-1])
+            first = 0
+            if len(carry):
+                first = batch_size - len(carry)
+                carry = np.concatenate([carry, self._gather(block, offsets, indices[:first])])
+                if len(carry) < batch_size:
+                    continue
+                yield carry
+            for first in range(first, len(indices), batch_size):
+                batch = indices[first:first + batch_size]
+                carry = self._gather(block, offsets, batch)
+                if len(batch) < batch_size:
+                    break
+                yield carry
+            else:
+                carry = np.empty(0, dtype=SAMPLE)
+        if len(carry) and not drop_last:
+            yield carry
+
+    def _gather(self, block: List[np.memmap], offsets: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        batch = np.empty(len(indices), dtype=SAMPLE)
+        shard_of = np.searchsorted(offsets, indices, side='right') - 1
+        for i, shard in enumerate(block):
+            selected = np.flatnonzero(shard_of == i)
+            if len(selected):
+                # Sorted reads are friendlier to the page cache
+                local = indices[selected] - offsets[i]
+                order = np.argsort(local)
+                batch[selected[order]] = shard[local[order]]
+        return batch
+
+def _generate_chunk(args: Tuple[str, int, int, int, int, int]) -> Tuple[int, int]:
+    directory, master_seed, start, stop, num_ai_players, shard_records = args
+    with ShardWriter(directory, shard_records, prefix=f"shard-{start:09d}") as writer:
+        recorder = SelfPlayRecorder(writer, first_game=start)
+        for i in range(start, stop):
+            play_headless_game(derive_game_seed(master_seed, i), num_ai_players, recorder=recorder)
+    return writer.games, writer.samples
+
+def generate(directory: str, num_games: int, master_seed: int = 0, num_ai_players: int = 2,
+             workers: Optional[int] = None, games_per_chunk: int = 10000,
+             shard_records: int = 1 << 20) -> Tuple[int, int]:
+    """
+    Plays num_games headless games across a process pool and writes their
+    samples to shards in directory. Every chunk of games has its own shards,
+    so the output doesn't depend on the number of workers. Returns the
+    number of games and samples written
+    """
+    chunks = [(directory, master_seed, start, min(start + games_per_chunk, num_games), num_ai_players, shard_records)
+              for start in range(0, num_games, games_per_chunk)]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers <= 1:
+        counts = [_generate_chunk(chunk) for chunk in chunks]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            counts = pool.map(_generate_chunk, chunks)
+    return sum(games for games, _ in counts), sum(samples for _, samples in counts)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write self-play training samples to memory mapped shards")
+    parser.add_argument("directory")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai-players", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-records", type=int, default=1 << 20)
+    args = parser.parse_args()
+
+    games, samples = generate(args.directory, args.games, args.seed, args.ai_players, args.workers,
+                              shard_records=args.shard_records)
+    print(f"Games: {games}, samples: {samples}")
@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from .models.card import card_from_id
+from .models.player import Player
+from .moves import Action, END_TURN, MELD, EXTEND, ROB, REARRANGE
+from .parallel import ParallelISMCTS, SearchPool
+from .render import NullRenderer
+from .rummy import RobbersRummy
+
+# Line protocol, one command or reply per line.
+#
+# Client commands:
+#   NEW <humans> [seed]   create a table with 1-3 human seats and one AI, replies OK TABLE <id>
+#   JOIN <id> <name>      take a free human seat, replies OK SEAT <seat>, play starts once all seats are taken
+#   STATE                 HAND, DECK and MELD lines of the last finished move followed by END
+#   ACTIONS               ACTION <i> <action> lines of the legal actions followed by END
+#   PLAY <i>              play action i of the last ACTIONS list, only on your own turn
+#   QUIT
+#
+# Server messages:
+#   START, TURN <name>, YOUR_TURN, EVENT <name> <action>, OVER <winner name>, ERR <reason>,
+#   ABORT <reason> when the table stops on an error
+
+def card_text(card_id: int) -> str:
+    card = card_from_id(card_id)
+    return f"{card.value}{card.suit.value}"
+
+def action_text(action: Action) -> str:
+    cards = " ".join(card_text(card_id) for card_id in action.cards)
+    if action.kind == MELD:
+        return f"{MELD} {action.meld_type} {cards}"
+    if action.kind == EXTEND:
+        return f"{EXTEND} {action.meld} {cards}"
+    if action.kind == ROB:
+        return f"{ROB} {action.meld}"
+    if action.kind == REARRANGE:
+        return f"{REARRANGE} {action.meld} {card_text(action.table_card)} {action.meld_type} {cards}"
+    return action.kind
+
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.table: Optional["GameTable"] = None
+        self.player: Optional[Player] = None
+        self.actions: List[Action] = []
+
+    def send(self, line: str):
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+class GameTable:
+    """
+    One RobbersRummy game on the server. Human turns wait on their seat's
+    queue, AI turns wait on the server's executor for the strategy, which
+    searches on worker processes, so neither blocks the other tables.
+    on_close is called once the game ends or the last client has left
+    """
+    def __init__(self, table_id: int, humans: int, executor: ThreadPoolExecutor,
+                 seed: Optional[int] = None, turn_timeout: Optional[float] = None,
+                 on_close: Optional[Callable[["GameTable"], None]] = None, strategy=None):
+        self.id = table_id
+        self.game = RobbersRummy(num_players=humans, num_ai_players=1, seed=seed, renderer=NullRenderer())
+        for player in self.game.players:
+            if player.is_ai:
+                player.strategy = strategy
+        self.executor = executor
+        self.turn_timeout = turn_timeout
+        self.on_close = on_close
+        self.clients: Dict[int, Client] = {}  # seat -> client
+        self.moves: Dict[int, asyncio.Queue] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.turn: Optional[int] = None  # Seat of the human turn waiting for a move
+        # Text of the hands and of the deck and table, taken between moves on the
+        # event loop, so STATE never reads the game while an AI turn changes it
+        self.hand_lines: Dict[int, str] = {}
+        self.table_lines: List[str] = []
+        self._take_view()
+
+    @property
+    def free_seats(self) -> List[int]:
+        return [seat for seat, player in enumerate(self.game.players)
+                if not player.is_ai and seat not in self.clients]
+
+    def join(self, client: Client, name: str) -> int:
+        seat = self.free_seats[0]
+        player = self.game.players[seat]
+        player.name = name
+        client.table = self
+        client.player = player
+        self.clients[seat] = client
+        self.moves[seat] = asyncio.Queue()
+        if not self.free_seats:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return seat
+
+    def leave(self, client: Client):
+        for seat, other in list(self.clients.items()):
+            if other is client:
+                del self.clients[seat]
+                # A missing player ends their turns without moving
+                self.moves[seat].put_nowait(None)
+        if not self.clients:
+            # Nobody is left to play or watch
+            if self.task is not None:
+                self.task.cancel()
+            self.close()
+
+    def close(self):
+        if self.on_close is not None:
+            self.on_close(self)
+            self.on_close = None
+
+    def broadcast(self, line: str):
+        for client in self.clients.values():
+            client.send(line)
+
+    def is_turn_of(self, client: Client) -> bool:
+        return self.turn is not None and self.clients.get(self.turn) is client
+
+    def _take_view(self):
+        game = self.game
+        self.hand_lines = {seat: "HAND " + " ".join(card_text(card.id) for card in player.hand)
+                           for seat, player in enumerate(game.players)}
+        self.table_lines = [f"DECK {len(game.all_cards)}"] + [
+            f"MELD {i} {meld.type} " + " ".join(card_text(card.id) for card in meld.cards)
+            for i, meld in enumerate(game.all_melds)]
+
+    def state_lines(self, client: Client) -> List[str]:
+        seat = self.game.players.index(client.player)
+        return [self.hand_lines[seat]] + self.table_lines
+
+    async def run(self):
+        try:
+            await self._play()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            # A broken table ends on its own, the other tables go on
+            self.game.game_over = True
+            self.turn = None
+            self.broadcast(f"ABORT {error}")
+        finally:
+            self.close()
+
+    async def _play(self):
+        game = self.game
+        loop = asyncio.get_running_loop()
+        game.all_cards = game.create_deck()
+        game.original_deck = game.all_cards.copy()
+        game.deal_initial_hand()
+        game._open_ledger()
+        self._take_view()
+        self.broadcast("START")
+
+        while not game.is_game_over():
+            player = game.next_player()
+            self.broadcast(f"TURN {player.name}")
+            if player.is_ai:
+                await loop.run_in_executor(self.executor, game.play_player_turn, player)
+                self._take_view()
+                self.broadcast(f"EVENT {player.name} played")
+            else:
+                await self._human_turn(player)
+
+        game.finish_game()
+        self.broadcast(f"OVER {game.winner().name}")
+
+    async def _human_turn(self, player: Player):
+        game = self.game
+        seat = game.current_player_idx
+        client = self.clients.get(seat)
+        moves = self.moves[seat]
+        # Moves still queued from an earlier turn don't carry over
+        while not moves.empty():
+            moves.get_nowait()
+        action = Action(END_TURN)
+
+        while not game.is_game_over():
+            action = None
+            if client is not None and seat in self.clients:
+                client.actions = game.legal_actions(player)
+                client.send("YOUR_TURN")
+                self.turn = seat
+                try:
+                    action = await asyncio.wait_for(moves.get(), self.turn_timeout)
+                except asyncio.TimeoutError:
+                    action = None
+                finally:
+                    self.turn = None
+            if action is None:
+                action = Action(END_TURN)
+            elif action not in game.legal_actions(player):
+                # Checked when applied, an earlier move of the turn may have used its cards
+                client.send("ERR illegal action")
+                continue
+
+            ends_turn = game.apply_action(player, action)
+            self._take_view()
+            self.broadcast(f"EVENT {player.name} {action_text(action)}")
+            if ends_turn:
+                break
+
+        # Counted like the turns of a strategy, the game ends when nobody can move
+        game.end_turn(game.action_turn_moved(action))
+
+class GameServer:
+    """
+    Hosts many tables in one process behind a line based TCP protocol. The
+    AI of every table searches its decisions for ai_time_budget seconds on
+    one of the ai_workers processes of the server's SearchPool
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 7777, ai_workers: int = 4,
+                 turn_timeout: Optional[float] = None, ai_time_budget: float = 0.5):
+        self.host = host
+        self.port = port
+        self.turn_timeout = turn_timeout
+        self.ai_time_budget = ai_time_budget
+        self.pool = SearchPool(ai_workers)
+        # Threads only wait for the search results of AI turns, the search itself runs on the pool
+        self.executor = ThreadPoolExecutor(max_workers=ai_workers)
+        self.tables: Dict[int, GameTable] = {}
+        self._ids = itertools.count(1)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        """
+        Starts listening and returns the port, useful with port 0
+        """
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for table in list(self.tables.values()):
+            if table.task is not None:
+                table.task.cancel()
+        self.executor.shutdown(wait=False)
+        self.pool.close()
+
+    def _remove_table(self, table: GameTable):
+        self.tables.pop(table.id, None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = Client(reader, writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode().split()
+                if not words:
+                    continue
+                if words[0].upper() == "QUIT":
+                    break
+                try:
+                    self._dispatch(client, words[0].upper(), words[1:])
+                except (ValueError, IndexError) as error:
+                    client.send(f"ERR {error}")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if client.table is not None:
+                client.table.leave(client)
+            writer.close()
+
+    def _dispatch(self, client: Client, command: str, args: List[str]):
+        if command == "NEW":
+            humans = int(args[0])
+            seed = int(args[1]) if len(args) > 1 else None
+            table_id = next(self._ids)
+            strategy = ParallelISMCTS(self.ai_time_budget, self.pool, workers=1, seed=seed or 0)
+            self.tables[table_id] = GameTable(table_id, humans, self.executor, seed, self.turn_timeout,
+                                              self._remove_table, strategy)
+            client.send(f"OK TABLE {table_id}")
+        elif command == "JOIN":
+            table = self.tables.get(int(args[0]))
+            if table is None or not table.free_seats or client.table is not None:
+                raise ValueError("can't join this table")
+            client.send(f"OK SEAT {table.join(client, args[1] if len(args) > 1 else 'Player')}")
+        elif client.table is None:
+            raise ValueError("join a table first")
+        elif command == "STATE":
+            for line in client.table.state_lines(client):
+                client.send(line)
+            client.send("END")
+        elif command == "ACTIONS":
+            if client.table.is_turn_of(client):
+                client.actions = client.table.game.legal_actions(client.player)
+            for i, action in enumerate(client.actions):
+                client.send(f"ACTION {i} {action_text(action)}")
+            client.send("END")
+        elif command == "PLAY":
+            table = client.table
+            if not table.is_turn_of(client):
+                raise ValueError("not your turn")
+            action = client.actions[int(args[0])]
+            client.actions = []
+            table.moves[table.turn].put_nowait(action)
+        else:
+            raise ValueError(f"unknown command {command}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Robber's Rummy table server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--ai-workers", type=int, default=4, help="Processes that search the AI decisions")
+    parser.add_argument("--ai-time", type=float, default=0.5, help="Seconds the AI searches each decision")
+    parser.add_argument("--turn-timeout", type=float, default=None, help="Seconds before a human turn ends on its own")
+    args = parser.parse_args()
+    server = GameServer(args.host, args.port, args.ai_workers, args.turn_timeout, args.ai_time)
+    asyncio.run(server.serve_forever())
+
+if __name__ == "__main__":
+    main()
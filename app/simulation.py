@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple
+from .rummy import RobbersRummy
+from .ledger import IntegrityPolicy
+from .eventlog import EventLogWriter
+from .profiling import TurnProfiler
+
+if TYPE_CHECKING:
+    from .selfplay import SelfPlayRecorder
+
+@dataclass(frozen=True)
+class GameResult:
+    seed: Optional[int]
+    winner: int  # Seat index of the winner
+    went_out: bool  # False when the game ended because nobody could move
+    turns: int
+    scores: Tuple[int, ...]  # Score left in each seat's hand
+    cards_left: int  # Cards left in the deck
+
+def play_headless_game(seed: Optional[int] = None, num_ai_players: int = 2,
+                       integrity_policy: IntegrityPolicy = IntegrityPolicy.GAME_END,
+                       events: Optional[EventLogWriter] = None,
+                       profiler: Optional[TurnProfiler] = None,
+                       recorder: Optional["SelfPlayRecorder"] = None,
+                       num_decks: int = 2, num_jokers: int = 0) -> GameResult:
+    """
+    Plays a full AI-only game without rendering and returns a compact result.
+    With an event log writer every state change of the game is recorded,
+    with a profiler the phases of every turn are timed and with a self-play
+    recorder every AI turn becomes a training sample
+    """
+    game = RobbersRummy(num_players=0, num_ai_players=num_ai_players, headless=True, seed=seed,
+                        integrity_policy=integrity_policy, num_decks=num_decks, num_jokers=num_jokers)
+    game.events = events
+    if profiler is not None:
+        profiler.attach(game)
+    if recorder is not None:
+        recorder.attach(game)
+    game.play_headless_game()
+    return game_result(game, seed)
+
+def game_result(game: RobbersRummy, seed: Optional[int] = None) -> GameResult:
+    winner = game.winner()
+    return GameResult(
+        seed=seed,
+        winner=game.players.index(winner),
+        went_out=len(winner.hand) == 0,
+        turns=game.turn_count,
+        scores=tuple(player.calculate_score() for player in game.players),
+        cards_left=len(game.all_cards),
+    )
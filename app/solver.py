@@ -0,0 +1,283 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from .models.card import Card, JOKER_KEY, NUM_KEYS, NUM_VALUES
+from .models.meld import Meld
+
+# A hand signature packs the count of every (suit, value) key into 4 bits.
+# Jokers have the last key, their count takes every bit above the others
+SIGNATURE_BITS = 4
+COUNT_MASK = (1 << SIGNATURE_BITS) - 1
+JOKER_SHIFT = JOKER_KEY * SIGNATURE_BITS
+NATURAL_MASK = (1 << JOKER_SHIFT) - 1
+JOKER_POINTS = 25
+
+# A meld as found by the solver: ('run' or 'set', keys of its cards)
+KeyMeld = Tuple[str, Tuple[int, ...]]
+
+def hand_signature(cards: Iterable[Card]) -> int:
+    signature = 0
+    for card in cards:
+        signature += 1 << (card.key * SIGNATURE_BITS)
+    return signature
+
+def signature_count(signature: int, key: int) -> int:
+    if key == JOKER_KEY:
+        return signature >> JOKER_SHIFT
+    return (signature >> (key * SIGNATURE_BITS)) & COUNT_MASK
+
+# Bit 0 of the nibble of every key, and of the keys that can start a 3 card run
+_KEY_BITS = sum(1 << (key * SIGNATURE_BITS) for key in range(NUM_KEYS))
+_RUN_STARTS = sum(1 << (key * SIGNATURE_BITS) for key in range(NUM_KEYS) if key % NUM_VALUES < NUM_VALUES - 2)
+_SUIT_SHIFT = NUM_VALUES * SIGNATURE_BITS
+_SUIT_BLOCK = (1 << _SUIT_SHIFT) - 1
+# Keys with a higher value in their suit one and two steps up, and a lower one down
+_BELOW_TOP = sum(1 << (key * SIGNATURE_BITS) for key in range(NUM_KEYS) if key % NUM_VALUES < NUM_VALUES - 1)
+_ABOVE_BOTTOM = sum(1 << (key * SIGNATURE_BITS) for key in range(NUM_KEYS) if key % NUM_VALUES > 0)
+_ABOVE_SECOND = sum(1 << (key * SIGNATURE_BITS) for key in range(NUM_KEYS) if key % NUM_VALUES > 1)
+
+def meldable_signature(signature: int) -> int:
+    """
+    Drops the cards that can't be part of any meld. They are left over in
+    every partition, so the solver only has to look at the rest
+    """
+    jokers = signature >> JOKER_SHIFT
+    if jokers:
+        return _wild_meldable(signature & NATURAL_MASK, jokers)
+    present = (signature | signature >> 1 | signature >> 2 | signature >> 3) & _KEY_BITS
+
+    # Keys covered by a window of three consecutive values of one suit
+    starts = present & (present >> SIGNATURE_BITS) & (present >> 2 * SIGNATURE_BITS) & _RUN_STARTS
+    meldable = starts | starts << SIGNATURE_BITS | starts << 2 * SIGNATURE_BITS
+
+    # Keys whose value is held in at least three suits
+    a = present & _SUIT_BLOCK
+    b = (present >> _SUIT_SHIFT) & _SUIT_BLOCK
+    c = (present >> 2 * _SUIT_SHIFT) & _SUIT_BLOCK
+    d = present >> 3 * _SUIT_SHIFT
+    set_values = (a & b & (c | d)) | (c & d & (a | b))
+    if set_values:
+        set_values |= set_values << _SUIT_SHIFT
+        set_values |= set_values << 2 * _SUIT_SHIFT
+        meldable |= present & set_values
+
+    return signature & (meldable * COUNT_MASK)
+
+def _wild_meldable(signature: int, jokers: int) -> int:
+    # Two jokers meld with any card. One joker needs a second card of the
+    # same suit at most two values away, or of the same value
+    if jokers == 1:
+        present = (signature | signature >> 1 | signature >> 2 | signature >> 3) & _KEY_BITS
+        near = (present >> SIGNATURE_BITS & _BELOW_TOP | present >> 2 * SIGNATURE_BITS & _RUN_STARTS
+                | present << SIGNATURE_BITS & _ABOVE_BOTTOM | present << 2 * SIGNATURE_BITS & _ABOVE_SECOND)
+        a = present & _SUIT_BLOCK
+        b = (present >> _SUIT_SHIFT) & _SUIT_BLOCK
+        c = (present >> 2 * _SUIT_SHIFT) & _SUIT_BLOCK
+        d = present >> 3 * _SUIT_SHIFT
+        pairs = (a & (b | c | d)) | (b & (c | d)) | (c & d)
+        pairs |= pairs << _SUIT_SHIFT
+        pairs |= pairs << 2 * _SUIT_SHIFT
+        signature &= (present & (near | pairs)) * COUNT_MASK
+    return signature | jokers << JOKER_SHIFT if signature else 0
+
+# Signature offsets from a key to the same value in each later suit
+_SUIT_OFFSETS = [[(other - suit) * _SUIT_SHIFT for other in range(suit + 1, 4)] for suit in range(4)]
+
+def solve_signature(signature: int) -> Tuple[int, int, Tuple[KeyMeld, ...]]:
+    """
+    Best partition of a hand signature into melds. Returns the number of
+    cards melded, the points melded and the melds. More cards melded wins,
+    then more points, which leaves the lowest Player.calculate_score
+    """
+    signature = meldable_signature(signature)
+    jokers = signature >> JOKER_SHIFT
+    if jokers:
+        return solve_wild(signature & NATURAL_MASK, jokers)
+    return _solve(signature)
+
+@lru_cache(maxsize=1 << 16)
+def _solve(signature: int) -> Tuple[int, int, Tuple[KeyMeld, ...]]:
+    if signature == 0:
+        return 0, 0, ()
+
+    # Lowest key still in the hand, every lower key is already decided
+    shift = (signature & -signature).bit_length() - 1
+    shift -= shift % SIGNATURE_BITS
+    key = shift // SIGNATURE_BITS
+    suit, bit = divmod(key, NUM_VALUES)
+    value = bit + 1
+    one = 1 << shift
+    rest = signature >> shift
+
+    # The card stays in the hand
+    best = _solve(meldable_signature(signature - one))
+
+    # The card starts a run, it can't be in the middle as lower values are gone
+    removed = one
+    length = 1
+    while bit + length < NUM_VALUES and (rest >> (length * SIGNATURE_BITS)) & COUNT_MASK:
+        removed += one << (length * SIGNATURE_BITS)
+        length += 1
+        if length >= 3:
+            cards, points, melds = _solve(meldable_signature(signature - removed))
+            cards += length
+            points += length * value + length * (length - 1) // 2
+            if cards > best[0] or (cards == best[0] and points > best[1]):
+                best = (cards, points, (('run', tuple(range(key, key + length))),) + melds)
+
+    # The card joins a set with cards of the same value from later suits
+    others = [offset for offset in _SUIT_OFFSETS[suit] if (rest >> offset) & COUNT_MASK]
+    if len(others) >= 2:
+        groups = [(a, b) for i, a in enumerate(others) for b in others[i + 1:]]
+        if len(others) == 3:
+            groups.append(tuple(others))
+        for group in groups:
+            removed = one
+            for offset in group:
+                removed += one << offset
+            cards, points, melds = _solve(meldable_signature(signature - removed))
+            cards += len(group) + 1
+            points += (len(group) + 1) * value
+            if cards > best[0] or (cards == best[0] and points > best[1]):
+                keys = (key,) + tuple(key + offset // SIGNATURE_BITS for offset in group)
+                best = (cards, points, (('set', keys),) + melds)
+
+    return best
+
+def solve_wild(signature: int, jokers: int) -> Tuple[int, int, Tuple[KeyMeld, ...]]:
+    """
+    solve_signature for natural cards and jokers. The search only places the
+    jokers a meld needs, in the gaps of a run or to make 3 cards, and the
+    jokers left over go to the melds with room afterwards
+    """
+    naturals, capacity, points, melds = _solve_wild(signature, jokers)
+    spare = min(jokers, capacity - naturals) - sum(keys.count(JOKER_KEY) for _, keys in melds)
+    placed = []
+    for meld_type, keys in melds:
+        room = min(spare, (NUM_VALUES if meld_type == 'run' else 4) - len(keys))
+        if room > 0:
+            spare -= room
+            if meld_type == 'run':
+                above = min(room, NUM_VALUES - _run_top(keys) - 1)
+                keys = (JOKER_KEY,) * (room - above) + keys + (JOKER_KEY,) * above
+            else:
+                keys += (JOKER_KEY,) * room
+        placed.append((meld_type, keys))
+    used = sum(keys.count(JOKER_KEY) for _, keys in placed)
+    return naturals + used, points + used * JOKER_POINTS, tuple(placed)
+
+def _run_top(keys: Tuple[int, ...]) -> int:
+    # Value bit of the last card of a run, some cards may be jokers
+    for i in range(len(keys) - 1, -1, -1):
+        if keys[i] != JOKER_KEY:
+            return keys[i] % NUM_VALUES + len(keys) - 1 - i
+    raise ValueError("A run needs a natural card")
+
+def _capacity(melds: Tuple[KeyMeld, ...]) -> int:
+    # Cards the melds can hold at most
+    return sum(NUM_VALUES if meld_type == 'run' else 4 for meld_type, _ in melds)
+
+# (natural cards melded, capacity of the melds, natural points melded, melds)
+_WildResult = Tuple[int, int, int, Tuple[KeyMeld, ...]]
+
+def _solve_rest(signature: int, jokers: int) -> _WildResult:
+    signature = meldable_signature(signature + (jokers << JOKER_SHIFT))
+    jokers = signature >> JOKER_SHIFT
+    if jokers:
+        return _solve_wild(signature & NATURAL_MASK, jokers)
+    cards, points, melds = _solve(signature)
+    return cards, _capacity(melds), points, melds
+
+@lru_cache(maxsize=1 << 16)
+def _solve_wild(signature: int, jokers: int) -> _WildResult:
+    # _solve with jokers to spare. Every meld is tried with the fewest
+    # jokers it needs, the jokers fill the values a run is missing or make
+    # up a set of 3. More natural cards melded wins: every joker is melded
+    # too as long as the melds have room for them, so with as much room as
+    # possible next. Jokers never stand for a card the hand holds, a meld
+    # with such a joker melds as many cards with the two swapped
+    shift = (signature & -signature).bit_length() - 1
+    shift -= shift % SIGNATURE_BITS
+    key = shift // SIGNATURE_BITS
+    suit, bit = divmod(key, NUM_VALUES)
+    one = 1 << shift
+    rest = signature >> shift
+
+    # (natural cards, jokers used, natural points, cards removed, meld)
+    candidates: List[Tuple[int, int, int, int, KeyMeld]] = []
+
+    # The card starts a run that ends at a held card, jokers fill the gaps
+    removed = 0
+    used = 0
+    points = 0
+    count = 0
+    keys: Tuple[int, ...] = ()
+    for top in range(bit, NUM_VALUES):
+        step = (top - bit) * SIGNATURE_BITS
+        if not (rest >> step) & COUNT_MASK:
+            used += 1
+            keys += (JOKER_KEY,)
+            continue
+        if used > jokers:
+            break
+        removed += one << step
+        points += top + 1
+        count += 1
+        keys += (key + top - bit,)
+        # Runs shorter than 3 take jokers above, or below at the king
+        short = max(0, 3 - len(keys))
+        if used + short <= jokers:
+            above = min(short, NUM_VALUES - 1 - top)
+            candidates.append((count, used + short, points, removed,
+                               ('run', (JOKER_KEY,) * (short - above) + keys + (JOKER_KEY,) * above)))
+
+    # The card joins a set with cards of the same value from later suits
+    others = [offset for offset in _SUIT_OFFSETS[suit] if (rest >> offset) & COUNT_MASK]
+    for chosen in range(1 << len(others)):
+        group = [offset for i, offset in enumerate(others) if chosen >> i & 1]
+        count = len(group) + 1
+        used = max(0, 3 - count)
+        if used <= jokers:
+            removed = one
+            for offset in group:
+                removed += one << offset
+            keys = (key,) + tuple(key + offset // SIGNATURE_BITS for offset in group) + (JOKER_KEY,) * used
+            candidates.append((count, used, count * (bit + 1), removed, ('set', keys)))
+
+    total = _card_count(signature)
+    best: _WildResult = (0, 0, 0, ())
+    candidates.sort(key=lambda candidate: -candidate[0])
+    for count, used, points, removed, meld in candidates:
+        cards, capacity, rest_points, melds = _solve_rest(signature - removed, jokers - used)
+        result = (cards + count, capacity + _capacity((meld,)), rest_points + points, (meld,) + melds)
+        if result[:3] > best[:3]:
+            best = result
+            # Nothing can meld more cards than all of them
+            if best[0] == total and best[1] >= total + jokers:
+                return best
+
+    # The card stays in the hand
+    result = _solve_rest(signature - one, jokers)
+    return result if result[:3] > best[:3] else best
+
+def _card_count(signature: int) -> int:
+    # Cards of a signature without jokers, a count is at most 4 so 3 bits of its nibble
+    return (bin(signature & _KEY_BITS).count('1') + 2 * bin(signature >> 1 & _KEY_BITS).count('1')
+            + 4 * bin(signature >> 2 & _KEY_BITS).count('1'))
+
+def best_partition(cards: Iterable[Card]) -> List[Meld]:
+    """
+    Partition of the given cards into valid melds that melds as many cards
+    as possible. Cards missing from the melds stay in the hand
+    """
+    cards = list(cards)
+    _, _, key_melds = solve_signature(hand_signature(cards))
+    return melds_of(cards, key_melds)
+
+def melds_of(cards: Iterable[Card], key_melds: Iterable[KeyMeld]) -> List[Meld]:
+    """
+    Melds of the given cards that have the keys of key_melds
+    """
+    by_key: Dict[int, List[Card]] = {}
+    for card in cards:
+        by_key.setdefault(card.key, []).append(card)
+    return [Meld([by_key[key].pop() for key in keys], kind) for kind, keys in key_melds]
@@ -0,0 +1,145 @@
+from typing import List, Optional, Sequence, Tuple
+from .models.card import card_value
+from .moves import Action, TableMeld, DRAW, END_TURN, MELD, EXTEND, ROB, REARRANGE, generate_actions
+
+class GameState:
+    """
+    Integer-only game state for search. Actions are applied in place and
+    undone from a stack. Clones share the deck tuple and the immutable meld
+    tuples, only the hand lists and the table list are copied
+    """
+    __slots__ = ('deck', 'deck_size', 'hands', 'table', 'current', 'acted', 'passes', 'undo_stack')
+
+    def __init__(self, deck: Sequence[int], hands: List[List[int]], table: List[TableMeld],
+                 current: int = 0, deck_size: Optional[int] = None):
+        self.deck: Tuple[int, ...] = tuple(deck)
+        # Cards are drawn from the end, deck[deck_size - 1] is the top card
+        self.deck_size = len(self.deck) if deck_size is None else deck_size
+        self.hands = hands
+        self.table = table
+        self.current = current
+        self.acted = False  # The current player did something this turn
+        self.passes = 0  # Consecutive turns without any action on an empty deck
+        self.undo_stack: List[tuple] = []
+
+    @classmethod
+    def from_game(cls, game) -> "GameState":
+        # The passes so far and whether the current turn has acted carry over,
+        # a search must count the passes the same way as the game
+        current = max(game.current_player_idx, 0)
+        state = cls(
+            [card.id for card in game.all_cards],
+            [[card.id for card in player.hand] for player in game.players],
+            [(meld.type, tuple(card.id for card in meld.cards)) for meld in game.all_melds],
+            current,
+        )
+        state.acted = game.turn_acted
+        state.passes = game.passes
+        return state
+
+    def clone(self) -> "GameState":
+        state = GameState.__new__(GameState)
+        state.deck = self.deck
+        state.deck_size = self.deck_size
+        state.hands = [hand[:] for hand in self.hands]
+        state.table = self.table[:]
+        state.current = self.current
+        state.acted = self.acted
+        state.passes = self.passes
+        state.undo_stack = []
+        return state
+
+    def legal_actions(self) -> List[Action]:
+        return generate_actions(self.hands[self.current], self.table, self.deck_size)
+
+    def is_over(self) -> bool:
+        return self.passes >= len(self.hands) or any(len(hand) == 0 for hand in self.hands)
+
+    def score(self, seat: int) -> int:
+        # Same as Player.calculate_score
+        score = 0
+        for card_id in self.hands[seat]:
+            value = card_value(card_id)
+            score += value if value < 14 else 25
+        return score
+
+    def winner(self) -> int:
+        for seat, hand in enumerate(self.hands):
+            if not hand:
+                return seat
+        scores = [self.score(seat) for seat in range(len(self.hands))]
+        return scores.index(min(scores))
+
+    def apply(self, action: Action):
+        kind = action.kind
+        hand = self.hands[self.current]
+        turn = (self.current, self.acted, self.passes)
+
+        if kind == DRAW or kind == END_TURN:
+            if kind == DRAW:
+                self.deck_size -= 1
+                hand.append(self.deck[self.deck_size])
+            if kind == END_TURN and not self.acted and self.deck_size == 0:
+                self.passes += 1
+            else:
+                self.passes = 0
+            self.current = (self.current + 1) % len(self.hands)
+            self.acted = False
+            self.undo_stack.append((kind, turn))
+            return
+
+        # Positions the cards had in the hand, so undo restores the same order
+        positions = []
+        for card_id in action.cards:
+            position = hand.index(card_id)
+            positions.append(position)
+            del hand[position]
+
+        table = self.table
+        if kind == MELD:
+            table.append((action.meld_type, action.cards))
+            old_meld = None
+        elif kind == EXTEND:
+            old_meld = table[action.meld]
+            table[action.meld] = (old_meld[0], old_meld[1] + action.cards)
+        elif kind == ROB:
+            old_meld = table.pop(action.meld)
+            hand.extend(old_meld[1])
+        elif kind == REARRANGE:
+            old_meld = table[action.meld]
+            table[action.meld] = (old_meld[0], tuple(card_id for card_id in old_meld[1] if card_id != action.table_card))
+            table.append((action.meld_type, (action.table_card,) + action.cards))
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+
+        self.acted = True
+        self.undo_stack.append((kind, turn, action, positions, old_meld))
+
+    def undo(self):
+        record = self.undo_stack.pop()
+        kind = record[0]
+        self.current, self.acted, self.passes = record[1]
+        hand = self.hands[self.current]
+
+        if kind == DRAW:
+            hand.pop()
+            self.deck_size += 1
+            return
+        if kind == END_TURN:
+            return
+
+        _, _, action, positions, old_meld = record
+        table = self.table
+        if kind == MELD:
+            table.pop()
+        elif kind == EXTEND:
+            table[action.meld] = old_meld
+        elif kind == ROB:
+            del hand[len(hand) - len(old_meld[1]):]
+            table.insert(action.meld, old_meld)
+        elif kind == REARRANGE:
+            table.pop()
+            table[action.meld] = old_meld
+
+        for card_id, position in zip(reversed(action.cards), reversed(positions)):
+            hand.insert(position, card_id)
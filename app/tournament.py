@@ -0,0 +1,89 @@
+import hashlib
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+from .simulation import GameResult, play_headless_game
+
+def derive_game_seed(master_seed: int, game_index: int) -> int:
+    """
+    Seed of a single game, it only depends on the master seed and the game's
+    index, so results don't change with the number of workers
+    """
+    digest = hashlib.blake2b(f"{master_seed}:{game_index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def _play_chunk(args: Tuple[int, int, int, int]) -> List[GameResult]:
+    master_seed, start, stop, num_ai_players = args
+    return [play_headless_game(derive_game_seed(master_seed, i), num_ai_players) for i in range(start, stop)]
+
+def run_tournament(num_games: int, master_seed: int, num_ai_players: int = 2,
+                   workers: Optional[int] = None, chunk_size: int = 64) -> Iterator[GameResult]:
+    """
+    Plays num_games headless games across a process pool and streams the
+    results back in game order
+    """
+    chunks = [(master_seed, start, min(start + chunk_size, num_games), num_ai_players)
+              for start in range(0, num_games, chunk_size)]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _play_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps the chunk order, so the stream is the same for any pool size
+        for results in pool.imap(_play_chunk, chunks):
+            yield from results
+
+@dataclass
+class TournamentSummary:
+    num_ai_players: int
+    games: int = 0
+    went_out: int = 0
+    total_turns: int = 0
+    wins: List[int] = field(default_factory=list)
+    total_scores: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.wins:
+            self.wins = [0] * self.num_ai_players
+        if not self.total_scores:
+            self.total_scores = [0] * self.num_ai_players
+
+    def add(self, result: GameResult):
+        self.games += 1
+        self.went_out += result.went_out
+        self.total_turns += result.turns
+        self.wins[result.winner] += 1
+        for seat, score in enumerate(result.scores):
+            self.total_scores[seat] += score
+
+    def win_rates(self) -> List[float]:
+        return [wins / self.games if self.games else 0.0 for wins in self.wins]
+
+    def average_scores(self) -> List[float]:
+        return [score / self.games if self.games else 0.0 for score in self.total_scores]
+
+def summarize_tournament(num_games: int, master_seed: int, num_ai_players: int = 2,
+                         workers: Optional[int] = None) -> TournamentSummary:
+    summary = TournamentSummary(num_ai_players)
+    for result in run_tournament(num_games, master_seed, num_ai_players, workers):
+        summary.add(result)
+    return summary
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play headless AI-vs-AI games across all cores")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai-players", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = summarize_tournament(args.games, args.seed, args.ai_players, args.workers)
+    print(f"Games: {summary.games}, went out: {summary.went_out}, turns: {summary.total_turns}")
+    print(f"Win rates: {summary.win_rates()}")
+    print(f"Average scores: {summary.average_scores()}")
@@ -0,0 +1,200 @@
+from typing import List, Optional, Sequence
+import numpy as np
+from . import eventlog
+from .models.card import JOKER_KEY, NUM_KEYS, card_key
+
+NUM_TRACKED = JOKER_KEY + 1  # The (suit, value) keys and the joker key
+
+class CardTracker:
+    """
+    What one seat has seen of the cards. Copies of every key that the seat
+    hasn't seen are either in the deck or hidden in an opponent's hand, and
+    cards an opponent took from the table are known to be in that hand.
+    Attaching hooks the tracker into the game's event sink, every event
+    costs a few counter updates per card. Probabilities are built from the
+    counters when asked for and kept until the next event
+    """
+    def __init__(self, seat: int, num_players: int, num_decks: int = 2, num_jokers: int = 0):
+        self.seat = seat
+        self.num_players = num_players
+        self.num_decks = num_decks
+        self.num_jokers = num_jokers
+        self.reset()
+
+    def reset(self):
+        # A full deck before the deal
+        self.unseen: List[int] = [self.num_decks] * NUM_KEYS + [self.num_jokers]
+        self.table: List[int] = [0] * NUM_TRACKED
+        # Copies known to be in each hand, the seat's own hand is always known
+        self.known: List[List[int]] = [[0] * NUM_TRACKED for _ in range(self.num_players)]
+        self.known_sizes = [0] * self.num_players
+        self.hand_sizes = [0] * self.num_players
+        self.deck_size = self.num_decks * NUM_KEYS + self.num_jokers
+        self._rebuilt: Optional[List[int]] = None  # Table cards of a repartition still to be placed
+        self._probabilities: Optional[np.ndarray] = None
+
+    def attach(self, game):
+        """
+        Tracks the seat from the current state of the game on, later games
+        on the same object start over at their deal
+        """
+        self.sync(game)
+        game.events = _TrackerEvents(self, game.events)
+
+    def sync(self, game):
+        # What the seat can see of the game right now
+        self.reset()
+        self.deck_size = len(game.all_cards)
+        for meld in game.all_melds:
+            for card in meld.cards:
+                self.table[card.key] += 1
+                self.unseen[card.key] -= 1
+        for seat, player in enumerate(game.players):
+            self.hand_sizes[seat] = len(player.hand)
+        for card in game.players[self.seat].hand:
+            self._learn(self.seat, card.key)
+            self.unseen[card.key] -= 1
+
+    def observe(self, kind: int, seat: int, cards: Sequence[int] = ()):
+        """
+        Updates the counters with one game event, see eventlog
+        """
+        self._probabilities = None
+        if kind != eventlog.MELD:
+            self._rebuilt = None
+        if kind == eventlog.DEAL or kind == eventlog.DRAW:
+            self.deck_size -= len(cards)
+            self.hand_sizes[seat] += len(cards)
+            if seat == self.seat:
+                # Only the seat itself sees the cards it draws
+                for card_id in cards:
+                    key = card_key(card_id)
+                    self.unseen[key] -= 1
+                    self._learn(seat, key)
+        elif kind == eventlog.MELD:
+            rebuilt = self._rebuilt
+            for card_id in cards:
+                key = card_key(card_id)
+                if rebuilt is not None and rebuilt[key]:
+                    rebuilt[key] -= 1
+                else:
+                    self._from_hand(seat, key)
+                self.table[key] += 1
+        elif kind == eventlog.EXTEND:
+            for card_id in cards:
+                key = card_key(card_id)
+                self._from_hand(seat, key)
+                self.table[key] += 1
+        elif kind == eventlog.ROB:
+            for card_id in cards:
+                key = card_key(card_id)
+                self.table[key] -= 1
+                self._learn(seat, key)
+            self.hand_sizes[seat] += len(cards)
+        elif kind == eventlog.REARRANGE:
+            # The first card moves between table melds, the rest come from the hand
+            for card_id in cards[1:]:
+                key = card_key(card_id)
+                self._from_hand(seat, key)
+                self.table[key] += 1
+        elif kind == eventlog.REPARTITION:
+            # The MELD records that follow hold the whole new table
+            self._rebuilt = self.table
+            self.table = [0] * NUM_TRACKED
+
+    def _learn(self, seat: int, key: int):
+        self.known[seat][key] += 1
+        self.known_sizes[seat] += 1
+
+    def _from_hand(self, seat: int, key: int):
+        self.hand_sizes[seat] -= 1
+        if self.known[seat][key]:
+            self.known[seat][key] -= 1
+            self.known_sizes[seat] -= 1
+        else:
+            # A hidden card of an opponent shows up
+            self.unseen[key] -= 1
+
+    def remaining(self, key: int) -> int:
+        """
+        Copies of the key the seat hasn't seen
+        """
+        return self.unseen[key]
+
+    def hidden(self, seat: int) -> int:
+        # Cards of the seat's hand that the tracker doesn't know
+        return self.hand_sizes[seat] - self.known_sizes[seat]
+
+    def probabilities(self) -> np.ndarray:
+        """
+        (1 + players, keys) chance that the deck, row 0, or the hand of a
+        seat, row 1 + seat, holds at least one copy of each key. Hidden
+        cards are dealt uniformly over the deck and the hidden hand cards
+        """
+        if self._probabilities is None:
+            self._probabilities = self._compute()
+        return self._probabilities
+
+    def in_deck(self) -> np.ndarray:
+        return self.probabilities()[0]
+
+    def in_hand(self, seat: int) -> np.ndarray:
+        return self.probabilities()[1 + seat]
+
+    def expected_copies(self) -> np.ndarray:
+        """
+        (1 + players, keys) expected copies of each key in the deck and in
+        every hand, known cards included
+        """
+        unseen = np.array(self.unseen, dtype=np.float64)
+        slots = self._slots()
+        total = slots.sum()
+        expected = np.outer(slots / total if total else slots, unseen)
+        expected[1:] += np.array(self.known, dtype=np.float64)
+        return expected
+
+    def _slots(self) -> np.ndarray:
+        # Hidden places of the deck and every hand
+        return np.array([self.deck_size] + [self.hidden(seat) for seat in range(self.num_players)],
+                        dtype=np.float64)
+
+    def _compute(self) -> np.ndarray:
+        unseen = np.array(self.unseen, dtype=np.int64)
+        slots = self._slots()[:, None]
+        total = slots.sum()
+        # Hypergeometric chance that none of the unseen copies is among the slots
+        none = np.ones((len(slots), NUM_TRACKED))
+        for i in range(int(unseen.max(initial=0))):
+            factor = np.clip((total - slots - i) / (total - i), 0.0, 1.0)
+            none = np.where(unseen > i, none * factor, none)
+        probabilities = 1.0 - none
+        probabilities[1:][np.array(self.known) > 0] = 1.0
+        return probabilities
+
+class _TrackerEvents:
+    # Event sink of one attached game, updates the tracker and passes the events on
+    def __init__(self, tracker: CardTracker, forward):
+        self.tracker = tracker
+        self.forward = forward
+
+    def begin_game(self, seed: Optional[int], num_players: int):
+        self.tracker.reset()
+        if self.forward is not None:
+            self.forward.begin_game(seed, num_players)
+
+    def record(self, turn: int, kind: int, seat: int, cards: Sequence[int] = (), meld: int = eventlog.NO_MELD):
+        self.tracker.observe(kind, seat, cards)
+        if self.forward is not None:
+            self.forward.record(turn, kind, seat, cards, meld)
+
+def track_ai_players(game) -> List[CardTracker]:
+    """
+    Attaches a tracker to every AI seat of the game as player.tracker
+    """
+    trackers = []
+    for seat, player in enumerate(game.players):
+        if player.is_ai:
+            player.tracker = CardTracker(seat, len(game.players), game.num_decks, game.num_jokers)
+            player.tracker.attach(game)
+            trackers.append(player.tracker)
+    return trackers
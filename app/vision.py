@@ -0,0 +1,294 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from .models.card import SUITS, NUM_KEYS, NUM_VALUES, card_from_id
+
+try:
+    from PIL import Image
+except ImportError:  # Optional, only needed for PNG and JPEG files
+    Image = None
+
+# Card images are matched at this size, and synthetic cards are drawn at it
+CARD_HEIGHT = 64
+CARD_WIDTH = 48
+VALUE_ROWS = 20  # Rows of the card from the top that hold the value
+FRAME = 3  # Rows and columns of the card edge that are ignored
+NETPBM = ('.pgm', '.ppm')
+IMAGE_FILES = NETPBM + ('.png', '.jpg', '.jpeg')
+
+class Recognition(NamedTuple):
+    path: str
+    key: Optional[int]  # (suit, value) key of the card, None when nothing matched well enough
+    score: float  # Correlation with the best reference, 1.0 is a perfect match
+
+def read_image(path: str) -> np.ndarray:
+    """
+    Grayscale uint8 pixels of an image file. Binary PGM and PPM are read
+    directly, other formats need Pillow
+    """
+    if path.lower().endswith(NETPBM):
+        return _read_netpbm(path)
+    if Image is None:
+        raise ValueError(f"Reading {path} needs Pillow, only PGM and PPM files are supported without it")
+    with Image.open(path) as image:
+        return np.asarray(image.convert('L'))
+
+_NETPBM_HEADER = re.compile(rb'(P[56])(?:\s|#[^\n]*\n)+(\d+)(?:\s|#[^\n]*\n)+(\d+)(?:\s|#[^\n]*\n)+(\d+)\s')
+
+def _read_netpbm(path: str) -> np.ndarray:
+    with open(path, 'rb') as file:
+        data = file.read()
+    header = _NETPBM_HEADER.match(data)
+    if header is None or int(header.group(4)) > 255:
+        raise ValueError(f"{path} is not an 8 bit binary PGM or PPM file")
+    width, height = int(header.group(2)), int(header.group(3))
+    channels = 3 if header.group(1) == b'P6' else 1
+    pixels = np.frombuffer(data, dtype=np.uint8, count=width * height * channels, offset=header.end())
+    if channels == 3:
+        return pixels.reshape(height, width, 3).mean(axis=2).astype(np.uint8)
+    return pixels.reshape(height, width)
+
+def write_pgm(path: str, image: np.ndarray):
+    height, width = image.shape
+    with open(path, 'wb') as file:
+        file.write(f"P5\n{width} {height}\n255\n".encode())
+        file.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())
+
+def card_name(key: int) -> str:
+    # Same text as the server uses, e.g. 12K
+    return f"{key % NUM_VALUES + 1}{SUITS[key // NUM_VALUES].value}"
+
+_CARD_NAME = re.compile(r'^(\d+)([A-Z])')
+
+def key_of_name(name: str) -> Optional[int]:
+    # Key of a file name that starts with a card name, None for other names
+    match = _CARD_NAME.match(os.path.basename(name))
+    if match is None:
+        return None
+    value = int(match.group(1))
+    suits = [i for i, suit in enumerate(SUITS) if suit.value == match.group(2)]
+    if not suits or not 1 <= value <= NUM_VALUES:
+        return None
+    return suits[0] * NUM_VALUES + value - 1
+
+def normalize(image: np.ndarray, shifts: Sequence[Tuple[int, int]] = ((0, 0),)) -> np.ndarray:
+    """
+    Crops an image to the dark frame of the card, resamples it to the
+    card size and scales it to zero mean and unit length, so matching is a
+    dot product that ignores position, size, brightness and contrast.
+    Returns one row per (dy, dx) shift of the card inside its frame
+    """
+    size = (CARD_HEIGHT - 2 * FRAME) * (CARD_WIDTH - 2 * FRAME)
+    image = image.astype(np.float32)
+    low, high = np.percentile(image, (1, 99))
+    ink = image < (low + high) / 2
+    rows = np.flatnonzero(ink.any(axis=1))
+    columns = np.flatnonzero(ink.any(axis=0))
+    if len(rows) < 2 or len(columns) < 2:
+        return np.zeros((len(shifts), size), dtype=np.float32)
+    top, bottom, left, right = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+    # Area resampling of the crop: every output pixel is the mean of its
+    # cell, read from a summed area table with one fancy index per corner
+    table = np.zeros((bottom - top + 1, right - left + 1), dtype=np.float64)
+    table[1:, 1:] = image[top:bottom, left:right].cumsum(axis=0).cumsum(axis=1)
+    y = np.linspace(0, bottom - top, CARD_HEIGHT + 1).round().astype(np.intp)
+    x = np.linspace(0, right - left, CARD_WIDTH + 1).round().astype(np.intp)
+    y0, y1 = y[:-1, None], np.maximum(y[1:], y[:-1] + 1)[:, None]
+    x0, x1 = x[None, :-1], np.maximum(x[1:], x[:-1] + 1)[None, :]
+    y1 = np.minimum(y1, bottom - top)
+    x1 = np.minimum(x1, right - left)
+    cells = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+    card = (cells / ((y1 - y0) * (x1 - x0))).astype(np.float32)
+    # A 3x3 box blur forgives strokes that are thinner or thicker than the reference
+    padded = np.pad(card, 1, mode='edge')
+    card = sum(padded[dy:dy + CARD_HEIGHT, dx:dx + CARD_WIDTH] for dy in range(3) for dx in range(3))
+    # The value corner and the suit symbol are scaled apart and weigh the
+    # same, otherwise the large symbol drowns out the value. The frame is
+    # left out, it is the same on every card
+    vectors = np.empty((len(shifts), size), dtype=np.float32)
+    for i, (dy, dx) in enumerate(shifts):
+        inner = card[FRAME + dy:CARD_HEIGHT - FRAME + dy, FRAME + dx:CARD_WIDTH - FRAME + dx]
+        vectors[i] = np.concatenate([_unit(inner[:VALUE_ROWS - FRAME]), _unit(inner[VALUE_ROWS - FRAME:])])
+    return vectors / np.sqrt(2)
+
+def _unit(region: np.ndarray) -> np.ndarray:
+    vector = region.ravel()
+    vector = vector - vector.mean()
+    length = np.linalg.norm(vector)
+    return vector / length if length else vector
+
+class CardRecognizer:
+    """
+    Matches card images against one reference image per (suit, value) key.
+    Images are decoded and normalized on a thread pool, and a batch is
+    matched against every reference with one matrix product
+    """
+    def __init__(self, references: Dict[int, np.ndarray], min_score: float = 0.5, workers: int = 4):
+        self.keys = np.array(sorted(references), dtype=np.intp)
+        self.templates = np.concatenate([normalize(references[key]) for key in self.keys])
+        self.min_score = min_score
+        self.workers = workers
+
+    @classmethod
+    def from_directory(cls, directory: str, **kwargs) -> "CardRecognizer":
+        """
+        References from image files named after their card, e.g. 12K.pgm
+        """
+        references = {}
+        for path in image_paths(directory):
+            key = key_of_name(path)
+            if key is not None:
+                references[key] = read_image(path)
+        if not references:
+            raise ValueError(f"No reference card images in {directory}")
+        return cls(references, **kwargs)
+
+    @classmethod
+    def synthetic(cls, **kwargs) -> "CardRecognizer":
+        return cls({key: draw_card(key) for key in range(NUM_KEYS)}, **kwargs)
+
+    def match(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best key and its score for each image, given as its normalized
+        shifts (images, shifts, size). Key is -1 below min_score
+        """
+        scores = (vectors @ self.templates.T).max(axis=1)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+        keys = np.where(best_scores >= self.min_score, self.keys[best], -1)
+        return keys, best_scores
+
+    def recognize(self, paths: Iterable[str], batch_size: int = 64) -> Iterator[Recognition]:
+        """
+        Recognitions of the image files in the order of paths. Batches are
+        decoded on the pool while the previous batch is matched
+        """
+        paths = list(paths)
+        batches = [paths[start:start + batch_size] for start in range(0, len(paths), batch_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # At most two batches are decoded at a time, memory stays bounded
+            pending = [pool.submit(_load, path) for path in batches[0]] if batches else []
+            for i, batch in enumerate(batches):
+                vectors = np.stack([future.result() for future in pending])
+                if i + 1 < len(batches):
+                    pending = [pool.submit(_load, path) for path in batches[i + 1]]
+                keys, scores = self.match(vectors)
+                for path, key, score in zip(batch, keys.tolist(), scores.tolist()):
+                    yield Recognition(path, key if key >= 0 else None, score)
+
+    def recognize_directory(self, directory: str, batch_size: int = 64) -> Iterator[Recognition]:
+        return self.recognize(image_paths(directory), batch_size)
+
+# Crops can be a pixel off the reference, every image is matched at each of these offsets
+SHIFTS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+def _load(path: str) -> np.ndarray:
+    return normalize(read_image(path), SHIFTS)
+
+def image_paths(directory: str) -> List[str]:
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(IMAGE_FILES))
+
+def add_to_hand(player, recognitions: Iterable[Recognition]) -> List[Recognition]:
+    """
+    Adds the recognized cards to the player's hand, a second card with the
+    same key becomes the second copy. Returns the images that weren't recognized
+    """
+    missed = []
+    for recognition in recognitions:
+        if recognition.key is None:
+            missed.append(recognition)
+            continue
+        copy = player.hand.count(recognition.key)
+        player.hand.append(card_from_id(copy * NUM_KEYS + recognition.key))
+    return missed
+
+# 5x7 digits and 7x7 suit symbols of synthetic cards
+_DIGITS = [
+    "01110 10001 10011 10101 11001 10001 01110", "00100 01100 00100 00100 00100 00100 01110",
+    "01110 10001 00001 00010 00100 01000 11111", "11110 00001 00001 01110 00001 00001 11110",
+    "00010 00110 01010 10010 11111 00010 00010", "11111 10000 11110 00001 00001 10001 01110",
+    "00110 01000 10000 11110 10001 10001 01110", "11111 00001 00010 00100 01000 01000 01000",
+    "01110 10001 10001 01110 10001 10001 01110", "01110 10001 10001 01111 00001 00010 01100",
+]
+_SUIT_SYMBOLS = [
+    "0110110 1111111 1111111 1111111 0111110 0011100 0001000",  # Hearts
+    "0001000 0011100 0111110 1111111 0111110 0011100 0001000",  # Diamonds
+    "0011100 0011100 1101011 1111111 1101011 0001000 0011100",  # Clubs
+    "0001000 0011100 0111110 1111111 1111111 0001000 0011100",  # Spades
+]
+
+def _glyph(pattern: str, scale: int) -> np.ndarray:
+    bits = np.array([[bit == '1' for bit in row] for row in pattern.split()])
+    return np.kron(bits, np.ones((scale, scale), dtype=bool))
+
+def draw_card(key: int) -> np.ndarray:
+    """
+    Clean synthetic image of a card: a frame, the value top left and the
+    suit symbol in the middle, dark on white
+    """
+    image = np.full((CARD_HEIGHT, CARD_WIDTH), 255, dtype=np.uint8)
+    image[[0, -1], :] = 0
+    image[:, [0, -1]] = 0
+    x = 4
+    for digit in str(key % NUM_VALUES + 1):
+        glyph = _glyph(_DIGITS[int(digit)], 2)
+        image[4:4 + glyph.shape[0], x:x + glyph.shape[1]][glyph] = 0
+        x += glyph.shape[1] + 2
+    symbol = _glyph(_SUIT_SYMBOLS[key // NUM_VALUES], 4)
+    top, left = 26, (CARD_WIDTH - symbol.shape[1]) // 2
+    image[top:top + symbol.shape[0], left:left + symbol.shape[1]][symbol] = 0
+    return image
+
+def photograph(card: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    The card image as a scan would see it: enlarged, off center on a light
+    background, with a different exposure and sensor noise
+    """
+    scale = rng.uniform(1.0, 1.6)
+    height, width = int(CARD_HEIGHT * scale), int(CARD_WIDTH * scale)
+    y = np.arange(height) * CARD_HEIGHT // height
+    x = np.arange(width) * CARD_WIDTH // width
+    card = card[y[:, None], x[None, :]].astype(np.float32)
+    margin = rng.integers(0, 12, size=4)
+    image = np.full((height + margin[0] + margin[1], width + margin[2] + margin[3]),
+                    rng.uniform(215, 255), dtype=np.float32)
+    image[margin[0]:margin[0] + height, margin[2]:margin[2] + width] = card
+    image = image * rng.uniform(0.6, 1.0) + rng.uniform(0, 40)
+    image += rng.normal(0, 10, size=image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+def write_synthetic_set(directory: str, per_card: int = 2, seed: int = 0) -> List[Tuple[str, int]]:
+    """
+    Writes per_card noisy scans of every card as PGM files and returns
+    (path, key) pairs. File names don't tell the card
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    truth = []
+    for i in range(per_card * NUM_KEYS):
+        key = int(rng.integers(NUM_KEYS))
+        path = os.path.join(directory, f"scan-{i:05d}.pgm")
+        write_pgm(path, photograph(draw_card(key), rng))
+        truth.append((path, key))
+    return truth
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recognize card images of a directory")
+    parser.add_argument("directory")
+    parser.add_argument("--references", help="Directory of reference images named after their card, e.g. 12K.pgm. "
+                                             "Synthetic references are used without it")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--min-score", type=float, default=0.5)
+    args = parser.parse_args()
+
+    options = {"workers": args.workers, "min_score": args.min_score}
+    recognizer = CardRecognizer.from_directory(args.references, **options) if args.references \
+        else CardRecognizer.synthetic(**options)
+    for recognition in recognizer.recognize_directory(args.directory):
+        name = "?" if recognition.key is None else card_name(recognition.key)
+        print(f"{recognition.path} {name} {recognition.score:.3f}")
@@ -0,0 +1,50 @@
+from app.analysis import analyze
+from app.models.suit import Suit
+from app.models.card import Card
+from app.models.player import Player
+from app.render import RichRenderer
+from app.rummy import RobbersRummy
+from app.solver import hand_signature
+
+class TestHandAnalysis:
+    def test_groups_and_melds(self):
+        hand = [Card(Suit.HEARTS, 1, 0), Card(Suit.CLUBS, 1, 26), Card(Suit.DIAMONDS, 1, 13),
+                Card(Suit.CLUBS, 4, 29), Card(Suit.CLUBS, 5, 30), Card(Suit.CLUBS, 5, 82)]
+        analysis = analyze(hand_signature(hand))
+        assert sorted(analysis.value_groups) == [1, 4, 5]
+        assert len(analysis.value_groups[1]) == 3
+        assert len(analysis.value_groups[5]) == 2
+        assert sorted(analysis.suit_groups) == [0, 1, 2]
+        assert [key % 13 + 1 for key in analysis.suit_groups[2]] == [1, 4, 5, 5]
+        assert analysis.can_meld and analysis.melded == 3
+        assert analysis.melds[0][0] == 'set'
+
+    def test_cached_by_signature(self):
+        player = Player("AI", is_ai=True)
+        player.hand = [Card(Suit.HEARTS, 2, 1), Card(Suit.SPADES, 9, 47)]
+        first = player.analysis
+        assert player.analysis is first
+        assert not first.can_meld and first.meldable == 0
+        # Same cards in another order are the same hand
+        player.hand = list(reversed(player.hand))
+        assert player.analysis is first
+        player.hand.append(Card(Suit.HEARTS, 3, 54))
+        assert player.analysis is not first
+
+    def test_arrange_best_skips_hands_without_melds(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        player = game.players[1]
+        player.hand = [Card(Suit.HEARTS, 2, 1), Card(Suit.SPADES, 9, 47)]
+        assert not game.ai_arrange_best(player)
+        player.hand = [Card(Suit.HEARTS, 2, 1), Card(Suit.HEARTS, 3, 2), Card(Suit.HEARTS, 4, 3), Card(Suit.SPADES, 9, 99)]
+        assert game.ai_arrange_best(player)
+        assert [card.value for card in player.hand] == [9]
+
+    def test_hand_table_cached_by_signature(self):
+        renderer = RichRenderer()
+        game = RobbersRummy(num_players=1, num_ai_players=1, renderer=renderer)
+        player = game.players[0]
+        player.hand = [Card(Suit.HEARTS, 2, 1), Card(Suit.SPADES, 9, 47)]
+        table = renderer._hand(game, player)
+        player.hand = list(reversed(player.hand))
+        assert renderer._hand(game, player) is table
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from app.batch import evaluate_hands, hand_tensor
+from app.models.card import JOKER_ID_BASE, card_from_id
+from app.solver import hand_signature, meldable_signature, signature_count
+
+HEARTS, DIAMONDS, CLUBS, SPADES = range(4)
+
+def _ids(*cards):
+    # Card ids of the first deck copy
+    return [suit * 13 + value - 1 for suit, value in cards]
+
+class TestBatch:
+    def test_hand_tensor_counts_copies(self):
+        hand = _ids((HEARTS, 5), (SPADES, 13)) + [52 + 4]
+        counts = hand_tensor([hand, []])
+        assert counts.shape == (2, 4, 13)
+        assert counts[0, 0, 4] == 2
+        assert counts[0, 3, 12] == 1
+        assert counts[1].sum() == 0
+        with pytest.raises(ValueError):
+            hand_tensor([hand + [JOKER_ID_BASE]])
+
+    def test_candidates(self):
+        run = _ids((CLUBS, 4), (CLUBS, 5), (CLUBS, 6), (CLUBS, 7))
+        three = _ids((HEARTS, 9), (DIAMONDS, 9), (SPADES, 9))
+        loose = _ids((HEARTS, 1), (SPADES, 3))
+        evaluation = evaluate_hands(hand_tensor([run + three + loose, loose]))
+
+        assert evaluation.set_values[0].nonzero()[0].tolist() == [8]
+        assert evaluation.run_starts[0, 2].nonzero()[0].tolist() == [3, 4]
+        assert evaluation.longest_run[0].tolist() == [1, 1, 4, 1]
+        assert evaluation.longest_run_start[0, 2] == 4
+        assert evaluation.unmeldable.tolist() == [2, 2]
+        assert evaluation.can_meld.tolist() == [True, False]
+
+    def test_meldable_matches_solver(self):
+        rng = np.random.default_rng(3)
+        hands = [rng.choice(104, size=rng.integers(5, 20), replace=False).tolist() for _ in range(200)]
+        evaluation = evaluate_hands(hand_tensor(hands))
+        for i, hand in enumerate(hands):
+            sig = meldable_signature(hand_signature(card_from_id(card_id) for card_id in hand))
+            melded = sum(signature_count(sig, key) for key in range(52))
+            assert len(hand) - melded == evaluation.unmeldable[i]
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+from app.benchmark import BENCHMARKS, compare, run_benchmark, run_suite
+from app.simulation import play_headless_game
+
+def _results(**values):
+    return {"results": {name: {"value": value, "unit": "s/op"} for name, value in values.items()}}
+
+class TestBenchmark:
+    def test_suite_covers_engine_and_games(self):
+        for name in ("is_valid_run", "is_valid_set", "meld_can_be_robbed", "try_form_melds",
+                     "find_longest_consecutive_subarray", "check_game_integrity",
+                     "headless_game", "headless_game_memory"):
+            assert name in BENCHMARKS
+
+    def test_run_benchmarks(self):
+        suite = run_suite(["is_valid_set", "headless_game_memory"], min_time=0.01, repeat=1)
+        assert set(suite["results"]) == {"is_valid_set", "headless_game_memory"}
+        assert suite["results"]["headless_game_memory"]["unit"] == "bytes/game"
+        assert all(result["value"] > 0 for result in suite["results"].values())
+        assert run_benchmark("meld_can_be_robbed", min_time=0.01, repeat=1) < 0.01
+
+    def test_memory_does_not_depend_on_warm_caches(self):
+        cold = run_benchmark("headless_game_memory")
+        for seed in range(5):
+            play_headless_game(seed)
+        assert abs(run_benchmark("headless_game_memory") - cold) < 0.02 * cold
+
+    def test_compare_flags_slowdowns(self):
+        old = _results(a=1.0, b=1.0, gone=1.0)
+        new = _results(a=1.05, b=1.5, added=1.0)
+        rows = {name: (ratio, regressed) for name, _, _, ratio, regressed in compare(old, new, threshold=0.1)}
+        assert set(rows) == {"a", "b"}
+        assert rows["a"] == (1.05, False)
+        assert rows["b"] == (1.5, True)
+
+    def test_vision_is_imported_on_demand(self):
+        # A fresh interpreter, the other tests may have imported it already
+        code = "import sys, app.benchmark; print('app.vision' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
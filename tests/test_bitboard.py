@@ -0,0 +1,27 @@
+from app.models.suit import Suit
+from app.models.card import Card
+from app.bitboard import is_consecutive, longest_run, run_segments
+from app.rummy import RobbersRummy
+
+class TestBitboard:
+    def test_is_consecutive(self):
+        assert is_consecutive(0b111)
+        assert is_consecutive(0b1111000)
+        assert not is_consecutive(0b1011)
+        assert not is_consecutive(0)
+
+    def test_run_segments(self):
+        mask = 0b1111011100011
+        assert run_segments(mask) == [(6, 3), (10, 4)]
+        assert run_segments(mask, min_length=1) == [(1, 2), (6, 3), (10, 4)]
+        assert longest_run(mask) == (10, 4)
+        assert longest_run(0b0111000111) == (1, 3)
+        assert longest_run(0) == (0, 0)
+
+    def test_longest_subarray_skips_duplicates(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        cards = [Card(Suit.HEARTS, 3, 2), Card(Suit.HEARTS, 4, 55), Card(Suit.HEARTS, 4, 3),
+                 Card(Suit.HEARTS, 5, 4), Card(Suit.HEARTS, 6, 5)]
+        run = game._find_longest_consecutive_subarray(cards)
+        assert [card.value for card in run] == [3, 4, 5, 6]
+        assert game._is_valid_run(run)
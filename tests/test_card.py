@@ -0,0 +1,43 @@
+import copy
+import pickle
+import pytest
+from app.models.suit import Suit
+from app.models.card import Card, card_from_id, card_key, card_suit, card_value
+from app.rummy import RobbersRummy
+
+class TestCard:
+    def test_cards_are_interned(self):
+        assert Card(Suit.HEARTS, 5, 4) is Card(Suit.HEARTS, 5, 4)
+        assert Card(Suit.HEARTS, 5, 4) != Card(Suit.HEARTS, 5, 56)
+        assert len({Card(Suit.HEARTS, 5, 4), Card(Suit.HEARTS, 5, 4), Card(Suit.HEARTS, 5, 56)}) == 2
+
+    def test_card_is_immutable(self):
+        card = Card(Suit.CLUBS, 3, 28)
+        with pytest.raises(AttributeError):
+            card.value = 4
+        assert not hasattr(card, '__dict__')
+
+    def test_card_id_must_match_the_card(self):
+        with pytest.raises(ValueError):
+            Card(Suit.HEARTS, 5, 5)
+        with pytest.raises(ValueError):
+            Card(Suit.HEARTS, 5, 212)
+        with pytest.raises(ValueError):
+            Card(Suit.HEARTS, 14, 4)
+        assert Card(Suit.HEARTS, 14, 208) is card_from_id(208)
+
+    def test_copy_and_pickle_keep_identity(self):
+        card = card_from_id(17)
+        assert copy.deepcopy(card) is card
+        assert pickle.loads(pickle.dumps(card)) is card
+
+    def test_card_id_helpers(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        deck = game.create_deck()
+        assert sorted(card.id for card in deck) == list(range(104))
+        for card in deck:
+            assert card is card_from_id(card.id)
+            assert card_suit(card.id) == card.suit
+            assert card_value(card.id) == card.value
+            assert card_key(card.id) == card.key
+        assert card_key(0) == card_key(52)
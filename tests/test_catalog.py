@@ -0,0 +1,37 @@
+from itertools import combinations
+from app.catalog import MELDS, BY_KEY, completions, extension_keys, find_meld, melds_in
+
+def _keys(*pairs):
+    return [suit * 13 + value - 1 for suit, value in pairs]
+
+class TestCatalog:
+    def test_catalog_size(self):
+        # 66 runs per suit, 4 triples and 1 quad per value
+        assert len([meld for meld in MELDS if meld.type == 'run']) == 4 * 66
+        assert len([meld for meld in MELDS if meld.type == 'set']) == 13 * 5
+        assert [meld.id for meld in MELDS] == list(range(len(MELDS)))
+
+    def test_find_meld(self):
+        assert find_meld(_keys((1, 5), (1, 6), (1, 7))).type == 'run'
+        assert find_meld(_keys((0, 5), (2, 5), (3, 5))).type == 'set'
+        assert find_meld(_keys((1, 5), (1, 7), (1, 8))) is None
+        assert find_meld(_keys((1, 5), (1, 5), (1, 6))) is None
+        assert find_meld(_keys((1, 12), (1, 13), (1, 1))) is None
+
+    def test_completions(self):
+        # A run with a gap is completed by the missing card only
+        assert [key for key, _ in completions(_keys((2, 4), (2, 6)))] == _keys((2, 5))
+        assert sorted(extension_keys(_keys((2, 4), (2, 5), (2, 6)))) == _keys((2, 3), (2, 7))
+        assert extension_keys(_keys((0, 1), (0, 2), (0, 3))) == _keys((0, 4))
+        assert extension_keys(_keys((0, 9), (1, 9), (3, 9))) == _keys((2, 9))
+        assert extension_keys(_keys((0, 9), (1, 9), (2, 9), (3, 9))) == []
+
+    def test_by_key_and_melds_in(self):
+        key = _keys((3, 7))[0]
+        assert all(key in meld.keys for meld in BY_KEY[key])
+        hand = _keys((0, 1), (0, 2), (0, 3), (0, 4), (1, 9), (2, 9), (3, 9))
+        mask = sum(1 << key for key in hand)
+        found = {meld.keys for meld in melds_in(mask)}
+        expected = {tuple(sorted(combo)) for size in range(3, 8) for combo in combinations(hand, size)
+                    if find_meld(combo) is not None}
+        assert found == expected
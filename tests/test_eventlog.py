@@ -0,0 +1,92 @@
+import random
+import pytest
+from app import eventlog
+from app.eventlog import EventLogReader, EventLogWriter, RECORD, RECORD_SIZE
+from app.moves import END_TURN
+from app.rummy import RobbersRummy
+from app.simulation import play_headless_game
+
+def _table(game):
+    return [sorted(card.id for card in meld.cards) for meld in game.all_melds]
+
+def _hands(game):
+    return [sorted(card.id for card in player.hand) for player in game.players]
+
+class TestEventLog:
+    def test_record_layout(self):
+        assert RECORD.itemsize == RECORD_SIZE == 32
+
+    def test_replay_headless_games(self, tmp_path):
+        path = str(tmp_path / "games.log")
+        results = []
+        with EventLogWriter(path, buffer_records=16) as writer:
+            for seed in range(5):
+                results.append(play_headless_game(seed, num_ai_players=3, events=writer))
+
+        with EventLogReader(path) as reader:
+            assert reader.num_games == 5
+            for game, result in enumerate(results):
+                replayed = reader.replay(game)
+                assert replayed.seed == result.seed
+                assert replayed.winner == result.winner
+                assert len(replayed.hands) == 3
+                assert sum(len(hand) for hand in replayed.hands) + sum(len(meld) for meld in replayed.table) \
+                    == 104 - result.cards_left
+
+    def test_replay_matches_game_at_every_turn(self, tmp_path):
+        path = str(tmp_path / "actions.log")
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=8)
+        writer = EventLogWriter(path)
+        game.events = writer
+        game.all_cards = game.create_deck()
+        game.original_deck = game.all_cards.copy()
+        game.deal_initial_hand()
+        game._open_ledger()
+
+        rng = random.Random(2)
+        snapshots = {}
+        seat = 0
+        game.turn_count = 1
+        for _ in range(300):
+            if game.is_game_over():
+                break
+            player = game.players[seat]
+            snapshots.setdefault(game.turn_count, (_hands(game), _table(game)))
+            actions = game.legal_actions(player)
+            moves = [action for action in actions if action.kind != END_TURN] or actions
+            if game.apply_action(player, rng.choice(moves)):
+                seat = 1 - seat
+                game.turn_count += 1
+        writer.close()
+
+        with EventLogReader(path) as reader:
+            kinds = set(reader.records['kind'].tolist())
+            assert {eventlog.DEAL, eventlog.DRAW, eventlog.MELD, eventlog.ROB} <= kinds
+            for turn, (hands, table) in snapshots.items():
+                replayed = reader.replay(0, turn)
+                assert [sorted(hand) for hand in replayed.hands] == hands
+                assert [sorted(meld) for meld in replayed.table] == table
+
+    def test_too_many_cards(self, tmp_path):
+        with EventLogWriter(str(tmp_path / "x.log")) as writer:
+            writer.begin_game(1, 2)
+            with pytest.raises(ValueError):
+                writer.record(1, eventlog.MELD, 0, list(range(20)))
+
+    def test_record_needs_a_game(self, tmp_path):
+        with EventLogWriter(str(tmp_path / "x.log")) as writer:
+            with pytest.raises(ValueError, match="begin_game"):
+                writer.record(1, eventlog.DRAW, 0, [5])
+
+    def test_seed_must_fit_in_the_log(self, tmp_path):
+        with EventLogWriter(str(tmp_path / "x.log")) as writer:
+            for seed in (-1, 1 << 64):
+                with pytest.raises(ValueError):
+                    writer.begin_game(seed, 2)
+            assert writer.begin_game((1 << 64) - 1, 2) == 0
+
+    def test_empty_log(self, tmp_path):
+        path = str(tmp_path / "empty.log")
+        EventLogWriter(path).close()
+        with EventLogReader(path) as reader:
+            assert len(reader) == 0 and reader.num_games == 0
@@ -0,0 +1,62 @@
+import pytest
+from app.models.suit import Suit
+from app.models.card import Card
+from app.models.hand import Hand
+from app.models.player import Player
+from app.solver import hand_signature
+
+class TestHand:
+    def test_sorted_by_suit_and_value(self):
+        cards = [Card(Suit.SPADES, 2, 40), Card(Suit.HEARTS, 9, 8), Card(Suit.HEARTS, 3, 2), Card(Suit.CLUBS, 1, 26)]
+        hand = Hand(cards)
+        # The order the hand was shown in before, by suit letter and value
+        assert list(hand) == sorted(cards, key=lambda card: (card.suit.value, card.value))
+        assert [(card.suit, card.value) for card in hand] == \
+            [(Suit.SPADES, 2), (Suit.CLUBS, 1), (Suit.HEARTS, 3), (Suit.HEARTS, 9)]
+        assert hand[0].suit == Suit.SPADES and hand[-1].value == 9
+        assert [card.value for card in hand[1:3]] == [1, 3]
+        assert hand.index(cards[2]) == 2
+        with pytest.raises(IndexError):
+            hand[4]
+
+    def test_add_remove_and_counts(self):
+        a, b, c = Card(Suit.HEARTS, 5, 56), Card(Suit.HEARTS, 5, 108), Card(Suit.DIAMONDS, 7, 19)
+        hand = Hand([a, b, c])
+        assert len(hand) == 3 and a in hand and b in hand
+        assert hand.count(a.key) == 2
+        assert hand.signature == hand_signature([a, b, c])
+        hand.remove(a)
+        assert a not in hand and b in hand
+        assert hand.count(a.key) == 1
+        assert hand.signature == hand_signature([b, c])
+        with pytest.raises(ValueError):
+            hand.remove(a)
+        assert hand.take(c.key) is c
+        assert hand.pop() is b
+        assert not hand and hand == [] and hand.signature == 0
+
+    def test_remove_while_iterating(self):
+        cards = [Card(Suit.CLUBS, value, 26 + value - 1) for value in range(1, 6)]
+        hand = Hand(cards)
+        for card in hand:
+            hand.remove(card)
+        assert len(hand) == 0
+
+    def test_list_api(self):
+        # Dealt card ids, copy * 52 + key
+        a, b = Card(Suit.HEARTS, 5, 4), Card(Suit.SPADES, 1, 39 + 52)
+        hand = Hand()
+        hand.extend([b, a])
+        assert hand.index(b) == 0
+        assert hand.find(91) is b and hand.find(39) is None and hand.find(99) is None
+        assert hand.copy() == [b, a]
+        hand.clear()
+        assert len(hand) == 0 and list(hand) == []
+
+    def test_player_wraps_lists(self):
+        player = Player("P")
+        player.hand = [Card(Suit.HEARTS, 5, 56)]
+        assert isinstance(player.hand, Hand)
+        hand = Hand()
+        player.hand = hand
+        assert player.hand is hand
@@ -0,0 +1,71 @@
+import random
+import pytest
+from app.ismcts import ISMCTS, determinize
+from app.moves import Action, DRAW, END_TURN, ROB
+from app.rummy import RobbersRummy
+from app.state import GameState
+
+def _dealt_game(seed: int) -> RobbersRummy:
+    game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=seed)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game
+
+class TestISMCTS:
+    def test_needs_a_budget(self):
+        with pytest.raises(ValueError):
+            ISMCTS(iterations=None, time_budget=None)
+
+    def test_determinize_keeps_own_hand_and_sizes(self):
+        state = GameState.from_game(_dealt_game(3))
+        sampled = determinize(state, 0, random.Random(1))
+        assert sampled.hands[0] == state.hands[0]
+        assert [len(hand) for hand in sampled.hands] == [len(hand) for hand in state.hands]
+        assert sampled.deck_size == state.deck_size
+        hidden = sorted(list(state.deck) + state.hands[1])
+        assert sorted(list(sampled.deck) + sampled.hands[1]) == hidden
+
+    def test_search_returns_legal_action(self):
+        state = GameState.from_game(_dealt_game(5))
+        result = ISMCTS(iterations=200, seed=2).search(state)
+        assert result.iterations == 200
+        assert result.action in state.legal_actions()
+        assert result.action.kind != ROB
+        assert sum(result.visits.values()) == 200
+        assert all(0.0 <= value <= 1.0 for value in result.values.values())
+
+    def test_search_draws_instead_of_an_idle_end_turn(self):
+        state = GameState.from_game(_dealt_game(8))
+        result = ISMCTS(iterations=50, seed=1).search(state)
+        assert Action(DRAW) in result.visits
+        assert Action(END_TURN) not in result.visits
+
+    def test_time_budget_stops_search(self):
+        state = GameState.from_game(_dealt_game(6))
+        result = ISMCTS(iterations=None, time_budget=0.05, seed=1).search(state)
+        assert result.iterations > 0
+        assert result.elapsed < 0.5
+        assert result.playouts_per_second > 0
+
+    def test_search_leaves_state_untouched(self):
+        state = GameState.from_game(_dealt_game(7))
+        hands = [hand[:] for hand in state.hands]
+        ISMCTS(iterations=50, seed=1).search(state)
+        assert state.hands == hands and state.deck_size == len(state.deck)
+
+    def test_headless_game_with_search_player(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=11)
+        game.players[0].strategy = ISMCTS(iterations=4, rollout_turns=2, seed=3)
+        winner = game.play_headless_game()
+        assert winner in game.players
+        assert len(game.original_deck) == len(game.all_cards) + sum(len(p.hand) for p in game.players) + \
+            sum(len(meld.cards) for meld in game.all_melds)
+
+    def test_search_players_play_until_the_end(self):
+        # Ending a turn without drawing isn't a pass while the deck has cards
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=2)
+        for seat, player in enumerate(game.players):
+            player.strategy = ISMCTS(iterations=4, rollout_turns=2, seed=seat)
+        game.play_headless_game()
+        assert len(game.all_cards) == 0 or any(len(player.hand) == 0 for player in game.players)
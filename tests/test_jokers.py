@@ -0,0 +1,109 @@
+import random
+import time
+import pytest
+from app.models.suit import Suit
+from app.models.card import Card, JOKER_ID_BASE, JOKER_KEY, card_from_id
+from app.models.meld import Meld
+from app.models.meld_table import MeldTable
+from app.models.hand import Hand
+from app.moves import MELD, EXTEND, generate_actions
+from app.rummy import RobbersRummy
+from app.simulation import play_headless_game
+from app.solver import JOKER_SHIFT, best_partition, hand_signature, solve_signature
+from app.ledger import IntegrityPolicy
+from tests.test_solver import _brute_force
+
+def _joker(i=0):
+    return card_from_id(JOKER_ID_BASE + i)
+
+def _valid(game, meld):
+    return game._is_valid_run(meld.cards) if meld.type == 'run' else game._is_valid_set(meld.cards)
+
+class TestJokers:
+    def test_joker_cards(self):
+        joker = _joker()
+        assert joker.key == JOKER_KEY and joker.value == 14 and str(joker) == "JK"
+
+    def test_deck_sizes(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1, num_decks=4, num_jokers=6)
+        deck = game.create_deck()
+        assert len(deck) == 4 * 52 + 6
+        assert len({card.id for card in deck}) == len(deck)
+        assert sum(card.key == JOKER_KEY for card in deck) == 6
+        with pytest.raises(ValueError):
+            RobbersRummy(num_players=1, num_ai_players=1, num_decks=5)
+
+    def test_runs_with_jokers(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        five, eight = Card(Suit.HEARTS, 5, 4), Card(Suit.HEARTS, 8, 7)
+        assert game._is_valid_run([five, _joker(0), _joker(1), eight])
+        assert not game._is_valid_run([five, _joker(0), eight])
+        assert game._is_valid_run([Card(Suit.HEARTS, 13, 12), _joker(0), _joker(1)])
+        assert not game._is_valid_run([_joker(0), _joker(1), _joker(2)])
+        assert not game._is_valid_run([five, Card(Suit.CLUBS, 6, 31), _joker(0)])
+        assert not game._is_valid_run([five, five, _joker(0)])
+
+    def test_sets_with_jokers(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        sevens = [Card(suit, 7, i * 13 + 6) for i, suit in enumerate(Suit)]
+        assert game._is_valid_set(sevens[:2] + [_joker()])
+        assert game._is_valid_set(sevens[:3] + [_joker()])
+        assert not game._is_valid_set(sevens + [_joker()])
+        assert not game._is_valid_set([sevens[0], card_from_id(sevens[0].key + 52), _joker()])
+
+    def test_extension_of_joker_melds(self):
+        run = Meld([Card(Suit.CLUBS, 5, 30), _joker(), Card(Suit.CLUBS, 7, 32)], 'run')
+        assert sorted(run.extension_keys()) == [26 + 3, 26 + 7]
+        assert run.can_be_robbed(_joker(1))
+        full_set = Meld([Card(suit, 2, i * 13 + 1) for i, suit in enumerate(list(Suit)[:3])] + [_joker()], 'set')
+        assert full_set.extension_keys() == [] and not full_set.can_be_robbed(_joker(1))
+        table = MeldTable([run, full_set])
+        assert table.robbable(JOKER_KEY) == [run]
+        assert JOKER_KEY not in table.index
+
+    def test_solver_uses_jokers(self):
+        hand = [Card(Suit.SPADES, 4, 42), Card(Suit.SPADES, 6, 44), _joker(), Card(Suit.HEARTS, 9, 8)]
+        melds = best_partition(hand)
+        assert sum(len(meld.cards) for meld in melds) == 3
+        cards, points, _ = solve_signature(hand_signature(hand))
+        assert (cards, points) == (3, 4 + 6 + 25)
+
+    def test_spare_jokers_fill_melds(self):
+        # Four aces and five jokers, a set of four aces would leave every joker
+        aces = [Card(suit, 1, i * 13) for i, suit in enumerate(Suit)]
+        cards, _, melds = solve_signature(hand_signature(aces) + (5 << JOKER_SHIFT))
+        assert cards == 9
+        assert sum(keys.count(JOKER_KEY) for _, keys in melds) == 5
+
+    def test_matches_brute_force(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        rng = random.Random(5)
+        pool = [card_from_id(suit * 13 + value + copy * 52) for suit in range(3) for value in range(5)
+                for copy in range(3)]
+        for _ in range(40):
+            hand = rng.sample(pool, rng.randint(2, 7)) + [_joker(i) for i in range(rng.randint(0, 2))]
+            melds = best_partition(hand)
+            for meld in melds:
+                assert _valid(game, meld)
+            assert sum(len(meld.cards) for meld in melds) == _brute_force(hand, game)
+
+    def test_hand_and_actions_with_jokers(self):
+        hand = Hand([_joker(), Card(Suit.DIAMONDS, 3, 15), Card(Suit.DIAMONDS, 4, 16)])
+        assert hand[-1].key == JOKER_KEY and hand.count(JOKER_KEY) == 1
+        table = [('set', tuple(suit * 13 + 9 for suit in range(3)))]
+        actions = generate_actions([card.id for card in hand], table, 0)
+        melds = [action for action in actions if action.kind == MELD]
+        assert any(JOKER_ID_BASE in action.cards and action.meld_type == 'run' for action in melds)
+        assert any(action.kind == EXTEND and action.cards == (JOKER_ID_BASE,) for action in actions)
+
+    def test_headless_games_keep_melds_valid(self):
+        for seed in range(10):
+            game = RobbersRummy(num_players=0, num_ai_players=3, headless=True, seed=seed, num_decks=3,
+                                num_jokers=6, integrity_policy=IntegrityPolicy.ALWAYS)
+            game.play_headless_game()
+            assert all(_valid(game, meld) for meld in game.all_melds)
+
+    def test_many_decks_and_jokers_stay_fast(self):
+        start = time.perf_counter()
+        play_headless_game(1, 4, num_decks=4, num_jokers=8)
+        assert time.perf_counter() - start < 5
@@ -0,0 +1,60 @@
+import pytest
+from app.ledger import CardLedger, IntegrityPolicy, DECK, TABLE, PLAYERS
+from app.rummy import RobbersRummy
+
+def _dealt_game(policy: IntegrityPolicy, interval: int = 10) -> RobbersRummy:
+    game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=11,
+                        integrity_policy=policy, integrity_interval=interval)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game
+
+class TestLedger:
+    def test_move_keeps_totals(self):
+        ledger = CardLedger(2)
+        ledger.open(deck=100, table=0, hands=[2, 2])
+        ledger.move(DECK, PLAYERS + 1)
+        ledger.move(PLAYERS + 1, TABLE, 3)
+        assert ledger.matches(deck=99, table=3, hands=[2, 0])
+        assert not ledger.matches(deck=99, table=3, hands=[2, 1])
+        assert ledger.total == 104
+
+    def test_ledger_opens_from_the_dealt_game(self):
+        game = _dealt_game(IntegrityPolicy.ALWAYS)
+        game._open_ledger()
+        assert game.ledger.counts == [76, 0, 14, 14]
+
+    def test_unbooked_card_movement_is_caught(self):
+        game = _dealt_game(IntegrityPolicy.GAME_END)
+        game._open_ledger()
+        game._audit_turn()
+        # A card leaves the deck without going through the ledger
+        game.players[0].hand.append(game.all_cards.pop())
+        with pytest.raises(ValueError):
+            game._audit_turn()
+
+    def test_lost_card_is_caught_when_the_ledger_opens(self):
+        game = _dealt_game(IntegrityPolicy.GAME_END)
+        game.players[0].hand.pop()
+        with pytest.raises(ValueError):
+            game.play_turn()
+
+    def test_full_audit_follows_policy(self, monkeypatch):
+        for policy, expected in ((IntegrityPolicy.ALWAYS, 20), (IntegrityPolicy.EVERY_N_TURNS, 4),
+                                 (IntegrityPolicy.GAME_END, 0), (IntegrityPolicy.NEVER, 0)):
+            game = _dealt_game(policy, interval=5)
+            audits = []
+            monkeypatch.setattr(game, 'check_game_integrity', lambda: audits.append(game.turn_count))
+            game._open_ledger()
+            for turn in range(20):
+                game._audit_turn()
+                game.turn_count += 1
+            assert len(audits) == expected
+
+    def test_headless_game_stays_balanced(self):
+        game = RobbersRummy(num_players=0, num_ai_players=3, headless=True, seed=5,
+                            integrity_policy=IntegrityPolicy.EVERY_N_TURNS, integrity_interval=3)
+        game.play_headless_game()
+        assert game.ledger.matches(len(game.all_cards), game.all_melds.card_count, game._hand_sizes())
+        assert game.check_game_integrity()
@@ -0,0 +1,36 @@
+from app.models.suit import Suit
+from app.models.card import Card, card_from_id
+from app.models.meld import Meld
+from app.models.meld_table import MeldTable
+from app.rummy import RobbersRummy
+
+class TestMeldTable:
+    def test_index_follows_extended_runs(self):
+        run = Meld([Card(Suit.HEARTS, 2, 1), Card(Suit.HEARTS, 3, 2), Card(Suit.HEARTS, 4, 3)], 'run')
+        table = MeldTable([run])
+        assert table.robbable(Card(Suit.HEARTS, 1, 0).key) == [run]
+        assert table.robbable(Card(Suit.HEARTS, 5, 4).key) == [run]
+        table.extend_meld(run, Card(Suit.HEARTS, 5, 4))
+        assert table.robbable(Card(Suit.HEARTS, 5, 56).key) == []
+        assert table.robbable(Card(Suit.HEARTS, 6, 5).key) == [run]
+        assert table.key_mask == sum(1 << key for key in table.index)
+        table.remove(run)
+        assert len(table) == 0
+        assert table.index == {} and table.key_mask == 0
+
+    def test_full_set_and_king_run_cannot_be_extended(self):
+        full_set = Meld([Card(Suit.HEARTS, 2, 1), Card(Suit.DIAMONDS, 2, 14), Card(Suit.CLUBS, 2, 27), Card(Suit.SPADES, 2, 40)], 'set')
+        top_run = Meld([Card(Suit.CLUBS, 11, 36), Card(Suit.CLUBS, 12, 37), Card(Suit.CLUBS, 13, 38)], 'run')
+        table = MeldTable([full_set, top_run])
+        assert list(table.index) == [Card(Suit.CLUBS, 10, 35).key]
+
+    def test_index_matches_can_be_robbed(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        game.all_melds = [
+            Meld([card_from_id(0), card_from_id(1), card_from_id(2)], 'run'),
+            Meld([card_from_id(56), card_from_id(57), card_from_id(58), card_from_id(59)], 'run'),
+            Meld([card_from_id(5), card_from_id(18), card_from_id(31)], 'set'),
+        ]
+        for card in game.create_deck():
+            expected = [meld for meld in game.all_melds if meld.can_be_robbed(card)]
+            assert game.find_robbable_melds(card) == expected[:1]
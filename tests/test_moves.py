@@ -0,0 +1,60 @@
+import random
+from app.models.suit import Suit
+from app.models.card import card_from_id
+from app.models.meld import Meld
+from app.moves import Action, DRAW, END_TURN, MELD, EXTEND, ROB, REARRANGE, generate_actions, ends_turn
+from app.rummy import RobbersRummy
+
+def _ids(*pairs):
+    # Card ids of (suit index, value) pairs
+    return [suit * 13 + value - 1 for suit, value in pairs]
+
+class TestMoves:
+    def test_generate_meld_actions(self):
+        hand = _ids((0, 1), (0, 2), (0, 3), (0, 4), (1, 9), (2, 9), (3, 9))
+        actions = generate_actions(hand, [], deck_size=0)
+        assert Action(DRAW) not in actions
+        assert Action(END_TURN) in actions
+        melds = [action for action in actions if action.kind == MELD]
+        # Runs 1-3, 1-4 and 2-4, plus the set of nines
+        assert len(melds) == 4
+        assert Action(MELD, tuple(_ids((1, 9), (2, 9), (3, 9))), meld_type='set') in melds
+
+    def test_generate_table_actions(self):
+        table = [('run', tuple(_ids((0, 4), (0, 5), (0, 6), (0, 7)))), ('set', tuple(_ids((0, 2), (1, 2), (2, 2))))]
+        hand = _ids((0, 8), (3, 2), (0, 2), (0, 3))
+        actions = set(generate_actions(hand, table, deck_size=5))
+        assert Action(EXTEND, tuple(_ids((0, 8))), meld=0) in actions
+        assert Action(EXTEND, tuple(_ids((3, 2))), meld=1) in actions
+        assert Action(ROB, meld=0) in actions and Action(ROB, meld=1) in actions
+        # The 4 leaves the run and joins the hand's 2 and 3
+        assert Action(REARRANGE, tuple(_ids((0, 2), (0, 3))), meld=0, table_card=_ids((0, 4))[0], meld_type='run') in actions
+
+    def test_apply_actions_keeps_game_consistent(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=21)
+        game.all_cards = game.create_deck()
+        game.original_deck = game.all_cards.copy()
+        game.deal_initial_hand()
+        game._open_ledger()
+        rng = random.Random(0)
+        seat = 0
+        for _ in range(300):
+            player = game.players[seat]
+            actions = game.legal_actions(player)
+            # Prefer actions that keep the game moving
+            moves = [action for action in actions if action.kind != END_TURN] or actions
+            action = rng.choice(moves)
+            if game.apply_action(player, action):
+                seat = 1 - seat
+            for meld in game.all_melds:
+                valid = game._is_valid_run if meld.type == 'run' else game._is_valid_set
+                assert valid(meld.cards)
+            game._audit_turn()
+            assert game.check_game_integrity()
+            if game.is_game_over():
+                break
+
+    def test_ends_turn(self):
+        assert ends_turn(Action(DRAW))
+        assert ends_turn(Action(END_TURN))
+        assert not ends_turn(Action(ROB, meld=0))
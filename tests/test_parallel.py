@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from app import parallel
+from app.moves import Action, DRAW, MELD
+from app.parallel import ParallelISMCTS, SearchPool, merge_results, pack_state, unpack_state
+from app.rummy import RobbersRummy
+from app.state import GameState
+from app.tracker import NUM_TRACKED
+
+def _dealt_game(seed):
+    game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=seed)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game
+
+@pytest.fixture(scope="module")
+def pool():
+    with SearchPool(2) as pool:
+        yield pool
+
+class TestParallelSearch:
+    def test_pack_round_trip(self):
+        state = GameState([1, 2, 3], [[4, 5], [6]], [('run', (0, 1, 2)), ('set', (9, 22, 35))], 1, deck_size=2)
+        state.passes = 1
+        known = [[0] * NUM_TRACKED, [0] * NUM_TRACKED]
+        known[1][7] = 2
+        payload = pack_state(state, known)
+        assert len(payload) < 64
+        unpacked, unpacked_known = unpack_state(payload)
+        assert unpacked.deck == state.deck and unpacked.deck_size == 2
+        assert unpacked.hands == state.hands and unpacked.table == state.table
+        assert unpacked.current == 1 and unpacked.passes == 1
+        assert unpacked_known == known
+
+    def test_merge_sums_root_statistics(self):
+        draw, meld = Action(DRAW), Action(MELD, (1, 2, 3), meld_type='run')
+        iterations, visits, values = merge_results([
+            (10, ((tuple(draw), 6, 3.0), (tuple(meld), 4, 4.0))),
+            (8, ((tuple(draw), 2, 0.0), (tuple(meld), 6, 3.0))),
+        ])
+        assert iterations == 18
+        assert visits == {draw: 8, meld: 10}
+        assert values[meld] == pytest.approx(0.7)
+
+    def test_decision_is_legal_and_on_time(self, pool):
+        state = GameState.from_game(_dealt_game(3))
+        start = time.perf_counter()
+        result = pool.search(state, 0.2)
+        assert time.perf_counter() - start < 0.3
+        assert result.action in state.legal_actions()
+        assert result.iterations > 0 and sum(result.visits.values()) == result.iterations
+
+    def test_late_workers_are_dropped(self, pool):
+        # Workers that search past the budget miss it, the rollout policy decides
+        state = GameState.from_game(_dealt_game(4))
+        start = time.perf_counter()
+        result = pool.search(state, 0.05, margin=-3.0)
+        assert time.perf_counter() - start < 0.15
+        assert result.iterations == 0 and result.action in state.legal_actions()
+        # The next decision waits for the late workers and still searches
+        result = pool.search(state, 0.5)
+        assert result.iterations > 0 and pool.busy == 0
+
+    def test_tables_share_the_pool(self, pool):
+        # Two tables deciding at the same time, each on its share of the pool
+        iterations = {0: [], 1: []}
+        def table(seat):
+            strategy = ParallelISMCTS(time_budget=0.2, pool=pool, workers=1, seed=seat)
+            for seed in range(4):
+                state = GameState.from_game(_dealt_game(seed))
+                iterations[seat].append(strategy.search(state).iterations)
+        threads = [threading.Thread(target=table, args=(seat,)) for seat in iterations]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(count > 0 for counts in iterations.values() for count in counts)
+
+    def test_headless_game_with_parallel_player(self, pool):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=11)
+        game.players[0].strategy = ParallelISMCTS(time_budget=0.5, pool=pool, iterations=4, rollout_turns=2)
+        winner = game.play_headless_game()
+        assert winner in game.players
+        assert game.players[0].strategy.decisions > 0
+
+    def test_shared_pool_size_is_checked(self, monkeypatch):
+        monkeypatch.setattr(parallel, "_shared", None)
+        pool = parallel.shared_pool(1)
+        try:
+            assert parallel.shared_pool() is pool and parallel.shared_pool(1) is pool
+            with pytest.raises(ValueError):
+                parallel.shared_pool(2)
+            assert ParallelISMCTS(workers=4).workers == 1
+        finally:
+            pool.close()
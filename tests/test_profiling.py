@@ -0,0 +1,43 @@
+import io
+import json
+from app.profiling import TurnProfiler
+from app.rummy import RobbersRummy
+from app.simulation import play_headless_game
+
+class TestProfiling:
+    def test_profiled_games_play_the_same(self):
+        profiler = TurnProfiler()
+        assert [play_headless_game(seed, profiler=profiler) for seed in range(5)] == \
+            [play_headless_game(seed) for seed in range(5)]
+
+    def test_phases_and_counters(self):
+        profiler = TurnProfiler()
+        results = [play_headless_game(seed, profiler=profiler) for seed in range(10)]
+        snapshot = profiler.snapshot()
+        assert snapshot['turns'] == sum(result.turns for result in results)
+        phases = snapshot['phases']
+        assert phases['turn']['calls'] == snapshot['turns']
+        assert phases['ai_turn']['calls'] == snapshot['turns']
+        assert phases['integrity']['calls'] >= snapshot['turns']
+        assert phases['drawing']['calls'] == snapshot['counters']['draws']
+        assert all(stats['seconds'] >= 0 for stats in phases.values())
+        counters = snapshot['counters']
+        assert counters['games'] == 10 and counters['deals'] == 20
+        assert counters['melds_formed'] > 0
+
+    def test_exports_json_lines(self):
+        export = io.StringIO()
+        profiler = TurnProfiler(export, export_every=50)
+        play_headless_game(1, profiler=profiler)
+        lines = [json.loads(line) for line in export.getvalue().splitlines()]
+        assert len(lines) == profiler.turns // 50
+        assert [line['turns'] for line in lines] == [50 * (i + 1) for i in range(len(lines))]
+
+    def test_detach_restores_the_game(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=2)
+        profiler = TurnProfiler()
+        profiler.attach(game)
+        assert 'play_player_turn' in game.__dict__
+        profiler.detach(game)
+        assert 'play_player_turn' not in game.__dict__ and '_ai_rob' not in game.__dict__
+        assert game.events is None
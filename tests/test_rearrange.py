@@ -0,0 +1,128 @@
+import itertools
+import random
+from collections import Counter
+from app import rearrange as rearrange_module
+from app.catalog import find_meld
+from app.models.card import card_from_id
+from app.models.meld import Meld
+from app.rearrange import rearrange, fallback
+from app.rummy import RobbersRummy
+
+HEARTS, DIAMONDS, CLUBS, SPADES = range(4)
+
+def _key(suit, value):
+    return suit * 13 + value - 1
+
+def _check(table, hand, result):
+    # Every meld is valid, the table cards are all kept and only hand cards are added
+    table_keys = Counter(key for _, keys in table for key in keys)
+    used = Counter(key for _, keys in result.melds for key in keys)
+    assert all(find_meld(keys) is not None and find_meld(keys).type == meld_type for meld_type, keys in result.melds)
+    assert not table_keys - used
+    added = used - table_keys
+    assert sum(added.values()) == result.placed
+    assert not added - Counter(hand)
+
+class TestRearrange:
+    def test_extends_a_run(self):
+        table = [('run', (_key(HEARTS, 4), _key(HEARTS, 5), _key(HEARTS, 6)))]
+        hand = [_key(HEARTS, 7), _key(CLUBS, 1)]
+        result = rearrange(table, hand)
+        assert result.complete and result.placed == 1
+        _check(table, hand, result)
+
+    def test_breaks_up_table_melds(self):
+        # The 5 of hearts leaves the set for the run, the 5 of spades takes its place
+        table = [('set', (_key(HEARTS, 5), _key(DIAMONDS, 5), _key(CLUBS, 5))),
+                 ('run', (_key(HEARTS, 6), _key(HEARTS, 7), _key(HEARTS, 8)))]
+        hand = [_key(HEARTS, 3), _key(HEARTS, 4), _key(SPADES, 5), _key(CLUBS, 12)]
+        result = rearrange(table, hand)
+        assert result.placed == 3
+        _check(table, hand, result)
+        assert ('run', tuple(_key(HEARTS, value) for value in range(3, 9))) in result.melds
+
+    def test_nothing_to_place(self):
+        table = [('run', (_key(CLUBS, 1), _key(CLUBS, 2), _key(CLUBS, 3)))]
+        result = rearrange(table, [_key(SPADES, 9)])
+        assert result.complete and result.placed == 0
+        assert result.melds == tuple(table)
+
+    def test_budget_falls_back(self):
+        table = [('run', (_key(HEARTS, 4), _key(HEARTS, 5), _key(HEARTS, 6)))]
+        hand = [_key(DIAMONDS, 1), _key(DIAMONDS, 2), _key(DIAMONDS, 3), _key(HEARTS, 7)]
+        result = rearrange(table, hand, budget=0.0)
+        assert not result.complete
+        assert result == fallback(table, hand)
+        assert result.placed == 3
+
+    def test_budget_keeps_the_best_partition_found(self, monkeypatch):
+        table = [('set', (3, 16, 29, 42)), ('run', (45, 46, 47, 48, 49, 50, 51, 44, 43)), ('run', (41, 42, 43, 40, 39)),
+                 ('run', (30, 31, 32, 33, 34, 35, 36, 29, 28, 27, 26)), ('run', (36, 37, 38)),
+                 ('set', (11, 24, 50, 37)), ('run', (10, 11, 12, 9, 8, 7)), ('run', (22, 23, 24))]
+        hand = [15, 24, 34, 6, 36, 15, 0, 46, 13, 26]
+        best = rearrange(table, hand)
+        # Every look at the clock takes a second, the search stops at its second look
+        clock = itertools.count()
+        monkeypatch.setattr(rearrange_module.time, "perf_counter", lambda: next(clock))
+        result = rearrange(table, hand, budget=1.5)
+        assert not result.complete
+        _check(table, hand, result)
+        assert fallback(table, hand).placed < result.placed < best.placed
+
+    def test_node_budget_is_reproducible(self):
+        table = [('set', (3, 16, 29, 42)), ('run', (45, 46, 47, 48, 49, 50, 51, 44, 43)), ('run', (41, 42, 43, 40, 39)),
+                 ('run', (30, 31, 32, 33, 34, 35, 36, 29, 28, 27, 26)), ('run', (36, 37, 38)),
+                 ('set', (11, 24, 50, 37)), ('run', (10, 11, 12, 9, 8, 7)), ('run', (22, 23, 24))]
+        hand = [15, 24, 34, 6, 36, 15, 0, 46, 13, 26]
+        result = rearrange(table, hand, max_nodes=50)
+        assert not result.complete
+        _check(table, hand, result)
+        assert result == rearrange(table, hand, max_nodes=50)
+        assert rearrange(table, hand, max_nodes=10 ** 6).complete
+
+    def test_random_tables(self):
+        rng = random.Random(5)
+        for seed in range(6):
+            game = RobbersRummy(num_players=0, num_ai_players=4, headless=True, seed=seed)
+            game.all_cards = game.create_deck()
+            game.original_deck = game.all_cards.copy()
+            game.deal_initial_hand()
+            game._open_ledger()
+            while not game.is_game_over() and len(game.all_melds) < 8:
+                game.play_player_turn(game.next_player())
+            table = [(meld.type, tuple(card.key for card in meld.cards)) for meld in game.all_melds]
+            hand = [rng.randrange(52) for _ in range(rng.randint(3, 12))]
+            result = rearrange(table, hand)
+            assert result.complete
+            _check(table, hand, result)
+            assert result.placed >= fallback(table, hand).placed
+
+    def test_ai_rearranges_the_table(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1, seed=1)
+        game.all_cards = game.create_deck()
+        game.original_deck = game.all_cards.copy()
+        game.deal_initial_hand()
+        ai = game.players[1]
+        # Move the cards of the test case from wherever they are to the table and the AI hand
+        table_ids = [_key(HEARTS, 5), _key(DIAMONDS, 5), _key(CLUBS, 5), _key(HEARTS, 6), _key(HEARTS, 7), _key(HEARTS, 8)]
+        hand_ids = [_key(HEARTS, 3), _key(HEARTS, 4), _key(SPADES, 5)]
+        for card_id in table_ids + hand_ids:
+            card = card_from_id(card_id)
+            for holder in [game.all_cards] + [player.hand for player in game.players]:
+                if card in holder:
+                    holder.remove(card)
+        game.all_cards.extend(ai.hand)
+        ai.hand = [card_from_id(card_id) for card_id in hand_ids]
+        game.all_melds = [Meld([card_from_id(card_id) for card_id in table_ids[:3]], 'set'),
+                          Meld([card_from_id(card_id) for card_id in table_ids[3:]], 'run')]
+        game.original_deck = game.all_cards + [card for player in game.players for card in player.hand] + \
+            [card for meld in game.all_melds for card in meld.cards]
+        game._open_ledger()
+
+        assert game._ai_rearrange_melds(ai)
+        assert ai.hand == []
+        assert len(game.all_melds) == 2
+        assert all(game._is_valid_run(meld.cards) if meld.type == 'run' else game._is_valid_set(meld.cards)
+                   for meld in game.all_melds)
+        assert game.ledger.matches(len(game.all_cards), game.all_melds.card_count, game._hand_sizes())
+        assert game.check_game_integrity()
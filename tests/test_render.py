@@ -0,0 +1,96 @@
+import io
+import pytest
+from rich.console import Console
+from app.models.card import card_from_id
+from app.models.meld import Meld
+from app.render import NullRenderer, Renderer, RichRenderer
+from app.rummy import RobbersRummy
+
+def _renderer(**kwargs):
+    output = io.StringIO()
+    return RichRenderer(Console(file=output, force_terminal=False, width=200), **kwargs), output
+
+def _dealt_game(renderer):
+    game = RobbersRummy(num_players=1, num_ai_players=1, seed=3, renderer=renderer)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game
+
+class TestRender:
+    def test_headless_games_use_null_renderer(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True)
+        assert isinstance(game.renderer, NullRenderer)
+        assert not game.renderer.active
+
+    def test_card_markup_is_cached(self):
+        renderer, _ = _renderer()
+        card = card_from_id(5)
+        assert renderer.card(card) is renderer.card(card)
+        assert renderer.card(card).startswith("[red]")
+
+    def test_renderers_implement_every_method(self):
+        class Partial(Renderer):
+            def message(self, text):
+                pass
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_game_state_reuses_unchanged_melds(self):
+        renderer, output = _renderer()
+        game = _dealt_game(renderer)
+        game.all_melds = [Meld([card_from_id(2), card_from_id(0), card_from_id(1)], 'run')]
+        renderer.game_state(game, game.players[0])
+        lines = dict(renderer._melds)
+        renderer.game_state(game, game.players[0])
+        assert renderer._melds == lines and len(lines) == 1
+        assert "Melds:" in output.getvalue()
+        assert "Player 1" in output.getvalue()
+
+        game.all_melds.extend_meld(game.all_melds[0], card_from_id(3))
+        renderer.game_state(game, game.players[0])
+        assert len(renderer._melds) == 2
+
+    def test_only_ai_turns_show_changed_melds(self):
+        renderer, output = _renderer()
+        game = _dealt_game(renderer)
+        ai = game.players[1]
+        game.all_melds = [Meld([card_from_id(0), card_from_id(1), card_from_id(2)], 'run'),
+                          Meld([card_from_id(4), card_from_id(17), card_from_id(30)], 'set')]
+        renderer.game_state(game, game.players[0])
+        assert output.getvalue().count("  run: ") == 1 and output.getvalue().count("  set: ") == 1
+
+        game.all_melds.extend_meld(game.all_melds[1], card_from_id(43))
+        output.truncate(0)
+        output.seek(0)
+        renderer.ai_turn(game, ai)
+        text = output.getvalue()
+        assert "  run: " not in text and "  2  set: " in text
+        assert "1 unchanged" in text
+
+        # Humans pick melds by number, they always see the whole table
+        output.truncate(0)
+        output.seek(0)
+        renderer.game_state(game, game.players[0])
+        text = output.getvalue()
+        assert "  1  run: " in text and "  2  set: " in text
+        assert "unchanged" not in text
+
+    def test_ai_turns_are_throttled(self):
+        now = [0.0]
+        renderer, output = _renderer(min_interval=1.0, clock=lambda: now[0])
+        game = _dealt_game(renderer)
+        ai = game.players[1]
+
+        renderer.ai_turn(game, ai)
+        renderer.message("first")
+        now[0] = 0.5
+        renderer.ai_turn(game, ai)
+        renderer.message("second")
+        now[0] = 1.5
+        renderer.ai_turn(game, ai)
+        renderer.message("third")
+
+        text = output.getvalue()
+        assert text.count("Current player's name: AI 1") == 2
+        assert "first" in text and "second" not in text and "third" in text
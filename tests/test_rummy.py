@@ -53,8 +53,8 @@ class TestRummyGame:
             Card(Suit.HEARTS, 1, 0),
             Card(Suit.HEARTS, 2, 1),
             Card(Suit.HEARTS, 3, 2),
-            Card(Suit.HEARTS, 5, 3),
-            Card(Suit.HEARTS, 6, 4),
+            Card(Suit.HEARTS, 5, 56),
+            Card(Suit.HEARTS, 6, 5),
         ]
         assert game._is_valid_run(cards) == False
 
@@ -66,15 +66,15 @@ class TestRummyGame:
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.HEARTS, 1, 1),
-            Card(Suit.HEARTS, 2, 2)
+            Card(Suit.HEARTS, 1, 52),
+            Card(Suit.HEARTS, 2, 53)
         ]
         assert game._is_valid_run(cards) == False
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
             Card(Suit.HEARTS, 2, 1),
-            Card(Suit.DIAMONDS, 3, 2),
+            Card(Suit.DIAMONDS, 3, 15),
             Card(Suit.HEARTS, 4, 3),
         ]
         assert game._is_valid_run(cards) == False
@@ -83,44 +83,44 @@ class TestRummyGame:
         game = RobbersRummy(num_players=1, num_ai_players=1)
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.DIAMONDS, 1, 1),
-            Card(Suit.CLUBS, 1, 2),
+            Card(Suit.DIAMONDS, 1, 13),
+            Card(Suit.CLUBS, 1, 26),
         ]
         assert game._is_valid_set(cards) == True
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.HEARTS, 1, 1),
-            Card(Suit.CLUBS, 1, 2),
+            Card(Suit.HEARTS, 1, 52),
+            Card(Suit.CLUBS, 1, 26),
         ]
         assert game._is_valid_set(cards) == False
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.DIAMONDS, 1, 1),
-            Card(Suit.CLUBS, 2, 2),
+            Card(Suit.DIAMONDS, 1, 13),
+            Card(Suit.CLUBS, 2, 27),
         ]
         assert game._is_valid_set(cards) == False
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.DIAMONDS, 1, 1),
+            Card(Suit.DIAMONDS, 1, 13),
         ]
         assert game._is_valid_set(cards) == False
 
         cards = [
             Card(Suit.HEARTS, 1, 0),
-            Card(Suit.DIAMONDS, 2, 1),
-            Card(Suit.CLUBS, 3, 2),
+            Card(Suit.DIAMONDS, 2, 14),
+            Card(Suit.CLUBS, 3, 28),
         ]
         assert game._is_valid_set(cards) == False
 
     def test_find_robbable_melds_run_happy_postfix(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3)], 'run'),
-                          Meld([Card(Suit.HEARTS, 5, 5),Card(Suit.HEARTS, 6, 6),Card(Suit.HEARTS, 7, 7)], 'run') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54)], 'run'),
+                          Meld([Card(Suit.HEARTS, 5, 108),Card(Suit.HEARTS, 6, 57),Card(Suit.HEARTS, 7, 6)], 'run') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.HEARTS, 4, 4))        
+        melds = game.find_robbable_melds(Card(Suit.HEARTS, 4, 55))        
         assert len(melds) == 1
         assert len(melds[0].cards) == 3
 
@@ -134,58 +134,58 @@ class TestRummyGame:
 
     def test_find_robbable_melds_run_same_number(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3)], 'run') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54)], 'run') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.HEARTS, 3, 4))        
+        melds = game.find_robbable_melds(Card(Suit.HEARTS, 3, 106))        
         assert len(melds) == 0
 
     def test_find_robbable_melds_run_wrong_color(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3)], 'run') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54)], 'run') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.DIAMONDS, 4, 4))        
+        melds = game.find_robbable_melds(Card(Suit.DIAMONDS, 4, 16))        
         assert len(melds) == 0
 
     def test_find_robbable_melds_run_wrong_number(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3)], 'run') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54)], 'run') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.HEARTS, 5, 5))        
+        melds = game.find_robbable_melds(Card(Suit.HEARTS, 5, 108))        
         assert len(melds) == 0
 
     def test_find_robbable_melds_set_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 2),Card(Suit.CLUBS, 2, 3)], 'set'),
-                          Meld([Card(Suit.HEARTS, 2, 10),Card(Suit.DIAMONDS, 2, 11),Card(Suit.CLUBS, 2, 12)], 'set') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 66),Card(Suit.CLUBS, 2, 79)], 'set'),
+                          Meld([Card(Suit.HEARTS, 2, 105),Card(Suit.DIAMONDS, 2, 118),Card(Suit.CLUBS, 2, 131)], 'set') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.SPADES, 2, 4))        
+        melds = game.find_robbable_melds(Card(Suit.SPADES, 2, 40))        
         assert len(melds) == 1
         assert len(melds[0].cards) == 3
 
     def test_find_robbable_melds_set_same_color(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 2),Card(Suit.CLUBS, 2, 3)], 'set') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 66),Card(Suit.CLUBS, 2, 79)], 'set') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.CLUBS, 2, 4))        
+        melds = game.find_robbable_melds(Card(Suit.CLUBS, 2, 183))        
         assert len(melds) == 0
 
     def test_find_robbable_melds_set_wrong_number(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 2),Card(Suit.CLUBS, 2, 3)], 'set') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 66),Card(Suit.CLUBS, 2, 79)], 'set') ]
         assert len(game.all_melds[0].cards) == 3
-        melds = game.find_robbable_melds(Card(Suit.SPADES, 3, 4))        
+        melds = game.find_robbable_melds(Card(Suit.SPADES, 3, 41))        
         assert len(melds) == 0
 
     def test_find_robbable_melds_set_same_number(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 2),Card(Suit.CLUBS, 2, 3),Card(Suit.SPADES, 2, 4)], 'set') ]
+        game.all_melds = [ Meld([Card(Suit.HEARTS, 2, 1),Card(Suit.DIAMONDS, 2, 66),Card(Suit.CLUBS, 2, 79),Card(Suit.SPADES, 2, 40)], 'set') ]
         assert len(game.all_melds[0].cards) == 4
-        melds = game.find_robbable_melds(Card(Suit.SPADES, 2, 5))        
+        melds = game.find_robbable_melds(Card(Suit.SPADES, 2, 92))        
         assert len(melds) == 0
 
     def test_try_form_melds_suit_group_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.CLUBS, 5, 5)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54),Card(Suit.CLUBS, 4, 29),Card(Suit.CLUBS, 5, 30)]
         value_groups, suit_groups = game.try_form_melds(game.players[1], clear=False)
         assert len(suit_groups) == 2
         assert len(value_groups) == 5
@@ -200,7 +200,7 @@ class TestRummyGame:
 
     def test_try_form_melds_value_group_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.CLUBS, 1, 2),Card(Suit.DIAMONDS, 1, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.CLUBS, 5, 5)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.CLUBS, 1, 26),Card(Suit.DIAMONDS, 1, 65),Card(Suit.CLUBS, 4, 29),Card(Suit.CLUBS, 5, 30)]
         value_groups, suit_groups = game.try_form_melds(game.players[1], clear=False)
         assert len(suit_groups) == 3
         assert len(value_groups) == 3
@@ -221,7 +221,7 @@ class TestRummyGame:
 
     def test_ai_arrange_set_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.CLUBS, 1, 2),Card(Suit.DIAMONDS, 1, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.CLUBS, 5, 5)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.CLUBS, 1, 26),Card(Suit.DIAMONDS, 1, 65),Card(Suit.CLUBS, 4, 29),Card(Suit.CLUBS, 5, 30)]
         value_groups, _ = game.try_form_melds(game.players[1], clear=False)
         assert len(game.players[1].hand) == 5
         arranged = game.ai_arrange_set(game.players[1], value_groups)
@@ -233,7 +233,7 @@ class TestRummyGame:
 
     def test_ai_arrange_2_set_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.CLUBS, 1, 2),Card(Suit.DIAMONDS, 1, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.DIAMONDS, 5, 5),Card(Suit.HEARTS, 5, 6),Card(Suit.SPADES, 5, 7)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.CLUBS, 1, 26),Card(Suit.DIAMONDS, 1, 65),Card(Suit.CLUBS, 4, 29),Card(Suit.DIAMONDS, 5, 17),Card(Suit.HEARTS, 5, 160),Card(Suit.SPADES, 5, 43)]
         value_groups, _ = game.try_form_melds(game.players[1], clear=False)
         assert len(game.players[1].hand) == 7
         arranged = game.ai_arrange_set(game.players[1], value_groups)
@@ -245,7 +245,7 @@ class TestRummyGame:
 
     def test_ai_arrange_run_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.CLUBS, 5, 5)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54),Card(Suit.CLUBS, 4, 29),Card(Suit.CLUBS, 5, 30)]
         _, suit_groups = game.try_form_melds(game.players[1], clear=False)
         assert len(game.players[1].hand) == 5
         arranged = game.ai_arrange_run(game.players[1], suit_groups)
@@ -258,7 +258,7 @@ class TestRummyGame:
 
     def test_ai_arrange_2_run_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 1, 1),Card(Suit.HEARTS, 2, 2),Card(Suit.HEARTS, 3, 3),Card(Suit.CLUBS, 4, 4),Card(Suit.CLUBS, 5, 5),Card(Suit.CLUBS, 6, 6),Card(Suit.DIAMONDS, 7, 7)]
+        game.players[1].hand = [Card(Suit.HEARTS, 1, 52),Card(Suit.HEARTS, 2, 53),Card(Suit.HEARTS, 3, 54),Card(Suit.CLUBS, 4, 29),Card(Suit.CLUBS, 5, 30),Card(Suit.CLUBS, 6, 31),Card(Suit.DIAMONDS, 7, 19)]
         _, suit_groups = game.try_form_melds(game.players[1], clear=False)
         assert len(game.players[1].hand) == 7
         arranged = game.ai_arrange_run(game.players[1], suit_groups)
@@ -270,7 +270,7 @@ class TestRummyGame:
 
     def test_ai_arrange_2_overlapped_run_happy(self):
         game = RobbersRummy(num_players=1, num_ai_players=1)
-        game.players[1].hand = [Card(Suit.HEARTS, 4, 4),Card(Suit.HEARTS, 5, 5),Card(Suit.HEARTS, 6, 6),Card(Suit.HEARTS, 7, 7),Card(Suit.HEARTS, 12, 12)]
+        game.players[1].hand = [Card(Suit.HEARTS, 4, 55),Card(Suit.HEARTS, 5, 108),Card(Suit.HEARTS, 6, 57),Card(Suit.HEARTS, 7, 6),Card(Suit.HEARTS, 12, 11)]
         _, suit_groups = game.try_form_melds(game.players[1], clear=False)
         assert len(game.players[1].hand) == 5
         arranged = game.ai_arrange_run(game.players[1], suit_groups)
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+from app.selfplay import FEATURES, SAMPLE, SelfPlayRecorder, ShardReader, ShardWriter, features, generate
+from app.simulation import play_headless_game
+
+class TestSelfPlay:
+    def test_samples_of_a_game(self, tmp_path):
+        with ShardWriter(str(tmp_path), shard_records=64, buffer_records=16) as writer:
+            recorder = SelfPlayRecorder(writer)
+            result = play_headless_game(seed=3, num_ai_players=3, recorder=recorder)
+        assert writer.games == 1
+        samples = np.concatenate(ShardReader(str(tmp_path)).shards)
+        assert len(samples) == writer.samples
+        # One sample per turn, every seat in turn order
+        assert list(samples['seat'][:6]) == [0, 1, 2, 0, 1, 2]
+        assert np.all(samples['won'] == (samples['seat'] == result.winner))
+        assert np.all(samples['score'] == np.array(result.scores)[samples['seat']])
+        first = samples[0]
+        assert first['hand'].sum() == 14 and first['table'].sum() == 0
+        assert first['deck'] == 104 - 3 * 14
+        assert list(first['opponents']) == [14, 14, 0]
+        # A turn that moved without drawing played cards from the hand
+        moved = (samples['kinds'] != 0) & (samples['kinds'] & (1 << 2) == 0)
+        assert np.all(samples['played'][moved].sum(axis=1) > 0)
+
+    def test_jokers_are_counted(self, tmp_path):
+        with ShardWriter(str(tmp_path), shard_records=64, buffer_records=16) as writer:
+            play_headless_game(seed=1, num_ai_players=3, recorder=SelfPlayRecorder(writer), num_jokers=6)
+        samples = np.concatenate(ShardReader(str(tmp_path)).shards)
+        assert np.all(samples['hand'][:3].sum(axis=1) == 14)
+        # Jokers come last, in hands or on the table
+        assert samples['hand'][:, -1].any() or samples['table'][:, -1].any()
+
+    def test_shards_stay_bounded(self, tmp_path):
+        with ShardWriter(str(tmp_path), shard_records=100, buffer_records=30) as writer:
+            writer.write(np.zeros(250, dtype=SAMPLE))
+        sizes = sorted(os.path.getsize(tmp_path / name) // SAMPLE.itemsize for name in os.listdir(tmp_path))
+        assert sizes == [50, 100, 100]
+
+    def test_generate_and_read_minibatches(self, tmp_path):
+        games, samples = generate(str(tmp_path), 6, master_seed=1, workers=1, games_per_chunk=4, shard_records=200)
+        assert games == 6
+        reader = ShardReader(str(tmp_path))
+        assert len(reader) == samples
+        batches = list(reader.minibatches(64, seed=0, shards_per_block=2))
+        assert all(len(batch) == 64 for batch in batches[:-1])
+        seen = np.concatenate(batches)
+        assert len(seen) == samples
+        everything = np.concatenate(reader.shards)
+        # Every sample exactly once, in a different order
+        assert sorted(seen.tobytes()[i:i + SAMPLE.itemsize] for i in range(0, seen.nbytes, SAMPLE.itemsize)) == \
+            sorted(everything.tobytes()[i:i + SAMPLE.itemsize] for i in range(0, everything.nbytes, SAMPLE.itemsize))
+        assert not np.array_equal(seen, everything)
+        assert features(batches[0]).shape == (64, FEATURES)
+        # Games are numbered across chunks
+        assert sorted(set(everything['game'])) == list(range(6))
+        # Same seed, same batches
+        assert np.array_equal(next(reader.minibatches(64, seed=0, shards_per_block=2)), batches[0])
@@ -0,0 +1,143 @@
+import asyncio
+from app.server import GameServer
+
+async def _request(reader, writer, line):
+    writer.write(line.encode() + b"\n")
+    await writer.drain()
+    return (await reader.readline()).decode().strip()
+
+async def _read_block(reader):
+    lines = []
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if line == "END":
+            return lines
+        lines.append(line)
+
+async def _play_table(port, seed, first_move, pipelined=""):
+    # A client that plays its first legal move (or draws) until the game ends,
+    # pipelined commands are sent on its first turn before anything else
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    reply = await _request(reader, writer, f"NEW 1 {seed}")
+    table_id = reply.split()[-1]
+    assert await _request(reader, writer, f"JOIN {table_id} Tester") == "OK SEAT 0"
+    events = 0
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if line.startswith("OVER"):
+            writer.close()
+            return line, events
+        if line.startswith("EVENT"):
+            events += 1
+        if line == "YOUR_TURN" and pipelined:
+            writer.write(pipelined.encode())
+            pipelined = ""
+        elif line == "YOUR_TURN":
+            writer.write(b"ACTIONS\n")
+            await writer.drain()
+            actions = []
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if line == "END":
+                    break
+                if line.startswith("ACTION"):
+                    actions.append(line.split(maxsplit=2))
+            choice = first_move(actions)
+            writer.write(f"PLAY {choice}\n".encode())
+            await writer.drain()
+
+def _prefer_draw(actions):
+    # Melds first, then draw, end the turn when nothing else is left
+    by_kind = {}
+    for _, index, text in actions:
+        by_kind.setdefault(text.split()[0], index)
+    return by_kind.get("meld") or by_kind.get("draw") or by_kind["end_turn"]
+
+class TestServer:
+    def test_protocol_errors_and_state(self):
+        async def scenario():
+            server = GameServer(port=0, ai_workers=1, ai_time_budget=0.02)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert (await _request(reader, writer, "STATE")).startswith("ERR")
+            assert (await _request(reader, writer, "JOIN 99 x")).startswith("ERR")
+            assert await _request(reader, writer, "NEW 2 5") == "OK TABLE 1"
+            assert await _request(reader, writer, "JOIN 1 Ann") == "OK SEAT 0"
+            # The AI searches on the server's worker processes
+            assert server.tables[1].game.players[-1].strategy.pool is server.pool
+            # The second seat is still free, so the game has not started
+            assert (await _request(reader, writer, "PLAY 0")).startswith("ERR")
+            # Cards are dealt when play starts
+            assert await _request(reader, writer, "STATE") == "HAND"
+            assert await _read_block(reader) == ["DECK 0"]
+            writer.close()
+            await server.close()
+        asyncio.run(scenario())
+
+    def test_many_tables_play_to_the_end(self):
+        async def scenario():
+            server = GameServer(port=0, ai_workers=2, ai_time_budget=0.02)
+            port = await server.start()
+            results = await asyncio.wait_for(
+                asyncio.gather(*(_play_table(port, seed, _prefer_draw) for seed in range(8))), 60)
+            await server.close()
+            return results
+        results = asyncio.run(scenario())
+        assert len(results) == 8
+        for over, events in results:
+            assert over.startswith("OVER") and events > 0
+
+    def test_tables_are_removed(self):
+        async def scenario():
+            server = GameServer(port=0, ai_workers=1, ai_time_budget=0.02)
+            port = await server.start()
+            over, _ = await asyncio.wait_for(_play_table(port, 3, _prefer_draw), 30)
+            assert over.startswith("OVER")
+            assert server.tables == {}
+            # The last client leaves in the middle of a game
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert await _request(reader, writer, "NEW 1 4") == "OK TABLE 2"
+            assert await _request(reader, writer, "JOIN 2 Ann") == "OK SEAT 0"
+            task = server.tables[2].task
+            writer.write(b"QUIT\n")
+            await writer.drain()
+            await asyncio.wait_for(asyncio.wait([task]), 10)
+            assert server.tables == {}
+            await server.close()
+        asyncio.run(scenario())
+
+    def test_moves_are_checked_when_applied(self):
+        async def scenario():
+            server = GameServer(port=0, ai_workers=1, ai_time_budget=0.02)
+            port = await server.start()
+            # Action 2 of seed 0 is a meld, played twice before the table gets to it
+            result = await asyncio.wait_for(
+                _play_table(port, 0, _prefer_draw, pipelined="PLAY 2\nACTIONS\nPLAY 2\n"), 30)
+            await server.close()
+            return result
+        over, events = asyncio.run(scenario())
+        assert over.startswith("OVER") and events > 0
+
+    def test_failing_table_is_aborted(self):
+        async def scenario():
+            server = GameServer(port=0, ai_workers=1, ai_time_budget=0.02)
+            port = await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert await _request(reader, writer, "NEW 1 0") == "OK TABLE 1"
+            def broken(player, action):
+                raise RuntimeError("broken table")
+            server.tables[1].game.apply_action = broken
+            assert await _request(reader, writer, "JOIN 1 Ann") == "OK SEAT 0"
+            lines = []
+            while not lines or not lines[-1].startswith("ABORT"):
+                line = (await reader.readline()).decode().strip()
+                if line == "YOUR_TURN":
+                    writer.write(b"PLAY 0\n")
+                lines.append(line)
+            # The server still hosts other tables
+            assert await _request(reader, writer, "NEW 1") == "OK TABLE 2"
+            writer.close()
+            await server.close()
+            return lines
+        lines = asyncio.run(scenario())
+        assert lines[-1] == "ABORT broken table"
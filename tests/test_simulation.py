@@ -0,0 +1,33 @@
+import pytest
+from app.rummy import RobbersRummy
+from app.simulation import play_headless_game
+
+class TestHeadlessGame:
+    def test_headless_requires_ai_only_seats(self):
+        with pytest.raises(ValueError):
+            RobbersRummy(num_players=1, num_ai_players=1, headless=True)
+        with pytest.raises(ValueError):
+            RobbersRummy(num_players=0, num_ai_players=1, headless=True)
+        game = RobbersRummy(num_players=0, num_ai_players=4, headless=True)
+        assert len(game.players) == 4
+        assert all(player.is_ai for player in game.players)
+
+    def test_play_headless_game(self):
+        result = play_headless_game(seed=7, num_ai_players=3)
+        assert result.seed == 7
+        assert 0 <= result.winner < 3
+        assert len(result.scores) == 3
+        assert result.turns > 0
+        if result.went_out:
+            assert result.scores[result.winner] == 0
+        else:
+            assert result.cards_left == 0
+            assert result.scores[result.winner] == min(result.scores)
+
+    def test_play_headless_game_is_reproducible(self):
+        assert play_headless_game(seed=42) == play_headless_game(seed=42)
+
+    def test_headless_game_prints_nothing(self, capsys):
+        play_headless_game(seed=3)
+        captured = capsys.readouterr()
+        assert captured.out == ""
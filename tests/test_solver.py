@@ -0,0 +1,60 @@
+import random
+from app.models.suit import Suit
+from app.models.card import Card, card_from_id
+from app.rummy import RobbersRummy
+from app.solver import best_partition, hand_signature, meldable_signature, solve_signature, _solve
+
+def _brute_force(cards, game):
+    # Most cards melded by trying every valid meld with the first card
+    if not cards:
+        return 0
+    best = _brute_force(cards[1:], game)
+    first, rest = cards[0], cards[1:]
+    n = len(rest)
+    for mask in range(1, 1 << n):
+        group = [first] + [rest[i] for i in range(n) if mask >> i & 1]
+        if len(group) >= 3 and (game._is_valid_run(group) or game._is_valid_set(group)):
+            remaining = [rest[i] for i in range(n) if not mask >> i & 1]
+            best = max(best, len(group) + _brute_force(remaining, game))
+    return best
+
+class TestSolver:
+    def test_set_does_not_destroy_longer_run(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        hand = [Card(Suit.HEARTS, 3, 2), Card(Suit.HEARTS, 4, 3), Card(Suit.HEARTS, 5, 4),
+                Card(Suit.HEARTS, 6, 5), Card(Suit.CLUBS, 6, 31), Card(Suit.SPADES, 6, 44),
+                Card(Suit.CLUBS, 7, 32), Card(Suit.CLUBS, 8, 33)]
+        melds = best_partition(hand)
+        assert sum(len(meld.cards) for meld in melds) == 7
+        for meld in melds:
+            assert game._is_valid_run(meld.cards) if meld.type == 'run' else game._is_valid_set(meld.cards)
+        melded = [card for meld in melds for card in meld.cards]
+        assert len(set(melded)) == len(melded)
+        assert Card(Suit.SPADES, 6, 44) not in melded
+
+    def test_two_runs_in_one_suit(self):
+        hand = [Card(Suit.DIAMONDS, value, 13 + value - 1) for value in (1, 2, 3, 5, 6, 7, 8)]
+        melds = best_partition(hand)
+        assert sorted(len(meld.cards) for meld in melds) == [3, 4]
+
+    def test_unmeldable_cards_are_dropped(self):
+        hand = [Card(Suit.HEARTS, 1, 0), Card(Suit.HEARTS, 2, 1), Card(Suit.CLUBS, 9, 34)]
+        assert meldable_signature(hand_signature(hand)) == 0
+        assert best_partition(hand) == []
+
+    def test_matches_brute_force(self):
+        game = RobbersRummy(num_players=1, num_ai_players=1)
+        rng = random.Random(3)
+        for _ in range(40):
+            # Small decks of few values make melds likely
+            ids = [suit * 13 + value + copy * 52 for suit in range(4) for value in range(4) for copy in range(2)]
+            hand = [card_from_id(card_id) for card_id in rng.sample(ids, 10)]
+            melds = best_partition(hand)
+            assert sum(len(meld.cards) for meld in melds) == _brute_force(hand, game)
+
+    def test_repeated_hands_hit_the_cache(self):
+        hand = [Card(Suit.SPADES, value, 39 + value - 1) for value in (9, 10, 11, 12)]
+        solve_signature(hand_signature(hand))
+        before = _solve.cache_info().hits
+        best_partition(hand)
+        assert _solve.cache_info().hits > before
@@ -0,0 +1,69 @@
+import random
+from app.moves import DRAW, END_TURN
+from app.rummy import RobbersRummy
+from app.state import GameState
+
+def _snapshot(state: GameState):
+    return (state.deck_size, [hand[:] for hand in state.hands], state.table[:], state.current, state.acted, state.passes)
+
+def _dealt_state(seed: int) -> GameState:
+    game = RobbersRummy(num_players=0, num_ai_players=3, headless=True, seed=seed)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return GameState.from_game(game)
+
+def _random_action(state: GameState, rng: random.Random):
+    actions = state.legal_actions()
+    moves = [action for action in actions if action.kind != END_TURN] or actions
+    return rng.choice(moves)
+
+class TestGameState:
+    def test_undo_restores_every_step(self):
+        state = _dealt_state(4)
+        rng = random.Random(1)
+        snapshots = []
+        for _ in range(200):
+            if state.is_over():
+                break
+            snapshots.append(_snapshot(state))
+            state.apply(_random_action(state, rng))
+            # Cards are conserved
+            assert state.deck_size + sum(len(hand) for hand in state.hands) + sum(len(meld[1]) for meld in state.table) == 104
+        while snapshots:
+            state.undo()
+            assert _snapshot(state) == snapshots.pop()
+        assert state.undo_stack == []
+
+    def test_clone_is_independent(self):
+        state = _dealt_state(8)
+        clone = state.clone()
+        assert clone.deck is state.deck
+        rng = random.Random(2)
+        for _ in range(30):
+            if clone.is_over():
+                break
+            clone.apply(_random_action(clone, rng))
+        assert _snapshot(state) == _snapshot(_dealt_state(8))
+
+    def test_from_game_matches_game(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=9)
+        game.play_headless_game()
+        state = GameState.from_game(game)
+        assert state.deck_size == len(game.all_cards)
+        assert [state.score(seat) for seat in range(2)] == [player.calculate_score() for player in game.players]
+        assert state.winner() == game.players.index(game.winner())
+
+    def test_from_game_carries_the_turn_over(self):
+        game = RobbersRummy(num_players=0, num_ai_players=2, headless=True, seed=4)
+        game.all_cards = game.create_deck()
+        game.original_deck = game.all_cards.copy()
+        game.deal_initial_hand()
+        game._open_ledger()
+        player = game.next_player()
+        game.passes = 1
+        assert not GameState.from_game(game).acted
+        action = next(action for action in game.legal_actions(player) if action.kind not in (DRAW, END_TURN))
+        game.apply_action(player, action)
+        state = GameState.from_game(game)
+        assert state.acted and state.passes == 1
@@ -0,0 +1,22 @@
+from app.simulation import play_headless_game
+from app.tournament import derive_game_seed, run_tournament, summarize_tournament
+
+class TestTournament:
+    def test_derive_game_seed(self):
+        assert derive_game_seed(1, 0) == derive_game_seed(1, 0)
+        assert derive_game_seed(1, 0) != derive_game_seed(1, 1)
+        assert derive_game_seed(1, 0) != derive_game_seed(2, 0)
+
+    def test_results_do_not_depend_on_workers(self):
+        serial = list(run_tournament(12, master_seed=5, workers=1, chunk_size=5))
+        parallel = list(run_tournament(12, master_seed=5, workers=2, chunk_size=5))
+        assert serial == parallel
+        assert len(serial) == 12
+        assert serial[3] == play_headless_game(derive_game_seed(5, 3))
+
+    def test_summarize_tournament(self):
+        summary = summarize_tournament(6, master_seed=9, num_ai_players=3, workers=1)
+        assert summary.games == 6
+        assert sum(summary.wins) == 6
+        assert len(summary.average_scores()) == 3
+        assert abs(sum(summary.win_rates()) - 1.0) < 1e-9
@@ -0,0 +1,106 @@
+import random
+import numpy as np
+from app import eventlog
+from app.ismcts import determinize
+from app.models.card import NUM_KEYS, card_key
+from app.rummy import RobbersRummy
+from app.state import GameState
+from app.tracker import CardTracker, NUM_TRACKED, track_ai_players
+
+def _dealt_game(seed, **kwargs):
+    game = RobbersRummy(num_players=0, num_ai_players=3, headless=True, seed=seed, **kwargs)
+    trackers = track_ai_players(game)
+    game.all_cards = game.create_deck()
+    game.original_deck = game.all_cards.copy()
+    game.deal_initial_hand()
+    return game, trackers
+
+def _hidden_counts(game, tracker):
+    # Copies of each key in the deck and the opponents' hands that the tracker can't know of
+    counts = [0] * NUM_TRACKED
+    for card in game.all_cards:
+        counts[card.key] += 1
+    for seat, player in enumerate(game.players):
+        if seat != tracker.seat:
+            for card in player.hand:
+                counts[card.key] += 1
+            counts = [count - known for count, known in zip(counts, tracker.known[seat])]
+    return counts
+
+class TestCardTracker:
+    def test_deal(self):
+        game, trackers = _dealt_game(1, num_jokers=2)
+        tracker = trackers[0]
+        assert tracker.deck_size == len(game.all_cards)
+        assert tracker.hand_sizes == [14, 14, 14]
+        assert sum(tracker.known[0]) == 14 and sum(tracker.known[1]) == 0
+        assert sum(tracker.unseen) == len(game.all_cards) + 28
+        assert tracker.unseen == _hidden_counts(game, tracker)
+
+    def test_matches_game_every_turn(self):
+        game, trackers = _dealt_game(4, num_decks=3, num_jokers=4)
+        game._open_ledger()
+        while not game.is_game_over():
+            game.play_player_turn(game.next_player())
+            for tracker in trackers:
+                assert tracker.unseen == _hidden_counts(game, tracker)
+                assert tracker.hand_sizes == [len(player.hand) for player in game.players]
+                assert tracker.deck_size == len(game.all_cards)
+
+    def test_robbed_cards_are_known(self):
+        tracker = CardTracker(0, 2)
+        tracker.observe(eventlog.DEAL, 1, [5, 6, 7])
+        tracker.observe(eventlog.MELD, 1, [5, 6, 7])
+        assert tracker.remaining(5) == 1
+        tracker.observe(eventlog.ROB, 1, [5, 6, 7])
+        assert tracker.known[1][5] == 1 and tracker.hidden(1) == 0
+        assert tracker.in_hand(1)[5] == 1.0
+        tracker.observe(eventlog.MELD, 1, [5, 6, 7])
+        assert tracker.remaining(5) == 1 and tracker.table[5] == 1
+
+    def test_repartition_reuses_table_cards(self):
+        tracker = CardTracker(0, 2)
+        tracker.observe(eventlog.DEAL, 1, [0, 1, 2, 3])
+        tracker.observe(eventlog.MELD, 1, [0, 1, 2])
+        tracker.observe(eventlog.REPARTITION, 1)
+        tracker.observe(eventlog.MELD, 1, [0, 1, 2, 3])
+        assert tracker.hand_sizes[1] == 0
+        assert [tracker.remaining(key) for key in range(4)] == [1, 1, 1, 1]
+        assert tracker.table[:4] == [1, 1, 1, 1]
+
+    def test_probabilities(self):
+        game, trackers = _dealt_game(2)
+        tracker = trackers[0]
+        probabilities = tracker.probabilities()
+        assert probabilities.shape == (4, NUM_TRACKED)
+        held = [card.key for card in game.players[0].hand]
+        assert np.all(probabilities[1, held] == 1.0)
+        assert np.all(probabilities[1, [key for key in range(NUM_KEYS) if key not in held]] == 0.0)
+        # No jokers in the deck
+        assert np.all(probabilities[:, -1] == 0.0)
+        # One of two unseen copies is in an opponent's hand of 14 out of 90 hidden cards
+        single = next(key for key in range(NUM_KEYS) if tracker.remaining(key) == 1)
+        assert np.isclose(tracker.in_hand(1)[single], 14 / 90)
+        assert np.isclose(tracker.in_deck()[single], 62 / 90)
+        assert tracker.probabilities() is probabilities
+
+    def test_expected_copies(self):
+        game, trackers = _dealt_game(3)
+        expected = trackers[1].expected_copies()
+        assert np.isclose(expected[0].sum(), len(game.all_cards))
+        assert np.allclose(expected[1:].sum(axis=1), [14, 14, 14])
+
+    def test_determinize_keeps_known_cards(self):
+        game, trackers = _dealt_game(5)
+        robbed = game.players[1].hand[:3]
+        # As if the opponent had robbed them from the table
+        for card in robbed:
+            trackers[0].known[1][card.key] += 1
+            trackers[0].known_sizes[1] += 1
+        state = GameState.from_game(game)
+        rng = random.Random(1)
+        for _ in range(20):
+            sampled = determinize(state, 0, rng, trackers[0])
+            keys = [card_key(card_id) for card_id in sampled.hands[1]]
+            assert all(keys.count(card.key) >= 1 for card in robbed)
+            assert [len(hand) for hand in sampled.hands] == [len(hand) for hand in state.hands]
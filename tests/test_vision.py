@@ -0,0 +1,45 @@
+import numpy as np
+from app.models.player import Player
+from app.vision import (CardRecognizer, Recognition, add_to_hand, card_name, draw_card, key_of_name,
+                        photograph, read_image, write_pgm, write_synthetic_set)
+
+class TestVision:
+    def test_card_names(self):
+        assert [key_of_name(card_name(key) + ".pgm") for key in range(52)] == list(range(52))
+        assert key_of_name("scan-0001.pgm") is None
+        assert key_of_name("14P.pgm") is None
+
+    def test_netpbm_files(self, tmp_path):
+        image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+        write_pgm(str(tmp_path / "a.pgm"), image)
+        assert np.array_equal(read_image(str(tmp_path / "a.pgm")), image)
+        with open(tmp_path / "b.ppm", "wb") as file:
+            file.write(b"P6\n# comment\n2 1\n255\n" + bytes([30, 60, 90, 0, 0, 3]))
+        assert read_image(str(tmp_path / "b.ppm")).tolist() == [[60, 1]]
+
+    def test_recognizes_synthetic_scans(self, tmp_path):
+        truth = write_synthetic_set(str(tmp_path), per_card=2, seed=3)
+        recognizer = CardRecognizer.synthetic(workers=2)
+        results = list(recognizer.recognize_directory(str(tmp_path), batch_size=16))
+        assert [result.path for result in results] == [path for path, _ in truth]
+        assert [result.key for result in results] == [key for _, key in truth]
+
+    def test_references_from_directory(self, tmp_path):
+        references = tmp_path / "references"
+        references.mkdir()
+        for key in (0, 20, 51):
+            write_pgm(str(references / f"{card_name(key)}.pgm"), draw_card(key))
+        recognizer = CardRecognizer.from_directory(str(references), min_score=0.8)
+        scan = str(tmp_path / "scan.pgm")
+        write_pgm(scan, photograph(draw_card(20), np.random.default_rng(0)))
+        blank = str(tmp_path / "blank.pgm")
+        write_pgm(blank, np.full((60, 40), 200, dtype=np.uint8))
+        first, second = recognizer.recognize([scan, blank])
+        assert first.key == 20 and first.score > 0.8
+        assert second.key is None
+
+    def test_add_to_hand(self):
+        player = Player("P")
+        missed = add_to_hand(player, [Recognition("a", 5, 0.9), Recognition("b", 5, 0.9), Recognition("c", None, 0.1)])
+        assert sorted(card.id for card in player.hand) == [5, 57]
+        assert [recognition.path for recognition in missed] == ["c"]